@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Admission control of the incoming requests, which rejects requests with low
+priority early, when the server is overloaded.
+
+The load is measured by the event loop lag (delay of the scheduled callbacks
+against the planned time) and by the amount of requests in processing.
+"""
+import asyncio
+
+from aiorest_ws.exceptions import Overloaded
+
+__all__ = (
+    'PRIORITY_LOW', 'PRIORITY_NORMAL', 'PRIORITY_HIGH', 'PRIORITIES',
+    'LoopLagMonitor', 'AdmissionController',
+)
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+PRIORITIES = (PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH)
+
+
+class LoopLagMonitor(object):
+    """
+    Periodically measures, how late the event loop runs a scheduled callback.
+
+    Growth of the lag is taken into account immediately, but it decreases
+    smoothly, so that a single fast iteration doesn't hide the overload.
+    """
+    def __init__(self, interval=0.05, decay=0.8, loop=None):
+        """
+        Initialization of the monitor.
+
+        :param interval: amount of seconds between measurements.
+        :param decay: weight of the previous value, when the lag decreases.
+        :param loop: event loop, by default the current one.
+        """
+        self.interval = interval
+        self.decay = decay
+        self.loop = loop
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._handle = None
+        self._expected = None
+
+    @property
+    def is_running(self):
+        """
+        Check that the monitor was started.
+        """
+        return self._handle is not None
+
+    def start(self):
+        """
+        Start measurements of the loop lag.
+        """
+        if self._handle is None:
+            if self.loop is None:
+                self.loop = asyncio.get_event_loop()
+            self._schedule()
+
+    def stop(self):
+        """
+        Stop measurements of the loop lag.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self):
+        self._expected = self.loop.time() + self.interval
+        self._handle = self.loop.call_later(self.interval, self._measure)
+
+    def _measure(self):
+        self.update(max(self.loop.time() - self._expected, 0.0))
+        self._schedule()
+
+    def update(self, lag):
+        """
+        Register the measured lag.
+
+        :param lag: delay of the callback, in seconds.
+        """
+        if lag >= self.lag:
+            self.lag = lag
+        else:
+            self.lag = self.lag * self.decay + lag * (1 - self.decay)
+        self.max_lag = max(self.max_lag, lag)
+
+
+class AdmissionController(object):
+    """
+    Decides, which requests should be processed, according to the current
+    load and the priority of the requested route.
+
+    Load is the maximal ratio of the loop lag to `max_lag` and of requests
+    in processing to `max_in_flight`. Requests with the priority are
+    rejected, when the load reaches the threshold of that priority. Requests
+    with priorities without a threshold are always admitted.
+    """
+    default_thresholds = {
+        PRIORITY_LOW: 1.0,
+        PRIORITY_NORMAL: 2.0,
+        PRIORITY_HIGH: None,
+    }
+
+    def __init__(self, max_lag=0.1, max_in_flight=1000, thresholds=None,
+                 retry_after=1.0, monitor=None):
+        """
+        Initialization of the controller.
+
+        :param max_lag: acceptable loop lag, in seconds.
+        :param max_in_flight: acceptable amount of requests in processing.
+        :param thresholds: dictionary with load thresholds per priority.
+        :param retry_after: delay, recommended to the rejected clients.
+        :param monitor: instance of LoopLagMonitor.
+        """
+        self.max_lag = max_lag
+        self.max_in_flight = max_in_flight
+        self.thresholds = dict(self.default_thresholds)
+        self.thresholds.update(thresholds or {})
+        self.retry_after = retry_after
+        self.monitor = monitor if monitor is not None else LoopLagMonitor()
+        self.in_flight = 0
+        self.admitted = dict.fromkeys(self.thresholds, 0)
+        self.rejected = dict.fromkeys(self.thresholds, 0)
+
+    @property
+    def load(self):
+        """
+        Get current load of the server, where 1.0 means full capacity.
+        """
+        return max(
+            self.monitor.lag / self.max_lag if self.max_lag else 0.0,
+            float(self.in_flight) / self.max_in_flight
+            if self.max_in_flight else 0.0
+        )
+
+    def acquire(self, priority=PRIORITY_NORMAL):
+        """
+        Admit the request with the priority or raise the Overloaded
+        exception. Every admitted request must be released after the
+        processing.
+
+        :param priority: priority of the requested route.
+        """
+        if not self.monitor.is_running:
+            self.monitor.start()
+
+        threshold = self.thresholds.get(priority)
+        if threshold is not None and self.load >= threshold:
+            self.rejected[priority] = self.rejected.get(priority, 0) + 1
+            raise Overloaded(retry_after=self.retry_after)
+
+        self.admitted[priority] = self.admitted.get(priority, 0) + 1
+        self.in_flight += 1
+
+    def release(self):
+        """
+        Mark the admitted request as processed.
+        """
+        self.in_flight -= 1
+
+    def snapshot(self):
+        """
+        Get current state of the controller as a dictionary.
+        """
+        return {
+            'load': self.load,
+            'lag': self.monitor.lag,
+            'max_lag': self.monitor.max_lag,
+            'in_flight': self.in_flight,
+            'admitted': dict(self.admitted),
+            'rejected': dict(self.rejected),
+        }
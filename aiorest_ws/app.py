@@ -3,15 +3,23 @@
 This module implements the central application object.
 """
 import asyncio
+import signal
 import ssl
 from time import gmtime, strftime
 
 from aiorest_ws.__init__ import __version__
+from aiorest_ws.log import logger
 from aiorest_ws.request import RequestHandlerFactory, RequestHandlerProtocol
 from aiorest_ws.validators import check_and_set_subclass
-from aiorest_ws.utils.websocket import deflate_offer_accept as accept
+from aiorest_ws.utils.websocket import deflate_offer_accept as accept, \
+    SLOW_CONSUMER_POLICIES
 from aiorest_ws.urls.base import set_urlconf
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 __all__ = ('Application', )
 
 
@@ -152,15 +160,69 @@ class Application(object):
 
     def _enable_compressing(self, factory, **options):
         """
-        Set compression message for factory, if defined.
+        Set compression message for factory, if defined. Passed instance of
+        CompressionPolicy enables compression and used as accept function.
         """
-        compress = options.get('compress', False)
-        accept_function = options.get('accept_function', accept)
+        policy = options.get('compression_policy', None)
+        compress = options.get('compress', False) or policy is not None
+        accept_function = options.get('accept_function', policy or accept)
         protocol_options = {"perMessageCompressionAccept": accept_function}
 
         if compress:
+            factory.compression_policy = policy
+            factory.setProtocolOptions(**protocol_options)
+
+    def _set_flow_control(self, factory, **options):
+        """
+        Set watermarks of the write buffer and policy for slow consumers.
+        """
+        policy = options.get('slow_consumer_policy', None)
+        assert policy is None or policy in SLOW_CONSUMER_POLICIES, \
+            "Argument `slow_consumer_policy` must be one of {0}.".format(
+                SLOW_CONSUMER_POLICIES
+            )
+        factory.write_buffer_high = options.get('write_buffer_high', None)
+        factory.write_buffer_low = options.get('write_buffer_low', None)
+        factory.slow_consumer_policy = policy
+
+    def _set_message_batching(self, factory, **options):
+        """
+        Set window (in seconds) and maximal size of the responses batch.
+        """
+        factory.batch_window = options.get('batch_window', None)
+        factory.batch_size = options.get('batch_size', None)
+
+    def _set_idle_mode(self, factory, **options):
+        """
+        Set timeout, after which memory of the connections without messages
+        is released.
+        """
+        factory.idle_mode_timeout = options.get('idle_mode_timeout', None)
+
+    def _set_keepalive(self, factory, **options):
+        """
+        Set timeouts, after which dead and idle connections are closed.
+        """
+        factory.idle_timeout = options.get('idle_timeout', None)
+        protocol_options = {
+            name: options[option]
+            for option, name in (
+                ('auto_ping_interval', 'autoPingInterval'),
+                ('auto_ping_timeout', 'autoPingTimeout'),
+                ('open_handshake_timeout', 'openHandshakeTimeout'),
+                ('close_handshake_timeout', 'closeHandshakeTimeout'),
+            )
+            if options.get(option) is not None
+        }
+        if protocol_options:
             factory.setProtocolOptions(**protocol_options)
 
+    def _set_socket_options(self, factory, **options):
+        """
+        Set options of the accepted sockets.
+        """
+        factory.tcp_nodelay = options.get('tcp_nodelay', None)
+
     def _set_factory_router(self, factory, **options):
         """
         Set users router for factory, if defined.
@@ -171,6 +233,25 @@ class Application(object):
         factory.router = router
         factory.router._middlewares = self.middlewares
 
+        admission_controller = options.get('admission_controller', None)
+        if admission_controller is not None:
+            factory.router.admission_controller = admission_controller
+
+        # Instance of RequestScheduler. By default the scheduler processes
+        # concurrently as many requests, as there are workers in the default
+        # executor (DEFAULT_CONCURRENCY), pass `concurrency` to change it
+        scheduler = options.get('scheduler', None)
+        if scheduler is not None:
+            factory.router.scheduler = scheduler
+
+        response_cache = options.get('response_cache', None)
+        if response_cache is not None:
+            factory.router.response_cache = response_cache
+
+        subscriptions = options.get('subscriptions', None)
+        if subscriptions is not None:
+            factory.router.subscriptions = subscriptions
+
     def _init_urlconf(self, factory, url, **options):
         """
         Initialize urlconf thread variable.
@@ -188,6 +269,11 @@ class Application(object):
         """
         factory = self._init_factory(url, **options)
         self._enable_compressing(factory, **options)
+        self._set_flow_control(factory, **options)
+        self._set_message_batching(factory, **options)
+        self._set_idle_mode(factory, **options)
+        self._set_keepalive(factory, **options)
+        self._set_socket_options(factory, **options)
         self._set_factory_router(factory, **options)
         self._init_urlconf(factory, url, **options)
         return factory
@@ -198,6 +284,35 @@ class Application(object):
         """
         return self.url.format(host, port, path)
 
+    def get_event_loop(self, loop=None):
+        """
+        Get event loop for the server. When uvloop was requested, but it
+        isn't installed, the default asyncio loop is used.
+
+        :param loop: 'asyncio', 'uvloop', instance of the event loop policy,
+                     instance of the event loop or None for the current one.
+        """
+        if loop is None or loop == 'asyncio':
+            return asyncio.get_event_loop()
+
+        if loop == 'uvloop':
+            if uvloop is None:
+                logger.warning(
+                    "uvloop isn't installed, the asyncio loop is used."
+                )
+                return asyncio.get_event_loop()
+            loop = uvloop.EventLoopPolicy()
+
+        if isinstance(loop, asyncio.AbstractEventLoopPolicy):
+            asyncio.set_event_loop_policy(loop)
+            loop = asyncio.new_event_loop()
+
+        assert isinstance(loop, asyncio.AbstractEventLoop), \
+            "Argument `loop` must be 'asyncio', 'uvloop', event loop " \
+            "policy or event loop instance."
+        asyncio.set_event_loop(loop)
+        return loop
+
     def run(self, **options):
         """
         Create and start web server with some IP and PORT.
@@ -210,12 +325,14 @@ class Application(object):
         path = options.get('path', '')
         url = self.generate_url(host, port, path)
 
+        loop = self.get_event_loop(options.get('loop', None))
         factory = self.generate_factory(url, **options)
         ssl_context = self._get_ssl_context()
 
-        loop = asyncio.get_event_loop()
         server_coroutine = loop.create_server(
-            factory, host, port, ssl=ssl_context
+            factory, host, port, ssl=ssl_context,
+            backlog=options.get('backlog', 100),
+            reuse_address=options.get('reuse_address', None)
         )
         server = loop.run_until_complete(server_coroutine)
 
@@ -224,10 +341,35 @@ class Application(object):
         print("Server started at {0}".format(url))
         print("Quit the server with CONTROL-C.")
 
+        # Stop the loop on SIGTERM, so that connections are closed gracefully
+        try:
+            loop.add_signal_handler(signal.SIGTERM, loop.stop)
+        except (NotImplementedError, AttributeError):
+            pass
+
         try:
             loop.run_forever()
         except KeyboardInterrupt:
             pass
         finally:
             server.close()
+            loop.run_until_complete(self.shutdown(factory, **options))
+            loop.run_until_complete(server.wait_closed())
             loop.close()
+
+    @asyncio.coroutine
+    def shutdown(self, factory, **options):
+        """
+        Close connections of the stopped server. Clients get the "going
+        away" close frame with the hint when to reconnect, after processing
+        of already received requests.
+
+        :param factory: instance of RequestHandlerFactory.
+        :param options: parameters, which can be used for configuration
+                        of the Application.
+        """
+        yield from factory.shutdown(
+            timeout=options.get('shutdown_timeout', 10.0),
+            retry_after=options.get('retry_after', 1.0),
+            jitter=options.get('reconnect_jitter', 5.0)
+        )
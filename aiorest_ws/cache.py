@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of the responses with rendered data, used by routers for the views,
+which declare the `cache_ttl` attribute.
+
+Entries are evicted in the least recently used order, when the cache is
+full, and are expired after the time to live. Every entry can be marked
+with tags, so that views, which modify data, can invalidate all related
+responses at once.
+"""
+import time
+
+from collections import OrderedDict
+
+__all__ = ('ResponseCache', )
+
+
+class ResponseCache(object):
+    """
+    Bounded LRU cache of responses with time to live.
+    """
+    def __init__(self, max_entries=1024, clock=time.monotonic):
+        """
+        Initialization of the cache.
+
+        :param max_entries: maximal amount of stored responses.
+        :param clock: function, which returns current time in seconds.
+        """
+        self.max_entries = max_entries
+        self.clock = clock
+        # Key -> (expiration time, payload, tags), in order of usage
+        self._entries = OrderedDict()
+        self._tags = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    def get(self, key, count=True):
+        """
+        Get stored payload by key or None, if it's missing or expired.
+
+        :param key: key of the response.
+        :param count: register the lookup in the hits/misses counters.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            self.delete(key)
+            entry = None
+
+        if entry is None:
+            if count:
+                self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if count:
+            self.hits += 1
+        return entry[1]
+
+    def set(self, key, payload, ttl, tags=()):
+        """
+        Store the payload for `ttl` seconds.
+
+        :param key: key of the response.
+        :param payload: response, prepared by the router.
+        :param ttl: time to live, in seconds.
+        :param tags: iterable with tags of the response.
+        """
+        self.delete(key)
+        tags = frozenset(tags)
+        self._entries[key] = (self.clock() + ttl, payload, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self.delete(next(iter(self._entries)))
+            self.evictions += 1
+
+    def delete(self, key):
+        """
+        Remove the response from the cache.
+
+        :param key: key of the response.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, *tags):
+        """
+        Remove all responses, marked with any of the tags. Returns amount
+        of removed responses.
+
+        :param tags: tags of the responses.
+        """
+        removed = 0
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self.delete(key)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """
+        Remove all responses.
+        """
+        self._entries.clear()
+        self._tags.clear()
+
+    def snapshot(self):
+        """
+        Get current state of the cache as a dictionary.
+        """
+        return {
+            'entries': len(self._entries),
+            'tags': len(self._tags),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
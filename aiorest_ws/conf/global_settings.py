@@ -55,6 +55,11 @@ REST_CONFIG = {
 
     # Hyperlink settings
     'URL_FIELD_NAME': 'url',
+
+    # Return plain dicts and lists from serializers instead of OrderedDict
+    # and ReturnDict/ReturnList wrappers. Order of keys is preserved by the
+    # dict since Python 3.6 (CPython) and 3.7
+    'PLAIN_DATA': False,
 }
 
 # -----------------------------------------------
@@ -6,7 +6,10 @@ All this classes are based on serializers from Django REST framework. Original
 code published under BSD license. For more details look into AUTHORS file.
 """
 import copy
+import functools
+import types
 from abc import abstractmethod
+from collections import OrderedDict
 
 from aiorest_ws.db.orm.exceptions import ValidationError
 from aiorest_ws.utils.fields import get_attribute
@@ -14,7 +17,7 @@ from aiorest_ws.utils.functional import cached_property
 
 __all__ = (
     'ERROR_MESSAGE_NOT_FOUND', 'SkipField', 'empty', 'AbstractSerializer',
-    'AbstractField',
+    'AbstractField', 'FieldPlan',
 )
 
 ERROR_MESSAGE_NOT_FOUND = (
@@ -84,14 +87,25 @@ class AbstractSerializer(object):
         self.field_name = None
         self.parent = None
 
-        # Build dictionary with errors, which based on the
-        # `default_error_messages` attribute of every class in hierarchy
-        messages = {}
-        for cls in reversed(self.__class__.__mro__):
-            messages.update(getattr(cls, 'default_error_messages', {}))
+        messages = dict(self.get_default_error_messages())
         messages.update(error_messages or {})
         self.error_messages = messages
 
+    @classmethod
+    def get_default_error_messages(cls):
+        """
+        Returns dictionary with errors, which based on the
+        `default_error_messages` attribute of every class in hierarchy. It's
+        built once per class.
+        """
+        messages = cls.__dict__.get('_default_error_messages')
+        if messages is None:
+            messages = {}
+            for klass in reversed(cls.__mro__):
+                messages.update(getattr(klass, 'default_error_messages', {}))
+            cls._default_error_messages = messages
+        return messages
+
     def __new__(cls, *args, **kwargs):
         """
         When a field is instantiated, we store the arguments that were used,
@@ -115,6 +129,47 @@ class AbstractSerializer(object):
             kwargs['validators'] = validators
         return self.__class__(*args, **kwargs)
 
+    def get_factory(self):
+        """
+        Returns the function, which creates an unbound clone of the field.
+        The result is the same as of `copy.deepcopy(field)`, but arguments
+        are analyzed only once, so immutable arguments are shared and only
+        the mutable ones are copied for every clone.
+        """
+        field_class = self.__class__
+        if field_class.__deepcopy__ is not AbstractSerializer.__deepcopy__:
+            return functools.partial(copy.deepcopy, self)
+
+        args = [(value, _compile_argument(value)) for value in self._args]
+        kwargs = dict(self._kwargs)
+        validators = kwargs.pop('validators', None)
+        shared_kwargs = {}
+        copied_kwargs = []
+        for name, value in kwargs.items():
+            copy_value = _compile_argument(value)
+            if copy_value is None:
+                shared_kwargs[name] = value
+            else:
+                copied_kwargs.append((name, copy_value))
+        if validators is not None:
+            shared_kwargs['validators'] = validators
+
+        if not copied_kwargs and \
+                all(copy_value is None for _, copy_value in args):
+            return functools.partial(
+                field_class, *self._args, **shared_kwargs
+            )
+
+        def factory():
+            kwargs = dict(shared_kwargs)
+            for name, copy_value in copied_kwargs:
+                kwargs[name] = copy_value()
+            return field_class(*[
+                value if copy_value is None else copy_value()
+                for value, copy_value in args
+            ], **kwargs)
+        return factory
+
     def bind(self, field_name, parent):
         """
         Initializes the field name and parent for the field instance.
@@ -271,7 +326,10 @@ class AbstractSerializer(object):
         :param value: value, required for processing.
         """
         errors = []
+        deferred = self.get_deferred_validators()
         for validator in self.validators:
+            if deferred and id(validator) in deferred:
+                continue
             try:
                 validator(value)
             except ValidationError as exc:
@@ -279,6 +337,15 @@ class AbstractSerializer(object):
         if errors:
             raise ValidationError(errors)
 
+    def get_deferred_validators(self):
+        """
+        Returns identifiers of the validators, which are not applied to the
+        single value, because the list serializer, which contains the parent
+        serializer, checks values of all items at once.
+        """
+        list_serializer = getattr(self.parent, 'parent', None)
+        return getattr(list_serializer, 'deferred_validators', None)
+
     def run_validation(self, data=empty):
         """
         Validate a simple representation and return the internal value.
@@ -389,3 +456,63 @@ class AbstractField(AbstractSerializer):
                 field_name=self.field_name,
             )
         )
+
+
+# Arguments of these types are shared between copies of the field, as
+# `copy.deepcopy` would do it
+SHARED_ARGUMENT_TYPES = (
+    type(None), bool, int, float, complex, str, bytes, frozenset, range,
+    type, types.FunctionType, types.BuiltinFunctionType,
+)
+
+
+def _compile_argument(value):
+    """
+    Returns None for the argument, which can be shared between copies of
+    the field, or the function, which creates a copy of the argument.
+    """
+    if isinstance(value, SHARED_ARGUMENT_TYPES):
+        return None
+    if isinstance(value, tuple) and \
+            all(_compile_argument(item) is None for item in value):
+        return None
+    if isinstance(value, AbstractSerializer):
+        return value.get_factory()
+    # Shallow copy is enough for containers with immutable items
+    if type(value) in (list, set) and \
+            all(_compile_argument(item) is None for item in value):
+        return functools.partial(type(value), value)
+    if type(value) is dict and \
+            all(_compile_argument(item) is None for item in value.values()):
+        return functools.partial(dict, value)
+    return functools.partial(copy.deepcopy, value)
+
+
+class FieldPlan(object):
+    """
+    Compiled set of fields, declared on the serializer class. It's built once
+    per class and creates the unbound clones of the declared fields for
+    every serializer instance.
+    """
+    def __init__(self, fields):
+        """
+        Initialization of the plan.
+
+        :param fields: dictionary of {field_name: field_instance}.
+        """
+        self.prototypes = types.MappingProxyType(OrderedDict(fields))
+        self.factories = tuple(
+            (field_name, field.get_factory())
+            for field_name, field in self.prototypes.items()
+        )
+
+    def __len__(self):
+        return len(self.factories)
+
+    def build(self):
+        """
+        Returns a new dictionary of {field_name: field_instance}.
+        """
+        return OrderedDict(
+            (field_name, factory()) for field_name, factory in self.factories
+        )
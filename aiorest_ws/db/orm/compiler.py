@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Compiler of serializers, which generates specialized `to_representation`
+functions for serializers with the `compile_representation` attribute.
+
+The generic implementation resolves the attribute of every field through
+`get_attribute()` (with checks for mappings and callables on every step of
+the source), wraps it into the `try/except SkipField` block and calls the
+`to_representation()` method of the field. The generated function reads
+attributes of the object with `operator.attrgetter`, inlines conversions of
+the simple fields and catches `SkipField` only for fields with overridden
+`get_attribute()`. Mappings and `None` are passed to the generic
+implementation.
+
+Source code depends only on the "shape" of the fields (how the attribute is
+read, whether the field can be skipped and how the value is converted), so
+that it's generated once per shape and shared by all serializers. Names and
+sources of fields are never included into the code.
+
+The same shapes are used by list serializers for extraction of values
+column-wise: the attribute is read from all rows at once and the column is
+converted only, when it contains values of other types than the result of
+the conversion.
+"""
+import operator
+import types
+from collections import Mapping, OrderedDict
+
+from aiorest_ws.db.orm.abstract import AbstractField, SkipField, empty
+from aiorest_ws.db.orm.fields import CharField, FloatField, IntegerField, \
+    ReadOnlyField
+from aiorest_ws.utils.fields import call_attribute
+
+__all__ = (
+    'INLINE_CONVERSIONS', 'CONVERSION_TYPES', 'get_field_shape',
+    'compile_to_representation', 'can_extract_columns', 'extract_column',
+)
+
+# Conversions of values, which are inlined for fields without overridden
+# `to_representation()` method
+INLINE_CONVERSIONS = {
+    IntegerField.to_representation: 'int({0})',
+    FloatField.to_representation: 'float({0})',
+    CharField.to_representation: 'str({0})',
+    ReadOnlyField.to_representation: '{0}',
+}
+
+# Types of the values, returned by the inlined conversions
+CONVERSION_TYPES = {
+    'int({0})': int,
+    'float({0})': float,
+    'str({0})': str,
+}
+
+# Only functions and methods can be simple callables
+CALLABLE_TYPES = frozenset((types.FunctionType, types.MethodType))
+NONE_TYPE = type(None)
+
+_factories = {}
+
+
+def get_field_shape(field):
+    """
+    Returns tuple, which describes the code, generated for the field: does
+    it read a single attribute inline, can it be skipped, when the attribute
+    is missing, and the inlined conversion of the value (or None).
+
+    :param field: bound field of the serializer.
+    """
+    inline = type(field).get_attribute is AbstractField.get_attribute and \
+        len(field.source_attrs) == 1
+    skippable = not field.required and field.default is empty
+    conversion = INLINE_CONVERSIONS.get(type(field).to_representation)
+    return inline, inline and skippable, conversion
+
+
+def _generate_factory(shapes):
+    """
+    Generate the function, which takes fields and returns the specialized
+    `to_representation` function for them.
+
+    :param shapes: list of field shapes.
+    """
+    lines = [
+        'def factory(generic, dict_class, names, sources, getters, fields,',
+        '            converters):',
+    ]
+    for index in range(len(shapes)):
+        lines.extend([
+            '    name_{0} = names[{0}]'.format(index),
+            '    source_{0} = sources[{0}]'.format(index),
+            '    get_{0} = getters[{0}]'.format(index),
+            '    field_{0} = fields[{0}]'.format(index),
+            '    convert_{0} = converters[{0}]'.format(index),
+        ])
+    lines.extend([
+        '    def to_representation(instance):',
+        '        if instance is None or isinstance(instance, Mapping):',
+        '            return generic(instance)',
+        '        ret = dict_class()',
+    ])
+
+    for index, (inline, skippable, conversion) in enumerate(shapes):
+        if conversion is None:
+            value = 'convert_{0}(value)'.format(index)
+        else:
+            value = conversion.format('value')
+        if conversion == '{0}':
+            assign = ['ret[name_{0}] = value'.format(index)]
+        else:
+            assign = [
+                'if value is None:',
+                '    ret[name_{0}] = None'.format(index),
+                'else:',
+                '    ret[name_{0}] = {1}'.format(index, value),
+            ]
+
+        if not inline:
+            read = [
+                'try:',
+                '    value = field_{0}.get_attribute(instance)'.format(index),
+                'except SkipField:',
+                '    pass',
+                'else:',
+            ]
+            body = assign
+        else:
+            read = [
+                'try:',
+                '    value = get_{0}(instance)'.format(index),
+                'except (AttributeError, KeyError):',
+            ]
+            if skippable:
+                read.extend(['    pass', 'else:'])
+            else:
+                # Get the error with details from the field
+                read.extend([
+                    '    value = field_{0}.get_attribute(instance)'.format(
+                        index
+                    ),
+                ])
+            body = [
+                'if value.__class__ in CALLABLE_TYPES:',
+                '    value = call_attribute(value, source_{0})'.format(index),
+            ] + assign
+            if not skippable:
+                read.extend(body)
+                body = []
+
+        lines.extend('        ' + line for line in read)
+        indent = '            ' if read[-1] == 'else:' else '        '
+        lines.extend(indent + line for line in body)
+
+    lines.extend([
+        '        return ret',
+        '    return to_representation',
+    ])
+
+    namespace = {
+        'Mapping': Mapping,
+        'SkipField': SkipField,
+        'CALLABLE_TYPES': CALLABLE_TYPES,
+        'call_attribute': call_attribute,
+    }
+    code = compile('\n'.join(lines), '<serializer compiler>', 'exec')
+    exec(code, namespace)
+    return namespace['factory']
+
+
+def compile_to_representation(fields, generic, dict_class=OrderedDict):
+    """
+    Returns specialized `to_representation` function for the fields.
+
+    :param fields: list of bound readable fields of the serializer.
+    :param generic: generic `to_representation` function, which is used for
+                    mappings and `None`.
+    :param dict_class: class of the returned dictionaries.
+    """
+    fields = list(fields)
+    shapes = tuple(get_field_shape(field) for field in fields)
+    factory = _factories.get(shapes)
+    if factory is None:
+        factory = _factories[shapes] = _generate_factory(shapes)
+
+    return factory(
+        generic,
+        dict_class,
+        [field.field_name for field in fields],
+        [field.source_attrs[-1] if field.source_attrs else None
+         for field in fields],
+        [operator.attrgetter(field.source_attrs[0]) if shape[0] else None
+         for field, shape in zip(fields, shapes)],
+        fields,
+        [field.to_representation for field in fields],
+    )
+
+
+def can_extract_columns(rows):
+    """
+    Check that values of fields can be extracted from the rows column-wise.
+    Mappings and `None` values are processed by serializers differently from
+    objects, so they aren't supported.
+
+    :param rows: list of objects.
+    """
+    for row_type in set(map(type, rows)):
+        if row_type is NONE_TYPE or issubclass(row_type, Mapping):
+            return False
+    return True
+
+
+def extract_column(field, rows, skipped=None):
+    """
+    Returns the list of primitive values of the field for every row.
+
+    :param field: bound readable field of the serializer.
+    :param rows: list of objects, checked by `can_extract_columns()`.
+    :param skipped: value for rows, where the field has been skipped.
+    """
+    inline, skippable, conversion = get_field_shape(field)
+    if inline:
+        source = field.source_attrs[0]
+        get_value = operator.attrgetter(source)
+        remaining = iter(rows)
+        values = []
+        while True:
+            try:
+                # Values of the rows before the failing one stay in the list
+                values.extend(map(get_value, remaining))
+            except (AttributeError, KeyError):
+                # Only the failing row is processed by the field, which
+                # raises the error with details, when the row can't be
+                # skipped
+                if skippable:
+                    values.append(skipped)
+                else:
+                    values.append(field.get_attribute(rows[len(values)]))
+            else:
+                break
+        value_types = set(map(type, values))
+        if not CALLABLE_TYPES.isdisjoint(value_types):
+            values = [
+                call_attribute(value, source)
+                if value.__class__ in CALLABLE_TYPES else value
+                for value in values
+            ]
+            value_types = set(map(type, values))
+    else:
+        values = []
+        append = values.append
+        get_attribute = field.get_attribute
+        for row in rows:
+            try:
+                append(get_attribute(row))
+            except SkipField:
+                append(skipped)
+        value_types = set(map(type, values))
+
+    if conversion == '{0}':
+        return values
+    convert = CONVERSION_TYPES.get(conversion)
+    if convert is not None and \
+            value_types <= {convert, NONE_TYPE, type(skipped)}:
+        return values
+    if convert is None:
+        convert = field.to_representation
+    if value_types.isdisjoint((NONE_TYPE, type(skipped))):
+        return list(map(convert, values))
+    return [
+        value if value is None or value is skipped else convert(value)
+        for value in values
+    ]
@@ -26,6 +26,7 @@ from aiorest_ws.db.orm.abstract import AbstractField, empty
 from aiorest_ws.exceptions import ImproperlyConfigured
 from aiorest_ws.urls.exceptions import NoReverseMatch, NoMatch
 from aiorest_ws.urls.utils import reverse, resolve
+from aiorest_ws.utils.encoders import default_encoders
 from aiorest_ws.utils.fields import method_overridden
 
 __all__ = (
@@ -59,12 +60,19 @@ class Hyperlink(str):
         return str(self), self.name
 
 
+# Hyperlinks are rendered as plain URLs, even by codecs, which don't accept
+# subclasses of the built-in `str` type
+default_encoders.register(Hyperlink, str)
+
+
 class PKOnlyObject(object):
     """
     This is a mock object, used for when we only need the pk of the object
     instance, but still want to return an object with a .pk attribute,
     in order to keep the same interface as a regular model instance.
     """
+    __slots__ = ('pk', )
+
     def __init__(self, pk):
         self.pk = pk
 
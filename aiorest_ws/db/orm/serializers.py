@@ -4,16 +4,23 @@ This module contains base serializer classes for ORM models/objects. They
 are similar to Forms and ModelForms from Django/Flask frameworks.
 """
 import copy
+import operator
 from inspect import isclass
+from itertools import repeat
 from collections import OrderedDict
 
 from aiorest_ws.conf import settings
 from aiorest_ws.exceptions import ImproperlyConfigured
 from aiorest_ws.db.orm.abstract import AbstractSerializer, AbstractField, \
-    empty, SkipField
+    FieldPlan, empty, SkipField
+from aiorest_ws.db.orm.compiler import compile_to_representation, \
+    can_extract_columns, extract_column
 from aiorest_ws.db.orm.fields import *  # NOQA
 from aiorest_ws.db.orm.exceptions import ValidationError
-from aiorest_ws.utils.fields import set_value, get_attribute
+from aiorest_ws.utils.fields import set_value, get_attribute, \
+    method_overridden
+from aiorest_ws.utils.formatting import RECORDS_LAYOUT, TABLE_LAYOUT, \
+    COLUMNS_LAYOUT, RESPONSE_LAYOUTS
 from aiorest_ws.utils.functional import cached_property
 from aiorest_ws.utils.representation import serializer_repr, list_repr
 from aiorest_ws.utils.serializer_helpers import ReturnDict, ReturnList, \
@@ -99,12 +106,15 @@ class BaseSerializer(AbstractSerializer):
             return CustomListSerializer(*args, **kwargs)
         """
         allow_empty = kwargs.pop('allow_empty', None)
+        layout = kwargs.pop('layout', None)
         child_serializer = cls(*args, **kwargs)
         list_kwargs = {
             'child': child_serializer,
         }
         if allow_empty is not None:
             list_kwargs['allow_empty'] = allow_empty
+        if layout is not None:
+            list_kwargs['layout'] = layout
         list_kwargs.update({
             key: value for key, value in kwargs.items()
             if key in LIST_SERIALIZER_KWARGS
@@ -137,6 +147,26 @@ class BaseSerializer(AbstractSerializer):
             raise AssertionError(msg)
         return self._validated_data
 
+    @cached_property
+    def plain_data(self):
+        """
+        Check that the serializer returns plain dicts and lists instead of
+        `OrderedDict` and `ReturnDict`/`ReturnList` wrappers. Specified by
+        the `plain_data` attribute of the Meta class or by the `PLAIN_DATA`
+        setting.
+        """
+        meta = getattr(self, 'Meta', None)
+        return getattr(
+            meta, 'plain_data', settings.REST_CONFIG.get('PLAIN_DATA', False)
+        )
+
+    @cached_property
+    def dict_class(self):
+        """
+        Class of the dictionaries, returned by the serializer.
+        """
+        return dict if self.plain_data else OrderedDict
+
     @property
     def data(self):
         if hasattr(self, 'initial_data') and not hasattr(self, '_validated_data'):  # NOQA
@@ -263,6 +293,9 @@ class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
     default_error_messages = {
         'invalid': u"Invalid data. Expected a dictionary, but got {datatype}."
     }
+    # Use the generated `to_representation` function, specialized for the
+    # fields of the serializer (see `aiorest_ws.db.orm.compiler`)
+    compile_representation = False
 
     @property
     def fields(self):
@@ -292,6 +325,18 @@ class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
             if not field.write_only
         ]
 
+    @classmethod
+    def get_field_plan(cls):
+        """
+        Returns the compiled plan of the declared fields, which is built once
+        per serializer class.
+        """
+        plan = cls.__dict__.get('_field_plan')
+        if plan is None or plan.prototypes != cls._declared_fields:
+            plan = FieldPlan(cls._declared_fields)
+            cls._field_plan = plan
+        return plan
+
     def get_fields(self):
         """
         Returns a dictionary of {field_name: field_instance}.
@@ -299,7 +344,7 @@ class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
         # Every new serializer is created with a clone of the field instances.
         # This allows users to dynamically modify the fields on a serializer
         # instance without affecting every other serializer class
-        return copy.deepcopy(self._declared_fields)
+        return self.get_field_plan().build()
 
     def get_validators(self):
         """
@@ -375,7 +420,18 @@ class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
         """
         Object instance -> Dict of primitive datatypes.
         """
-        ret = OrderedDict()
+        if self.compile_representation:
+            return self._compiled_to_representation(instance)
+        return self._to_representation(instance)
+
+    @cached_property
+    def _compiled_to_representation(self):
+        return compile_to_representation(
+            self._readable_fields, self._to_representation, self.dict_class
+        )
+
+    def _to_representation(self, instance):
+        ret = self.dict_class()
         fields = self._readable_fields
 
         for field in fields:
@@ -393,6 +449,37 @@ class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
 
         return ret
 
+    def get_columns(self):
+        """
+        Returns the list of names for readable fields, in the same order
+        as values are returned by the `to_row()` method.
+        """
+        return [field.field_name for field in self._readable_fields]
+
+    def to_row(self, instance):
+        """
+        Object instance -> List of primitive datatypes.
+
+        Skipped fields are represented as `None`, so that every row has
+        the same length as the list of columns.
+        """
+        row = []
+        append = row.append
+
+        for field in self._readable_fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                append(None)
+                continue
+
+            if attribute is None:
+                append(None)
+            else:
+                append(field.to_representation(attribute))
+
+        return row
+
     def validate(self, attrs):
         return attrs
 
@@ -418,6 +505,8 @@ class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
     @property
     def data(self):
         ret = super(Serializer, self).data
+        if self.plain_data:
+            return ret
         return ReturnDict(ret, serializer=self)
 
     @property
@@ -487,6 +576,12 @@ def raise_errors_on_nested_writes(method_name, serializer, validated_data):
 class ListSerializer(BaseSerializer):
     child = None
     many = True
+    # Extract values of the child fields column-wise, when it's possible
+    bulk_representation = True
+    # Run validators of the child fields, which support it, once for all
+    # items (e.g. uniqueness checks by the single query)
+    batch_validation = True
+    deferred_validators = None
 
     default_error_messages = {
         'not_a_list': u'Expected a list of items but got type "{input_type}".',
@@ -496,8 +591,16 @@ class ListSerializer(BaseSerializer):
     def __init__(self, *args, **kwargs):
         self.child = kwargs.pop('child', copy.deepcopy(self.child))
         self.allow_empty = kwargs.pop('allow_empty', True)
+        self.layout = kwargs.pop('layout', None) or getattr(
+            getattr(self.child, 'Meta', None), 'list_layout', RECORDS_LAYOUT
+        )
         assert self.child is not None, '`child` is a required argument.'
         assert not isclass(self.child), '`child` has not been instantiated.'
+        assert self.layout in RESPONSE_LAYOUTS, (
+            '`layout` must be one of the following values: {layouts}.'.format(
+                layouts=', '.join(RESPONSE_LAYOUTS)
+            )
+        )
         super(ListSerializer, self).__init__(*args, **kwargs)
         self.child.bind(field_name='', parent=self)
 
@@ -506,6 +609,10 @@ class ListSerializer(BaseSerializer):
             return self.to_representation(self.initial_data)
         return []
 
+    @cached_property
+    def plain_data(self):
+        return self.child.plain_data
+
     def get_value(self, dictionary):
         """
         Given the input dictionary, return the field value.
@@ -561,28 +668,155 @@ class ListSerializer(BaseSerializer):
 
         ret = []
         errors = []
+        indexes = []
+        batch_validators = self.get_batch_validators()
+        self.deferred_validators = frozenset(
+            id(validator) for _, validator in batch_validators
+        )
 
-        for item in data:
-            try:
-                validated = self.child.run_validation(item)
-            except ValidationError as exc:
-                errors.append(exc.detail)
-            else:
-                ret.append(validated)
-                errors.append({})
+        try:
+            for index, item in enumerate(data):
+                try:
+                    validated = self.child.run_validation(item)
+                except ValidationError as exc:
+                    errors.append(exc.detail)
+                else:
+                    ret.append(validated)
+                    indexes.append(index)
+                    errors.append({})
+        finally:
+            self.deferred_validators = None
+
+        for field, validator in batch_validators:
+            values = []
+            for index, validated in zip(indexes, ret):
+                try:
+                    value = get_attribute(validated, field.source_attrs)
+                except KeyError:
+                    continue
+                if value is not None:
+                    values.append((index, value))
+
+            for index, detail in validator.validate_batch(values).items():
+                field_errors = errors[index].setdefault(field.field_name, [])
+                field_errors.extend(detail)
 
         if any(errors):
             raise ValidationError(errors)
 
         return ret
 
+    def get_batch_validators(self):
+        """
+        Returns pairs of the writable child fields and their validators,
+        which can check values of all items at once by the
+        `validate_batch()` method.
+        """
+        if not self.batch_validation or \
+                not isinstance(self.child, Serializer):
+            return []
+        return [
+            (field, validator)
+            for field in self.child._writable_fields if not field.read_only
+            for validator in field.validators
+            if hasattr(validator, 'validate_batch')
+        ]
+
     def to_representation(self, data):
         """
         List of object instances -> List of dicts of primitive datatypes.
         """
         # Dealing with nested relationships, data can be a Manager,
         # so, first get a queryset from the Manager if needed
-        return [self.child.to_representation(item) for item in data]
+        if self.layout == TABLE_LAYOUT:
+            return self.to_table(data)
+        elif self.layout == COLUMNS_LAYOUT:
+            return self.to_columns(data)
+
+        if not isinstance(data, (list, tuple)):
+            data = list(data)
+        columns = self.extract_columns(data, skipped=SkipField)
+        if columns is None:
+            return [self.child.to_representation(item) for item in data]
+
+        names = self.child.get_columns()
+        dict_class = self.child.dict_class
+        records = [dict_class(zip(names, values)) for values in zip(*columns)]
+        for name, values in zip(names, columns):
+            if any(map(operator.is_, values, repeat(SkipField))):
+                for record, value in zip(records, values):
+                    if value is SkipField:
+                        del record[name]
+        return records
+
+    def extract_columns(self, data, skipped=None):
+        """
+        List of object instances -> List of columns, where each column is a
+        list of primitive datatypes for the readable field of the child.
+        Returns None, when values can't be extracted column-wise.
+
+        :param data: list of object instances.
+        :param skipped: value for skipped fields.
+        """
+        if not self.bulk_representation or \
+                not isinstance(self.child, Serializer) or \
+                self._has_custom_representation():
+            return None
+
+        fields = self.child._readable_fields
+        if not fields or not can_extract_columns(data):
+            return None
+        return [extract_column(field, data, skipped) for field in fields]
+
+    def _has_custom_representation(self):
+        """
+        Check that the child serializer is overriding `to_representation()`,
+        so that the values can't be extracted by its fields directly.
+        """
+        return method_overridden('to_representation', Serializer, self.child)
+
+    def to_table(self, data):
+        """
+        List of object instances -> Dict with the list of column names and
+        the list of rows, where each row is a list of primitive datatypes.
+        """
+        child = self.child
+        columns = child.get_columns()
+
+        if not isinstance(data, (list, tuple)):
+            data = list(data)
+        values = self.extract_columns(data)
+        if values is not None:
+            rows = [list(row) for row in zip(*values)]
+        elif self._has_custom_representation():
+            records = [child.to_representation(item) for item in data]
+            rows = [
+                [record.get(column) for column in columns]
+                for record in records
+            ]
+        else:
+            to_row = child.to_row
+            rows = [to_row(item) for item in data]
+
+        return self.dict_class([('columns', columns), ('rows', rows)])
+
+    def to_columns(self, data):
+        """
+        List of object instances -> Dict of column names and lists of
+        primitive datatypes (struct-of-arrays).
+        """
+        if not isinstance(data, (list, tuple)):
+            data = list(data)
+        values = self.extract_columns(data)
+        if values is not None:
+            return self.dict_class(zip(self.child.get_columns(), values))
+
+        table = self.to_table(data)
+        rows = table['rows']
+        return self.dict_class(
+            (column, [row[index] for row in rows])
+            for index, column in enumerate(table['columns'])
+        )
 
     def validate(self, attrs):
         return attrs
@@ -633,6 +867,10 @@ class ListSerializer(BaseSerializer):
     @property
     def data(self):
         ret = super(ListSerializer, self).data
+        if self.plain_data:
+            return ret
+        if isinstance(ret, dict):
+            return ReturnDict(ret, serializer=self)
         return ReturnList(ret, serializer=self)
 
     @property
@@ -666,6 +904,12 @@ class ModelSerializer(Serializer):
     # You can modify this using the API setting.
     url_field_name = None
 
+    # Compiled plans of fields per pair of (serializer class, model)
+    _model_field_plans = {}
+    # Generated classes of nested serializers per serializer class, base
+    # class of the nested serializer, relation and depth
+    _nested_serializer_classes = {}
+
     def is_abstract_model(self, model):
         """
         Check the passed model is abstract.
@@ -698,7 +942,106 @@ class ModelSerializer(Serializer):
         """
         if self.url_field_name is None:
             self.url_field_name = settings.REST_CONFIG['URL_FIELD_NAME']
+        return self.get_model_field_plan().build()
+
+    def get_model_field_plan(self):
+        """
+        Returns the compiled plan of the serializer fields. The model is
+        introspected once per pair of the serializer class and the model,
+        and the result is shared between all instances.
+        """
+        model = getattr(getattr(self, 'Meta', None), 'model', None)
+        key = (self.__class__, model)
+        plan = self._model_field_plans.get(key)
+        if plan is None:
+            plan = FieldPlan(self.build_fields())
+            self._model_field_plans[key] = plan
+        return plan
+
+    @classmethod
+    def warm_up(cls):
+        """
+        Introspect models of the serializer class and all its subclasses
+        beforehand (e.g. at startup of the application), so that the first
+        requests don't spend time on it. Returns the list of processed
+        serializer classes.
+        """
+        warmed_up = []
+        serializer_classes = [cls, ]
+        seen = {cls, }
+        while serializer_classes:
+            serializer_class = serializer_classes.pop(0)
+            model = getattr(getattr(serializer_class, 'Meta', None),
+                            'model', None)
+            serializer = serializer_class() if model is not None else None
+            if serializer is not None and \
+                    not serializer.is_abstract_model(model):
+                plan = serializer.get_model_field_plan()
+                warmed_up.append(serializer_class)
+                # Include generated classes of nested serializers
+                nested_classes = [
+                    type(getattr(field, 'child', field))
+                    for field in plan.prototypes.values()
+                ]
+            else:
+                nested_classes = []
+
+            for subclass in serializer_class.__subclasses__() + \
+                    nested_classes:
+                if subclass not in seen and \
+                        issubclass(subclass, ModelSerializer):
+                    seen.add(subclass)
+                    serializer_classes.append(subclass)
+        return warmed_up
+
+    @classmethod
+    def clear_field_plans(cls):
+        """
+        Drop cached plans of fields of the serializer class and all its
+        subclasses, e.g. when the model was changed in tests.
+        """
+        for key in list(cls._model_field_plans):
+            if issubclass(key[0], cls):
+                del cls._model_field_plans[key]
+        for key in list(cls._nested_serializer_classes):
+            if issubclass(key[0], cls):
+                nested_class = cls._nested_serializer_classes.pop(key)
+                nested_class.clear_field_plans()
+
+    def get_nested_serializer_class(self, base_class, field_name,
+                                    related_model, nested_depth):
+        """
+        Returns the class of the nested serializer for the relation. The
+        class is generated once per serializer class, relation and depth, so
+        that it's introspected only once too.
+
+        :param base_class: base class of the nested serializer.
+        :param field_name: name of the relation field.
+        :param related_model: model of the related objects.
+        :param nested_depth: depth of the parent serializer.
+        """
+        key = (
+            self.__class__, base_class, field_name, related_model,
+            nested_depth
+        )
+        serializer_class = self._nested_serializer_classes.get(key)
+        if serializer_class is None:
 
+            class NestedSerializer(base_class):
+
+                class Meta:
+                    model = related_model
+                    depth = nested_depth - 1
+
+            serializer_class = NestedSerializer
+            self._nested_serializer_classes[key] = serializer_class
+        return serializer_class
+
+    def build_fields(self):
+        """
+        Introspect the model and return the dict of field names -> field
+        instances, which are used as prototypes of the serializer fields.
+        """
         assert hasattr(self, 'Meta'), (
             'Class {serializer_class} missing "Meta" attribute'.format(
                 serializer_class=self.__class__.__name__
@@ -713,7 +1056,7 @@ class ModelSerializer(Serializer):
         if self.is_abstract_model(self.Meta.model):
             raise ValueError('Cannot use ModelSerializer with Abstract Models.')  # NOQA
 
-        declared_fields = copy.deepcopy(self._declared_fields)
+        declared_fields = self.get_field_plan().build()
         model = getattr(self.Meta, 'model')
         depth = getattr(self.Meta, 'depth', 0)
 
@@ -484,13 +484,10 @@ class ModelSerializer(BaseModelSerializer):
         Create nested fields for forward and reverse relationships.
         """
         field_name, relation_info, nested_depth = args
-
-        class NestedSerializer(ModelSerializer):
-            class Meta:
-                model = relation_info.related_model
-                depth = nested_depth - 1
-
-        field_class = NestedSerializer
+        field_class = self.get_nested_serializer_class(
+            ModelSerializer, field_name, relation_info.related_model,
+            nested_depth
+        )
         field_kwargs = get_nested_relation_kwargs(relation_info)
 
         return field_class, field_kwargs
@@ -530,12 +527,10 @@ class HyperlinkedModelSerializer(HyperlinkedModelSerializerMixin,
         """
         Create nested fields for forward and reverse relationships.
         """
-        class NestedSerializer(HyperlinkedModelSerializer):
-            class Meta:
-                model = relation_info.related_model
-                depth = nested_depth - 1
-
-        field_class = NestedSerializer
+        field_class = self.get_nested_serializer_class(
+            HyperlinkedModelSerializer, field_name,
+            relation_info.related_model, nested_depth
+        )
         field_kwargs = get_nested_relation_kwargs(relation_info)
 
         return field_class, field_kwargs
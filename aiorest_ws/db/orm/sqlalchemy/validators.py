@@ -61,6 +61,23 @@ class UniqueORMValidator(BaseUniqueFieldValidator, ORMSessionMixin):
             return queryset.filter(*filter_args)
         return queryset
 
+    def get_existing_values(self, values):
+        """
+        Returns the set of values of the existing objects, which match the
+        passed values, by the single `IN (...)` query.
+
+        :param values: list of hashable values.
+        """
+        session = self._get_session()
+        try:
+            filter_field = getattr(self.model, self.field_name)
+            queryset = session.query(filter_field)\
+                .filter(filter_field.in_(values))
+            queryset = self.exclude_current_instance(queryset)
+            return {row[0] for row in queryset}
+        finally:
+            session.close()
+
     def __call__(self, value):
         session = self._get_session()
         try:
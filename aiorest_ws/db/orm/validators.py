@@ -146,6 +146,9 @@ class BaseUniqueFieldValidator(BaseValidator):
     Should be applied to an individual field on the serializer.
     """
     message = u"This field must be unique."
+    # Maximal amount of values, checked by one call of
+    # `get_existing_values()` during the batch validation
+    batch_size = 500
 
     def __init__(self, queryset, message=None):
         super(BaseUniqueFieldValidator, self).__init__(message=self.message)
@@ -176,6 +179,78 @@ class BaseUniqueFieldValidator(BaseValidator):
     def __call__(self, attrs):
         raise NotImplementedError('`__call__` must be implemented.')
 
+    def get_existing_values(self, values):
+        """
+        Returns the set of values of the existing objects, which match the
+        passed values. Every value is checked by the validator itself by
+        default, subclasses should check all values by the single query.
+        Returned values can differ from the passed ones, when the database
+        compares them differently (collations, normalized types).
+
+        :param values: list of hashable values.
+        """
+        existing = set()
+        for value in values:
+            try:
+                self(value)
+            except ValidationError:
+                existing.add(value)
+        return existing
+
+    def validate_batch(self, values):
+        """
+        Check uniqueness of the field values for all items of the list at
+        once: against the existing objects and between the items, because
+        only the first of the repeated values can be saved. Returns the
+        dictionary with indexes of items and lists of error messages.
+
+        :param values: list of pairs with index of item and the value.
+        """
+        errors = {}
+        candidates = []
+        seen = set()
+        for index, value in values:
+            try:
+                repeated = value in seen
+            except TypeError:
+                # Unhashable values can't be grouped, check them one by one
+                try:
+                    self(value)
+                except ValidationError as exc:
+                    errors[index] = exc.detail
+                continue
+
+            if repeated:
+                errors[index] = [self.message]
+            else:
+                seen.add(value)
+                candidates.append((index, value))
+
+        for start in range(0, len(candidates), self.batch_size):
+            chunk = candidates[start:start + self.batch_size]
+            existing = set(self.get_existing_values(
+                [value for _, value in chunk]
+            ))
+            matched = set()
+            unmatched = []
+            for index, value in chunk:
+                if value in existing:
+                    matched.add(value)
+                    errors[index] = [self.message]
+                else:
+                    unmatched.append((index, value))
+
+            if len(existing) > len(matched):
+                # Some objects match the values only by the comparison of
+                # the database (e.g. case-insensitive collation), so we
+                # can't tell which ones, and check the rest one by one
+                for index, value in unmatched:
+                    try:
+                        self(value)
+                    except ValidationError as exc:
+                        errors[index] = exc.detail
+        return errors
+
     def __repr__(self):
         return "<%s(queryset=%s)>" % (
             self.__class__.__name__,
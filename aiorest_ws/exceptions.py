@@ -3,7 +3,8 @@
 Handled exceptions raised by aiorest-ws framework, which inspired under
 Django REST framework.
 """
-from aiorest_ws.status import WS_PROTOCOL_ERROR, WS_DATA_CANNOT_ACCEPT
+from aiorest_ws.status import WS_PROTOCOL_ERROR, WS_DATA_CANNOT_ACCEPT, \
+    WS_UNEXPECTED_CONDITION, WS_TRY_AGAIN_LATER
 from aiorest_ws.utils.encoding import force_text
 
 __all__ = (
@@ -11,7 +12,8 @@ __all__ = (
     'IncorrectArgument', 'IncorrectMethodNameType', 'InvalidHandler',
     'InvalidPathArgument', 'InvalidRenderer', 'NotImplementedMethod',
     'NotSpecifiedError', 'NotSpecifiedHandler', 'NotSpecifiedMethodName',
-    'NotSpecifiedURL', 'NotSupportedArgumentType', 'SerializerError',
+    'NotSpecifiedURL', 'NotSupportedArgumentType', 'Overloaded',
+    'RequestTimeout', 'SerializerError', 'ShuttingDown',
 )
 
 
@@ -101,5 +103,31 @@ class NotSupportedArgumentType(BaseAPIException):
     default_detail = u"Check your arguments on supported types."
 
 
+class Overloaded(BaseAPIException):
+    status_code = WS_TRY_AGAIN_LATER
+    default_detail = u"Server is overloaded. Try again later."
+
+    def __init__(self, detail=None, retry_after=None):
+        """
+        Create an instance of exception with the recommended delay before
+        the next attempt.
+
+        :param detail: users detail information (string).
+        :param retry_after: delay before the retry, in seconds.
+        """
+        super(Overloaded, self).__init__(detail)
+        self.retry_after = retry_after
+
+
+class ShuttingDown(Overloaded):
+    default_detail = u"Server is shutting down. Repeat the request after " \
+                     u"reconnect."
+
+
+class RequestTimeout(BaseAPIException):
+    status_code = WS_UNEXPECTED_CONDITION
+    default_detail = u"Request hasn't been processed before the deadline."
+
+
 class SerializerError(BaseAPIException):
     default_detail = u"Error has occurred inside serializer class."
@@ -4,20 +4,27 @@ Serializers for generated responses by the server.
 """
 import json
 
-from io import StringIO
+from io import BytesIO
 from aiorest_ws.conf import settings
 from aiorest_ws.exceptions import SerializerError
+from aiorest_ws.utils.encoders import default_encoders
 from aiorest_ws.utils.formatting import SHORT_SEPARATORS, LONG_SEPARATORS, \
     WRONG_UNICODE_SYMBOLS
-from aiorest_ws.utils.xmlutils import SimpleXMLGenerator
+from aiorest_ws.utils.xmlutils import XMLStreamGenerator
 
 __all__ = ('BaseRenderer', 'JSONRenderer', 'XMLRenderer', )
 
+# Value of the member, which is replaced onto its already rendered value
+RENDERED_PLACEHOLDER = '\x00aiorest-ws:rendered\x00'
+
 
 class BaseRenderer(object):
 
     format = None
     charset = 'utf-8'
+    # Registry of functions, which convert native Python objects (datetime,
+    # Decimal, UUID, etc.) into primitive values during rendering
+    encoders = default_encoders
 
     def render(self, data):
         """
@@ -27,6 +34,26 @@ class BaseRenderer(object):
         """
         pass
 
+    def render_chunks(self, data):
+        """
+        Render input data and return iterator over the chunks of output,
+        which can be sent as fragments of one message.
+
+        :param data: dictionary or list object (response).
+        """
+        yield self.render(data)
+
+    def render_envelope(self, data, name, rendered):
+        """
+        Render input data, where the member with the given name has been
+        already rendered. By default the whole data is rendered again.
+
+        :param data: dictionary object (response).
+        :param name: name of the rendered member.
+        :param rendered: member, rendered by this renderer.
+        """
+        return self.render(data)
+
 
 class JSONRenderer(BaseRenderer):
 
@@ -49,7 +76,8 @@ class JSONRenderer(BaseRenderer):
 
         try:
             render = json.dumps(
-                data, ensure_ascii=self.ensure_ascii, separators=separators
+                data, ensure_ascii=self.ensure_ascii, separators=separators,
+                default=self.encoders
             )
 
             # Unicode symbols \u2028 and \u2029 are invisible in JSON and
@@ -64,11 +92,32 @@ class JSONRenderer(BaseRenderer):
             raise SerializerError(exc)
         return render
 
+    def render_envelope(self, data, name, rendered):
+        """
+        Render input data, where the member with the given name has been
+        already rendered, by inserting the rendered member into the JSON.
+
+        :param data: dictionary object (response).
+        :param name: name of the rendered member.
+        :param rendered: member, rendered by this renderer.
+        """
+        envelope = dict(data)
+        envelope[name] = RENDERED_PLACEHOLDER
+        return self.render(envelope).replace(
+            self.render(RENDERED_PLACEHOLDER), rendered, 1
+        )
+
 
 class XMLRenderer(BaseRenderer):
 
     format = 'xml'
-    xml_generator = SimpleXMLGenerator
+    xml_generator = XMLStreamGenerator
+
+    def get_xml_generator(self):
+        """
+        Create an instance of generator, which converts data into XML.
+        """
+        return self.xml_generator(self.charset, self.encoders)
 
     def render(self, data):
         """
@@ -77,10 +126,42 @@ class XMLRenderer(BaseRenderer):
         :param data: dictionary or list object (response).
         """
         try:
-            render = StringIO()
-            xml = self.xml_generator(render, self.charset)
-            xml.parse(data)
-            render = bytes(render.getvalue().encode('utf-8'))
+            render = BytesIO()
+            self.get_xml_generator().write(render, data)
+            render = render.getvalue()
         except Exception as exc:
             raise SerializerError(exc)
         return render
+
+    def render_envelope(self, data, name, rendered):
+        """
+        Render input data, where the member with the given name has been
+        already rendered, by inserting content of the rendered document
+        into the XML.
+
+        :param data: dictionary object (response).
+        :param name: name of the rendered member.
+        :param rendered: member, rendered by this renderer.
+        """
+        placeholder = RENDERED_PLACEHOLDER.encode(self.charset)
+        prefix, suffix = self.render(RENDERED_PLACEHOLDER).split(placeholder)
+        if not rendered.startswith(prefix) or not rendered.endswith(suffix):
+            return self.render(data)
+        envelope = dict(data)
+        envelope[name] = RENDERED_PLACEHOLDER
+        return self.render(envelope).replace(
+            placeholder, rendered[len(prefix):len(rendered) - len(suffix)], 1
+        )
+
+    def render_chunks(self, data):
+        """
+        Render input data into XML by chunks, without building the whole
+        document in memory.
+
+        :param data: dictionary or list object (response).
+        """
+        try:
+            for chunk in self.get_xml_generator().iter_chunks(data):
+                yield chunk
+        except Exception as exc:
+            raise SerializerError(exc)
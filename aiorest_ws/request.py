@@ -4,15 +4,27 @@ Classes and function for creating and processing requests from user.
 """
 import asyncio
 import json
+import random
+import socket
 from base64 import b64encode, b64decode
 
 from autobahn.asyncio.websocket import WebSocketServerProtocol, \
     WebSocketServerFactory
+from autobahn.websocket.compress import PerMessageDeflate
 
 from aiorest_ws.abstract import AbstractRouter
+from aiorest_ws.exceptions import ShuttingDown
+from aiorest_ws.log import logger
+from aiorest_ws.renderers import JSONRenderer
 from aiorest_ws.routers import SimpleRouter
+from aiorest_ws.status import WS_NORMAL, WS_GOING_AWAY
+from aiorest_ws.utils.websocket import SLOW_CONSUMER_COALESCE, \
+    SLOW_CONSUMER_DISCONNECT, SLOW_CONSUMER_DROP, FlowControlStats, \
+    CONNECTION_CONNECTING, CONNECTION_ACTIVE, CONNECTION_IDLE, \
+    CONNECTION_PAUSED, CONNECTION_CLOSING, CONNECTION_CLOSED, \
+    CONNECTION_STATES
 from aiorest_ws.validators import check_and_set_subclass
-from aiorest_ws.wrappers import Request
+from aiorest_ws.wrappers import Request, Response
 
 __all__ = ('RequestHandlerProtocol', 'RequestHandlerFactory', )
 
@@ -23,6 +35,374 @@ class RequestHandlerProtocol(WebSocketServerProtocol):
     This protocol describe how to process network events (users requests to
     APIs) asynchronously.
     """
+    # Autobahn keeps its own state in the instance dictionary, so slots are
+    # used only for the state, which is added by aiorest-ws
+    __slots__ = (
+        'compression_policy', 'last_activity', 'last_client_activity',
+        'last_pong', 'is_idle', 'is_paused',
+        '_drain_waiter', '_pending_message', '_batch', '_batch_handle',
+        'tasks',
+    )
+
+    def __init__(self, *args, **kwargs):
+        super(RequestHandlerProtocol, self).__init__(*args, **kwargs)
+        self.compression_policy = None
+        # Time of the last sent or received message and time of the last
+        # message from the client, which is used for idle timeouts
+        self.last_activity = None
+        self.last_client_activity = None
+        # Time of the last pong, which shows only that the transport is alive
+        self.last_pong = None
+        self.is_idle = False
+        self.is_paused = False
+        self._drain_waiter = None
+        self._pending_message = None
+        self._batch = []
+        self._batch_handle = None
+        # Handlers of the received messages, mapped onto event names
+        self.tasks = {}
+
+    def connection_made(self, transport):
+        """
+        Handler, called when the TCP connection has been established.
+
+        :param transport: asyncio transport of the connection.
+        """
+        super(RequestHandlerProtocol, self).connection_made(transport)
+        self.factory.handshakes.add(self)
+        if self.factory.tcp_nodelay is not None:
+            sock = transport.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY,
+                    int(self.factory.tcp_nodelay)
+                )
+        high = self.factory.write_buffer_high
+        if high is not None:
+            transport.set_write_buffer_limits(
+                high=high, low=self.factory.write_buffer_low
+            )
+
+    def connection_lost(self, exc):
+        """
+        Handler, called when the TCP connection has been lost or closed.
+
+        :param exc: exception object or None.
+        """
+        super(RequestHandlerProtocol, self).connection_lost(exc)
+        self.factory.handshakes.discard(self)
+        self.factory.unregister_connection(self)
+        subscriptions = getattr(self.factory.router, 'subscriptions', None)
+        if subscriptions is not None:
+            subscriptions.unsubscribe(self)
+        # Nobody will read responses, so stop processing of requests
+        for task in self.tasks:
+            task.cancel()
+        self._pending_message = None
+        self._batch = []
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+            self._batch_handle = None
+        self._wake_up_drain_waiter()
+
+    def pause_writing(self):
+        """
+        Handler, called when the transport write buffer goes over the high
+        watermark.
+        """
+        self.is_paused = True
+        self.factory.flow_control_stats.pause(
+            self.transport.get_write_buffer_size()
+        )
+
+    def resume_writing(self):
+        """
+        Handler, called when the transport write buffer drains below the low
+        watermark.
+        """
+        self.is_paused = False
+        self.factory.flow_control_stats.resumed += 1
+        if self._pending_message is not None:
+            payload, kwargs = self._pending_message
+            self._pending_message = None
+            self.sendMessage(payload, **kwargs)
+        self._wake_up_drain_waiter()
+
+    def _wake_up_drain_waiter(self):
+        waiter = self._drain_waiter
+        if waiter is not None:
+            self._drain_waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    @asyncio.coroutine
+    def drain(self):
+        """
+        Wait until the transport write buffer drains below the low watermark.
+        Returns immediately, if writing isn't paused.
+        """
+        if not self.is_paused or self.transport is None:
+            return
+        if self._drain_waiter is None:
+            self._drain_waiter = asyncio.Future(loop=self.factory.loop)
+        yield from self._drain_waiter
+
+    @asyncio.coroutine
+    def send_stream(self, messages, isBinary=False):
+        """
+        Send the sequence of messages to the client, waiting for draining of
+        the write buffer before sending the next one.
+
+        :param messages: iterable object with outgoing messages in bytes.
+        :param isBinary: boolean value, means that messages have binary format.
+        """
+        for payload in messages:
+            if self.transport is None:
+                break
+            self.sendMessage(payload, isBinary=isBinary)
+            yield from self.drain()
+
+    def get_compression_policy(self, request):
+        """
+        Get compression policy for the connection. Override this method for
+        using different policies for different classes of connections (e.g.
+        choose by the path or headers of the request).
+
+        :param request: instance of ConnectionRequest from autobahn.
+        """
+        return getattr(self.factory, 'compression_policy', None)
+
+    def onConnect(self, request):
+        """
+        Handler, called when the client is connecting, but before the
+        negotiation of extensions.
+
+        :param request: instance of ConnectionRequest from autobahn.
+        """
+        policy = self.get_compression_policy(request)
+        if policy is not None:
+            self.compression_policy = policy
+            self.perMessageCompressionAccept = policy.accept
+
+    def onOpen(self):
+        """
+        Handler, called when the WebSocket connection has been established.
+        """
+        self.touch()
+        self.factory.handshakes.discard(self)
+        self.factory.register_connection(self)
+        if self.compression_policy is not None:
+            pmce = self._perMessageCompress
+            configured = self.compression_policy.configure(pmce)
+            if configured is not pmce:
+                self._perMessageCompress = configured
+                extensions = self.websocket_extensions_in_use
+                extensions[extensions.index(pmce)] = configured
+
+    def onClose(self, wasClean, code, reason):
+        """
+        Handler, called when the WebSocket connection has been closed.
+
+        :param wasClean: True, when the WebSocket was closed cleanly.
+        :param code: close status code, sent by the client.
+        :param reason: close reason, sent by the client.
+        """
+        self.factory.unregister_connection(self)
+
+    def onOpenHandshakeTimeout(self):
+        """
+        Handler, called when the client hasn't completed the opening
+        handshake in time.
+        """
+        self.factory.reaped['handshake_timeout'] += 1
+        super(RequestHandlerProtocol, self).onOpenHandshakeTimeout()
+
+    def onAutoPingTimeout(self):
+        """
+        Handler, called when the client hasn't answered onto the automatic
+        ping in time, so the connection is dropped.
+        """
+        self.factory.reaped['ping_timeout'] += 1
+        super(RequestHandlerProtocol, self).onAutoPingTimeout()
+
+    def onPong(self, payload):
+        """
+        Handler, called when the client has answered onto the ping. Pongs
+        keep the connection alive, but don't postpone the idle timeout.
+
+        :param payload: payload of the pong frame.
+        """
+        self.last_pong = self.factory.loop.time()
+        super(RequestHandlerProtocol, self).onPong(payload)
+
+    @property
+    def connection_state(self):
+        """
+        Get state of the connection, one of CONNECTION_STATES.
+        """
+        if self.state == self.STATE_OPEN:
+            if self.is_paused:
+                return CONNECTION_PAUSED
+            return CONNECTION_IDLE if self.is_idle else CONNECTION_ACTIVE
+        if self.state == self.STATE_CONNECTING:
+            return CONNECTION_CONNECTING
+        if self.state == self.STATE_CLOSING:
+            return CONNECTION_CLOSING
+        return CONNECTION_CLOSED
+
+    def close_idle(self):
+        """
+        Close the connection, which hasn't received messages for a long
+        time. When the client doesn't answer, the connection is dropped
+        after the close handshake timeout.
+        """
+        self.factory.reaped['idle_timeout'] += 1
+        self.sendClose(code=WS_NORMAL, reason=u"Idle timeout.")
+
+    def touch(self):
+        """
+        Mark the connection as active at the current time, because the
+        client has sent the message.
+        """
+        self.last_activity = self.last_client_activity = \
+            self.factory.loop.time()
+        self.is_idle = False
+
+    def enter_idle_mode(self):
+        """
+        Release memory, which isn't necessary for the idle connection. It
+        will be allocated again when the next message will be received or
+        sent. Returns True when the connection has been switched into the
+        idle mode.
+        """
+        if self.inside_message or self._batch or \
+                self.send_state != self.SEND_STATE_GROUND:
+            return False
+
+        pmce = self._perMessageCompress
+        if isinstance(pmce, PerMessageDeflate):
+            # The next message will be compressed without references to the
+            # previous ones, so the client still decodes it correctly
+            pmce._compressor = None
+            # The client could refer to the previous messages, unless it
+            # doesn't keep the compression context
+            if pmce.client_no_context_takeover:
+                pmce._decompressor = None
+
+        # Raw data of the opening handshake isn't used after it
+        self.http_request_data = None
+        self.http_response_data = None
+        self.is_idle = True
+        return True
+
+    def sendMessage(self, payload, isBinary=False, fragmentSize=None,
+                    sync=False, doNotCompress=False):
+        """
+        Send the message to the client. Payloads, which aren't worth to
+        compress according to the compression policy, are sent as is.
+
+        :param payload: outgoing message in bytes.
+        :param isBinary: boolean value, means that message has binary format.
+        :param fragmentSize: size of fragments, when message is fragmented.
+        :param sync: when True, send the data synchronously.
+        :param doNotCompress: when True, the message won't be compressed.
+        """
+        if self.is_paused and self.factory.slow_consumer_policy:
+            self._send_to_slow_consumer(
+                payload, isBinary=isBinary, fragmentSize=fragmentSize,
+                sync=sync, doNotCompress=doNotCompress
+            )
+            return
+
+        # Sent messages leave the idle mode, but don't postpone the idle
+        # timeout, which is counted only by messages from the client
+        self.last_activity = self.factory.loop.time()
+        self.is_idle = False
+        policy = self.compression_policy
+        if policy is not None and not doNotCompress and \
+                self._perMessageCompress is not None:
+            doNotCompress = not policy.should_compress(payload)
+        super(RequestHandlerProtocol, self).sendMessage(
+            payload, isBinary=isBinary, fragmentSize=fragmentSize, sync=sync,
+            doNotCompress=doNotCompress
+        )
+
+    def send_batched(self, payload):
+        """
+        Put the response envelope into the batch, which is sent as one JSON
+        array after `batch_window` seconds or when it contains `batch_size`
+        messages. Batch of the single message is sent as is.
+
+        :param payload: JSON object of the response envelope in bytes.
+        """
+        self._batch.append(payload)
+        batch_size = self.factory.batch_size
+        if batch_size and len(self._batch) >= batch_size:
+            self.flush_batch()
+        elif self._batch_handle is None:
+            self._batch_handle = self.factory.loop.call_later(
+                self.factory.batch_window, self.flush_batch
+            )
+
+    def flush_batch(self):
+        """
+        Send all messages from the batch immediately.
+        """
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+            self._batch_handle = None
+
+        batch, self._batch = self._batch, []
+        if len(batch) == 1:
+            self.sendMessage(batch[0])
+        elif batch:
+            self.sendMessage(b''.join((b'[', b','.join(batch), b']')))
+
+    def _send_to_slow_consumer(self, payload, **kwargs):
+        """
+        Process the outgoing message according to the slow consumer policy,
+        while writing into the connection is paused.
+
+        :param payload: outgoing message in bytes.
+        :param kwargs: other arguments of the sendMessage method.
+        """
+        stats = self.factory.flow_control_stats
+        policy = self.factory.slow_consumer_policy
+        if policy == SLOW_CONSUMER_DROP:
+            stats.dropped += 1
+        elif policy == SLOW_CONSUMER_COALESCE:
+            if self._pending_message is not None:
+                stats.coalesced += 1
+            self._pending_message = (payload, kwargs)
+        elif policy == SLOW_CONSUMER_DISCONNECT:
+            stats.disconnected += 1
+            self.dropConnection(abort=True)
+
+    @asyncio.coroutine
+    def close_gracefully(self, reason=None):
+        """
+        Wait for handlers of the received messages and close the connection
+        with the "going away" status code.
+
+        :param reason: close reason, sent to the client.
+        """
+        if self.tasks:
+            yield from asyncio.wait(list(self.tasks), loop=self.factory.loop)
+        self.go_away(reason)
+
+    def go_away(self, reason=None):
+        """
+        Close the connection with the "going away" status code.
+
+        :param reason: close reason, sent to the client.
+        """
+        if self._batch:
+            self.flush_batch()
+        if self.state == self.STATE_OPEN:
+            # sendClose() allows only 1000 and application specific codes
+            reason = reason.encode('utf-8') if reason is not None else None
+            self.sendCloseFrame(code=WS_GOING_AWAY, reasonUtf8=reason)
+
     def _decode_message(self, payload, isBinary=False):
         """
         Decoding input message to Request object.
@@ -59,10 +439,91 @@ class RequestHandlerProtocol(WebSocketServerProtocol):
         :param isBinary: boolean value, means that received data had a binary
                          format.
         """
+        self.touch()
         request = self._decode_message(payload, isBinary)
+        if request.cancel is not None:
+            self.cancel_request(request.cancel)
+            return
+        if request.unsubscribe is not None:
+            subscriptions = getattr(self.factory.router, 'subscriptions', None)
+            if subscriptions is not None:
+                subscriptions.unsubscribe(self, request.unsubscribe)
+            return
+        # Connection will be closed soon, so the client should repeat the
+        # request after reconnect to the other server
+        if self.factory.is_shutting_down:
+            self.reject_request(request, isBinary)
+            return
+        request.connection = self
+        request.is_binary = isBinary
+
+        task = asyncio.Task.current_task(loop=self.factory.loop)
+        self.tasks[task] = request.event_name
+        try:
+            yield from self.process_request(request, isBinary)
+        finally:
+            self.tasks.pop(task, None)
+
+    def reject_request(self, request, isBinary):
+        """
+        Reply onto the request, received during the shutdown, with the error
+        and the delay before the retry.
+
+        :param request: instance of Request.
+        :param isBinary: boolean value, means that received data had a binary
+                         format.
+        """
+        logger.info("\"{method} {url}\" rejected on shutdown".format(
+            method=request.method, url=request.url
+        ))
+        response = Response()
+        response.wrap_exception(self.factory.get_shutdown_error())
+        response.append_request(request)
+        self.send_response(JSONRenderer().render(response.content), isBinary)
+
+    def cancel_request(self, event_name):
+        """
+        Cancel processing of the requests with the specified event name.
+
+        :param event_name: event name of the cancelled requests.
+        """
+        for task, task_event_name in list(self.tasks.items()):
+            if task_event_name == event_name:
+                task.cancel()
+
+    @asyncio.coroutine
+    def process_request(self, request, isBinary):
+        """
+        Process the request from the user and send a response.
+
+        :param request: instance of Request.
+        :param isBinary: boolean value, means that received data had a binary
+                         format.
+        """
         response = self.factory.router.process_request(request)
+        if asyncio.iscoroutine(response):
+            response = yield from response
+        self.send_response(response, isBinary)
+        yield from self.drain()
+
+    def send_response(self, response, isBinary=False):
+        """
+        Send the rendered response (or update of the subscription) to the
+        client.
+
+        :param response: rendered response.
+        :param isBinary: boolean value, means that response should be sent
+                         in the binary format.
+        """
         out_payload = self._encode_message(response, isBinary)
-        self.sendMessage(out_payload, isBinary=isBinary)
+        # Only JSON envelopes can be combined into the array
+        if self.factory.batch_window is not None and not isBinary and \
+                out_payload[:1] == b'{':
+            self.send_batched(out_payload)
+        else:
+            if self._batch:
+                self.flush_batch()
+            self.sendMessage(out_payload, isBinary=isBinary)
 
 
 class RequestHandlerFactory(WebSocketServerFactory):
@@ -72,9 +533,208 @@ class RequestHandlerFactory(WebSocketServerFactory):
     NOTE: Persistent configuration information is not saved in the instantiated
     protocol. For such cases kept data in a Factory classes, databases, etc.
     """
+    compression_policy = None
+    # Amount of seconds without messages, after which connection releases
+    # compression contexts and buffers (disabled when None)
+    idle_mode_timeout = None
+    # Watermarks of the transport write buffer (in bytes), when the high
+    # one is None, asyncio defaults are used
+    write_buffer_high = None
+    write_buffer_low = None
+    # One of SLOW_CONSUMER_POLICIES or None for buffering all messages
+    slow_consumer_policy = None
+    # Responses, produced within the window (in seconds), are sent as one
+    # message with the array of envelopes (disabled when None). The batch
+    # is sent earlier, when it contains `batch_size` messages
+    batch_window = None
+    batch_size = None
+    # Amount of seconds without messages from the client, after which
+    # connection is closed (disabled when None)
+    idle_timeout = None
+    # Enable (True) or disable (False) the Nagle's algorithm for accepted
+    # sockets, None keeps the default of the event loop
+    tcp_nodelay = None
+
     def __init__(self, *args, **kwargs):
         super(RequestHandlerFactory, self).__init__(*args, **kwargs)
         self._router = kwargs.get('router', SimpleRouter(*args, **kwargs))
+        # Connections with opening handshake in progress and open ones
+        self.handshakes = set()
+        self.connections = set()
+        # Counters of the connections, closed by the server timeouts
+        self.reaped = {
+            'handshake_timeout': 0,
+            'ping_timeout': 0,
+            'idle_timeout': 0,
+        }
+        self.flow_control_stats = FlowControlStats()
+        self.is_shutting_down = False
+        # Delay and jitter before reconnect, passed to shutdown()
+        self._retry_after = (None, None)
+        self._idle_mode_handle = None
+        self._idle_timeout_handle = None
+
+    def register_connection(self, protocol):
+        """
+        Add the opened connection into the set of active connections.
+
+        :param protocol: instance of RequestHandlerProtocol.
+        """
+        self.connections.add(protocol)
+        if self.idle_mode_timeout and self._idle_mode_handle is None:
+            self._schedule_idle_mode()
+        if self.idle_timeout and self._idle_timeout_handle is None:
+            self._schedule_idle_timeout()
+
+    def unregister_connection(self, protocol):
+        """
+        Remove the closed connection from the set of active connections.
+
+        :param protocol: instance of RequestHandlerProtocol.
+        """
+        self.connections.discard(protocol)
+
+    def get_connection_stats(self):
+        """
+        Get amount of connections in every state and counters of the
+        connections, closed by timeouts, as a dictionary.
+        """
+        states = dict.fromkeys(CONNECTION_STATES, 0)
+        for protocol in self.handshakes | self.connections:
+            states[protocol.connection_state] += 1
+        return {'states': states, 'reaped': dict(self.reaped)}
+
+    def get_retry_after(self, retry_after=None, jitter=None):
+        """
+        Get delay in seconds, after which the client should reconnect, or
+        None. The random jitter spreads reconnects of the clients over time,
+        so that the other servers don't get all of them at once.
+
+        :param retry_after: minimal delay before reconnect, in seconds.
+        :param jitter: maximal random addition to the delay, in seconds.
+        """
+        if retry_after is None:
+            return None
+        return round(retry_after + random.uniform(0, jitter or 0), 3)
+
+    def get_going_away_reason(self, retry_after=None, jitter=None):
+        """
+        Get close reason with the hint in how many seconds the client should
+        reconnect.
+
+        :param retry_after: minimal delay before reconnect, in seconds.
+        :param jitter: maximal random addition to the delay, in seconds.
+        """
+        retry_after = self.get_retry_after(retry_after, jitter)
+        if retry_after is None:
+            return None
+        return json.dumps({'retry_after': retry_after})
+
+    def get_shutdown_error(self):
+        """
+        Get error for the requests, received during the shutdown, with the
+        hint in how many seconds the client should reconnect, like in the
+        close reason.
+        """
+        retry_after = self.get_retry_after(*self._retry_after)
+        return ShuttingDown(retry_after=retry_after)
+
+    @asyncio.coroutine
+    def shutdown(self, timeout=None, retry_after=None, jitter=None):
+        """
+        Close all connections with the "going away" status code, after the
+        completion of handlers for already received messages. Handlers,
+        which aren't completed in `timeout` seconds, are cancelled.
+
+        :param timeout: time to wait for the handlers, in seconds.
+        :param retry_after: minimal delay before reconnect, in seconds.
+        :param jitter: maximal random addition to the delay, in seconds.
+        """
+        self.is_shutting_down = True
+        self._retry_after = (retry_after, jitter)
+        if self._idle_mode_handle is not None:
+            self._idle_mode_handle.cancel()
+            self._idle_mode_handle = None
+        if self._idle_timeout_handle is not None:
+            self._idle_timeout_handle.cancel()
+            self._idle_timeout_handle = None
+
+        protocols = list(self.connections)
+        closings = [
+            asyncio.ensure_future(
+                protocol.close_gracefully(
+                    self.get_going_away_reason(retry_after, jitter)
+                ),
+                loop=self.loop
+            )
+            for protocol in protocols
+        ]
+        if not closings:
+            return
+
+        _, pending = yield from asyncio.wait(
+            closings, timeout=timeout, loop=self.loop
+        )
+        if pending:
+            for protocol in protocols:
+                for task in list(protocol.tasks):
+                    task.cancel()
+            # Let cancelled handlers to finish, then the connections are
+            # closed by close_gracefully coroutines
+            yield from asyncio.wait(pending, loop=self.loop)
+
+        # Wait for replies of the clients onto the close frames
+        if self.closeHandshakeTimeout:
+            yield from asyncio.wait(
+                [protocol.is_closed for protocol in protocols],
+                timeout=self.closeHandshakeTimeout, loop=self.loop
+            )
+
+    def _schedule_idle_mode(self):
+        self._idle_mode_handle = self.loop.call_later(
+            self.idle_mode_timeout, self.release_idle_connections
+        )
+
+    def release_idle_connections(self):
+        """
+        Switch connections without activity for the `idle_mode_timeout`
+        seconds into the idle mode. Called periodically, so the connection
+        becomes idle in `idle_mode_timeout` up to the doubled value seconds.
+        """
+        self._idle_mode_handle = None
+        deadline = self.loop.time() - self.idle_mode_timeout
+        released = 0
+        for protocol in self.connections:
+            if not protocol.is_idle and protocol.last_activity <= deadline:
+                released += protocol.enter_idle_mode()
+
+        if self.connections:
+            self._schedule_idle_mode()
+        return released
+
+    def _schedule_idle_timeout(self):
+        self._idle_timeout_handle = self.loop.call_later(
+            self.idle_timeout, self.close_idle_connections
+        )
+
+    def close_idle_connections(self):
+        """
+        Close connections without messages from the clients for the
+        `idle_timeout` seconds. Called periodically, so the connection is
+        closed in `idle_timeout` up to the doubled value seconds.
+        """
+        self._idle_timeout_handle = None
+        deadline = self.loop.time() - self.idle_timeout
+        closed = 0
+        for protocol in list(self.connections):
+            if protocol.connection_state != CONNECTION_CLOSING and \
+                    protocol.last_client_activity <= deadline:
+                protocol.close_idle()
+                closed += 1
+
+        if self.connections:
+            self._schedule_idle_timeout()
+        return closed
 
     @property
     def router(self):
@@ -11,16 +11,43 @@ For example, we can use this features something like this:
     router.register('user/profile/{user_name}', user_handler,
                     methods=['GET', 'PUT'])
 """
+import asyncio
+import hashlib
+import json
+from functools import partial
+
 from aiorest_ws.abstract import AbstractEndpoint, AbstractRouter
 from aiorest_ws.exceptions import BaseAPIException, EndpointValueError, \
-    NotSpecifiedHandler, NotSpecifiedURL
+    IncorrectArgument, NotSpecifiedHandler, NotSpecifiedURL, RequestTimeout
 from aiorest_ws.log import logger
 from aiorest_ws.renderers import JSONRenderer
 from aiorest_ws.parsers import URLParser
 from aiorest_ws.validators import RouteArgumentsValidator
 from aiorest_ws.wrappers import Response
 
-__all__ = ('SimpleRouter', )
+__all__ = ('Flight', 'SimpleRouter', )
+
+# Version of the response, which is replaced onto the hash of the rendered
+# data, when the response is rendered
+VERSION_PLACEHOLDER = 'content-version'
+
+
+class Flight(object):
+    """
+    Execution of the handler, shared by identical concurrent requests.
+    """
+    __slots__ = ('waiter', 'future', 'waiters')
+
+    def __init__(self, waiter):
+        """
+        Initialization of the flight.
+
+        :param waiter: coroutine, which returns the prepared response.
+        """
+        self.waiter = waiter
+        self.future = None
+        # Amount of requests, which are waiting for the response
+        self.waiters = 0
 
 
 class SimpleRouter(AbstractRouter):
@@ -29,6 +56,23 @@ class SimpleRouter(AbstractRouter):
     """
     args_validator = RouteArgumentsValidator()
     url_parser = URLParser()
+    # Instance of AdmissionController, which rejects requests under
+    # overload, or None for processing all received requests
+    admission_controller = None
+    # Instance of RequestScheduler, which defines the order of processing
+    # of the concurrent requests, or None for processing them immediately
+    scheduler = None
+    # Instance of ResponseCache for the views with the `cache_ttl` attribute,
+    # or None for disabling of the caching
+    response_cache = None
+    # Instance of SubscriptionManager, which sends updates of resources to
+    # the subscribed clients, or None for disabling of the subscriptions
+    subscriptions = None
+
+    def __init__(self, *args, **kwargs):
+        super(SimpleRouter, self).__init__(*args, **kwargs)
+        # Shared executions of the singleflight handlers by their keys
+        self._flights = {}
 
     def _correct_path(self, path):
         """
@@ -101,9 +145,424 @@ class SimpleRouter(AbstractRouter):
                 break
         return handler, args, kwargs
 
+    def get_deadline(self, request):
+        """
+        Get the deadline, given by the client, as a positive amount of
+        seconds or None.
+
+        :param request: request from user.
+        """
+        deadline = request.deadline
+        if deadline is None:
+            return None
+        if not isinstance(deadline, bool):
+            try:
+                deadline = float(deadline)
+            except (TypeError, ValueError):
+                pass
+        if not isinstance(deadline, float) or \
+                not 0 < deadline < float('inf'):
+            raise IncorrectArgument(
+                "Argument `deadline` must be a positive number of seconds."
+            )
+        return deadline
+
+    def get_timeout(self, request, handler):
+        """
+        Get amount of seconds for processing of the request, as the minimal
+        value of the handler timeout and the deadline given by the client.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        """
+        timeouts = [
+            value
+            for value in (handler.timeout, self.get_deadline(request))
+            if value is not None
+        ]
+        return min(timeouts) if timeouts else None
+
+    @asyncio.coroutine
+    def run_in_executor(self, request, handler, *args, **kwargs):
+        """
+        Invoke synchronous handler in the executor of the handler. The
+        request is marked as cancelled, when the waiting is cancelled.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        """
+        loop = asyncio.get_event_loop()
+        dispatch = partial(handler.dispatch, request, *args, **kwargs)
+        try:
+            content = yield from loop.run_in_executor(
+                handler.executor, dispatch
+            )
+        except asyncio.CancelledError:
+            request.set_cancelled()
+            raise
+        return content
+
+    def dispatch(self, request, handler, *args, **kwargs):
+        """
+        Invoke handler for the request in the event loop or in the executor
+        of the handler.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        """
+        if handler.run_in_executor:
+            return self.run_in_executor(request, handler, *args, **kwargs)
+        return handler.dispatch(request, *args, **kwargs)
+
+    @asyncio.coroutine
+    def run_scheduled(self, request, handler, *args, **kwargs):
+        """
+        Wait for the turn of the request in the scheduler and invoke the
+        handler.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        """
+        yield from self.scheduler.acquire(request, handler.priority)
+        try:
+            content = self.dispatch(request, handler, *args, **kwargs)
+            if asyncio.iscoroutine(content):
+                content = yield from content
+        finally:
+            self.scheduler.release()
+        return content
+
+    def _is_read_request(self, request):
+        method = request.method
+        return isinstance(method, str) and method.lower().strip() == 'get'
+
+    def is_cacheable(self, request, handler):
+        """
+        Check that the response for the request can be taken from the cache.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        """
+        return self.response_cache is not None and \
+            handler.cache_ttl is not None and \
+            self._is_read_request(request) and not request.subscribe
+
+    def get_cache_key(self, request, handler, renderer):
+        """
+        Get key of the cached response for the request. Event name isn't a
+        part of the key, because it's added to the response for every
+        request.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        :param renderer: renderer for the content.
+        """
+        args = request.args or {}
+        if handler.cache_vary_args is not None:
+            args = {
+                name: args[name] for name in handler.cache_vary_args
+                if name in args
+            }
+        scope = None
+        if not handler.cache_shared:
+            scope = handler.get_cache_scope(request)
+        return json.dumps(
+            [self._correct_path(request.url), renderer.format, args, scope],
+            sort_keys=True, default=str
+        )
+
+    def update_cache(self, request, handler, response, prepared,
+                     cache_key=None):
+        """
+        Store the prepared response in the cache and invalidate responses,
+        affected by the processed request. Responses with errors are
+        ignored.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        :param response: instance of Response.
+        :param prepared: response, returned by prepare_response().
+        :param cache_key: key of the response or None.
+        """
+        if self.response_cache is None or 'data' not in response.content:
+            return
+        if cache_key is not None:
+            self.response_cache.set(
+                cache_key, prepared, handler.cache_ttl, handler.cache_tags
+            )
+        elif handler.cache_invalidates and \
+                not self._is_read_request(request):
+            self.response_cache.invalidate(*handler.cache_invalidates)
+
+    @asyncio.coroutine
+    def wait_and_update_cache(self, waiter, request, handler, response,
+                              cache_key=None):
+        """
+        Wait for the prepared response of the asynchronous handler and
+        update the cache.
+
+        :param waiter: coroutine, which returns the prepared response.
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        :param response: instance of Response.
+        :param cache_key: key of the response or None.
+        """
+        prepared = yield from waiter
+        self.update_cache(request, handler, response, prepared, cache_key)
+        return prepared
+
+    @asyncio.coroutine
+    def wait_and_render(self, waiter, request):
+        """
+        Wait for the prepared response of the asynchronous handler and
+        render it for the request.
+
+        :param waiter: coroutine, which returns the prepared response.
+        :param request: request from user.
+        """
+        prepared = yield from waiter
+        return self.render_prepared(request, prepared)
+
+    def get_flight_key(self, request, handler, renderer):
+        """
+        Get key of identical requests, which share one execution of the
+        handler. The renderer format is always a part of the key, so that
+        all requests share the same rendered data.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        :param renderer: renderer for the content.
+        """
+        key = handler.get_singleflight_key(request)
+        if key is None:
+            key = self.get_cache_key(request, handler, renderer)
+        else:
+            key = json.dumps([key, renderer.format], default=str)
+        # Response could be replaced onto the not-modified notification
+        if request.if_none_match is not None:
+            key = json.dumps([key, request.if_none_match], default=str)
+        return key
+
+    @asyncio.coroutine
+    def join_flight(self, key, flight, request):
+        """
+        Wait for the prepared response of the shared execution, which is
+        started by the first awaiting request, and render it for the
+        request. Cancelling of one request doesn't affect other requests,
+        but when the last waiting request is cancelled, the shared execution
+        is cancelled too.
+
+        :param key: key of identical requests.
+        :param flight: instance of Flight.
+        :param request: request from user.
+        """
+        if flight.future is None:
+            flight.future = asyncio.ensure_future(flight.waiter)
+            flight.future.add_done_callback(
+                partial(self._land_flight, key, flight)
+            )
+        flight.waiters += 1
+        try:
+            prepared = yield from asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.future.done():
+                flight.future.cancel()
+                self._land_flight(key, flight)
+        return self.render_prepared(request, prepared)
+
+    def _land_flight(self, key, flight, future=None):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def admit(self, request, handler):
+        """
+        Check that the request can be processed under the current load.
+        Returns True, when the request was admitted and must be released
+        after the processing.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        """
+        if self.admission_controller is None:
+            return False
+        self.admission_controller.acquire(handler.priority)
+        return True
+
+    def is_not_modified(self, request, version):
+        """
+        Check that the client already has the version of the response.
+        Subscribing requests always get the data, because the subscription
+        is registered only for the full response.
+
+        :param request: request from user.
+        :param version: version of the response as a string or None.
+        """
+        return version is not None and request.if_none_match is not None \
+            and not request.subscribe \
+            and str(request.if_none_match) == version
+
+    def get_content_version(self, rendered):
+        """
+        Get version of the content as the hash of the rendered data.
+
+        :param rendered: data of the response, rendered by the renderer.
+        """
+        return hashlib.sha1(rendered).hexdigest()
+
+    def prepare_response(self, request, response, renderer, shared=False):
+        """
+        Complete the part of the response, which doesn't depend on fields
+        of the request (e.g. event name), so that it can be shared by the
+        identical requests. Returns tuple of the content, the rendered data
+        or None and the renderer.
+
+        When the version is derived from the content, the data is rendered
+        first, so that the version doesn't depend on the other members of
+        the response.
+
+        :param request: request from user.
+        :param response: instance of Response.
+        :param renderer: renderer for the content.
+        :param shared: response is shared, so the data is rendered once for
+                       all requests.
+        """
+        rendered = None
+        if response.version == VERSION_PLACEHOLDER:
+            rendered = renderer.render(response.content['data'])
+            version = self.get_content_version(rendered)
+            if self.is_not_modified(request, version):
+                response.set_not_modified(version)
+                return response.content, None, renderer
+            response.version = version
+        elif shared and 'data' in response.content:
+            rendered = renderer.render(response.content['data'])
+        return response.content, rendered, renderer
+
+    def render_prepared(self, request, prepared):
+        """
+        Render the prepared response with fields of the request. The
+        rendered data is inserted into the rendered response as is.
+
+        :param request: request from user.
+        :param prepared: response, returned by prepare_response().
+        """
+        content, rendered, renderer = prepared
+        content = dict(content)
+        content.update(request.to_representation())
+        if rendered is None:
+            return renderer.render(content)
+        return renderer.render_envelope(content, 'data', rendered)
+
+    def render_cached(self, request, prepared):
+        """
+        Render the prepared response from the cache for the request, or the
+        not-modified notification, when the client has its version.
+
+        :param request: request from user.
+        :param prepared: response, returned by prepare_response().
+        """
+        version = prepared[0].get('version')
+        if self.is_not_modified(request, version):
+            response = Response()
+            response.set_not_modified(version)
+            prepared = (response.content, None, prepared[2])
+        return self.render_prepared(request, prepared)
+
+    def set_version(self, request, handler, response, renderer,
+                    version=None):
+        """
+        Set version of the successful response. When the client already has
+        this version, content is replaced onto the not-modified notification.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        :param response: instance of Response.
+        :param renderer: renderer for the content.
+        :param version: version, given by the handler, or None.
+        """
+        if 'data' not in response.content:
+            return
+        if version is None:
+            if handler.conditional and self._is_read_request(request):
+                # Computed by prepare_response() from the rendered data
+                response.version = VERSION_PLACEHOLDER
+            return
+        if self.is_not_modified(request, version):
+            response.set_not_modified(version)
+        else:
+            response.version = version
+
+    def complete_response(self, request, handler, response, renderer,
+                          version=None):
+        """
+        Set version of the response and subscribe the client onto updates
+        of the resource, when it was requested.
+
+        :param request: request from user.
+        :param handler: instance of MethodBasedView.
+        :param response: instance of Response.
+        :param renderer: renderer for the content.
+        :param version: version, given by the handler, or None.
+        """
+        self.set_version(request, handler, response, renderer, version)
+        if request.subscribe and self.subscriptions is not None and \
+                request.connection is not None and \
+                'data' in response.content and \
+                self._is_read_request(request):
+            scope = None
+            if not handler.cache_shared:
+                scope = handler.get_cache_scope(request)
+            response.set_subscription(self.subscriptions.subscribe(
+                request, renderer, response.content['data'], scope
+            ))
+
+    @asyncio.coroutine
+    def wait_content(self, request, response, renderer, content, timeout,
+                     admitted=False, handler=None, version=None,
+                     shared=False):
+        """
+        Wait for content of the response, returned by the asynchronous or
+        thread pool handler, and prepare it for rendering.
+
+        :param request: request from user.
+        :param response: instance of Response.
+        :param renderer: renderer for the content.
+        :param content: coroutine, which returns content of the response.
+        :param timeout: amount of seconds for processing or None.
+        :param admitted: request was admitted by the admission controller.
+        :param handler: instance of MethodBasedView, which completes the
+                        response.
+        :param version: version, given by the handler, or None.
+        :param shared: response is shared by the identical requests.
+        """
+        try:
+            try:
+                response.content = yield from asyncio.wait_for(
+                    content, timeout
+                )
+                if handler is not None:
+                    self.complete_response(
+                        request, handler, response, renderer, version
+                    )
+            except asyncio.TimeoutError:
+                request.set_cancelled()
+                raise RequestTimeout()
+        except BaseAPIException as exc:
+            logger.exception(exc)
+            response.wrap_exception(exc)
+            renderer = JSONRenderer()
+        finally:
+            if admitted:
+                self.admission_controller.release()
+
+        return self.prepare_response(request, response, renderer, shared)
+
     def process_request(self, request):
         """
-        Handle received request from user.
+        Handle received request from user. Returns a coroutine instead of
+        rendered response, when the handler is asynchronous or executed
+        in the thread pool.
 
         :param request: request from user.
         """
@@ -113,6 +572,11 @@ class SimpleRouter(AbstractRouter):
             args=request.args)
         )
         response = Response()
+        admitted = False
+        handler = None
+        cache_key = None
+        flight_key = None
+        version = None
 
         try:
             url = self.extract_url(request)
@@ -120,6 +584,8 @@ class SimpleRouter(AbstractRouter):
 
             # Invoke handler for request
             if handler:
+                # Reject request as early as possible, when overloaded
+                admitted = self.admit(request, handler)
 
                 for middleware in self.middlewares:
                     middleware.process_request(request, handler)
@@ -127,17 +593,79 @@ class SimpleRouter(AbstractRouter):
                 # Search serializer for response
                 format = request.get_argument('format')
                 serializer = handler.get_renderer(format, *args, **kwargs)
+                timeout = self.get_timeout(request, handler)
+
+                # Skip processing, when the client has the actual version
+                if self._is_read_request(request):
+                    version = handler.get_version(request, *args, **kwargs)
+                    if version is not None:
+                        version = str(version)
+                    if self.is_not_modified(request, version):
+                        response.set_not_modified(version)
+                        response.append_request(request)
+                        return serializer.render(response.content)
+
+                if self.is_cacheable(request, handler):
+                    cache_key = self.get_cache_key(
+                        request, handler, serializer
+                    )
+                    prepared = self.response_cache.get(cache_key)
+                    if prepared is not None:
+                        return self.render_cached(request, prepared)
 
-                response.content = handler.dispatch(request, *args, **kwargs)
+                if handler.singleflight and not request.subscribe and \
+                        self._is_read_request(request):
+                    flight_key = self.get_flight_key(
+                        request, handler, serializer
+                    )
+                    flight = self._flights.get(flight_key)
+                    if flight is not None:
+                        return self.join_flight(flight_key, flight, request)
+
+                if self.scheduler is not None:
+                    content = self.run_scheduled(
+                        request, handler, *args, **kwargs
+                    )
+                else:
+                    content = self.dispatch(request, handler, *args, **kwargs)
+
+                if asyncio.iscoroutine(content):
+                    # Admission is released after awaiting of the content
+                    waiter = self.wait_content(
+                        request, response, serializer, content, timeout,
+                        admitted, handler, version,
+                        cache_key is not None or flight_key is not None
+                    )
+                    admitted = False
+                    if self.response_cache is not None:
+                        waiter = self.wait_and_update_cache(
+                            waiter, request, handler, response, cache_key
+                        )
+                    if flight_key is None:
+                        return self.wait_and_render(waiter, request)
+                    flight = Flight(waiter)
+                    self._flights[flight_key] = flight
+                    return self.join_flight(flight_key, flight, request)
+                response.content = content
+                self.complete_response(
+                    request, handler, response, serializer, version
+                )
             else:
                 raise NotSpecifiedHandler()
         except BaseAPIException as exc:
             logger.exception(exc)
             response.wrap_exception(exc)
             serializer = JSONRenderer()
+        finally:
+            if admitted:
+                self.admission_controller.release()
 
-        response.append_request(request)
-        return serializer.render(response.content)
+        prepared = self.prepare_response(
+            request, response, serializer, cache_key is not None
+        )
+        if handler is not None:
+            self.update_cache(request, handler, response, prepared, cache_key)
+        return self.render_prepared(request, prepared)
 
     def _register_url(self, route):
         """
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Scheduling of the requests processing, which limits amount of concurrently
+processed requests and decides, which of the waiting requests should be
+processed next.
+
+Waiting requests are grouped by priority of the route and then by tenant
+(the client token by default). Priority classes are served by the smooth
+weighted round-robin, so that the low priority requests are delayed, but
+never starve, and tenants inside of the class are served in turn, so that
+the single tenant can't occupy the whole worker.
+"""
+import asyncio
+import bisect
+import os
+
+from collections import OrderedDict, deque
+
+from aiorest_ws.admission import PRIORITY_LOW, PRIORITY_NORMAL, \
+    PRIORITY_HIGH
+
+__all__ = ('DEFAULT_CONCURRENCY', 'QueueWaitStats', 'RequestScheduler', )
+
+# Amount of concurrently processed requests by default: the amount of
+# workers in the default thread pool executor of the event loop
+DEFAULT_CONCURRENCY = (os.cpu_count() or 1) * 5
+
+
+class QueueWaitStats(object):
+    """
+    Histograms of time (in seconds), spent by requests in the queue, per
+    priority class.
+    """
+    WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(buckets or self.WAIT_BUCKETS)
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all collected values.
+        """
+        self.counts = {}
+        self.requests = {}
+        self.total_time = {}
+        self.max_time = {}
+
+    def observe(self, priority, elapsed):
+        """
+        Register time, which the request has spent in the queue.
+
+        :param priority: priority of the request.
+        :param elapsed: waiting time, in seconds.
+        """
+        if priority not in self.counts:
+            # The last counter is used for values, which are greater than
+            # the biggest bucket
+            self.counts[priority] = [0] * (len(self.buckets) + 1)
+            self.requests[priority] = 0
+            self.total_time[priority] = 0.0
+            self.max_time[priority] = 0.0
+        index = bisect.bisect_left(self.buckets, elapsed)
+        self.counts[priority][index] += 1
+        self.requests[priority] += 1
+        self.total_time[priority] += elapsed
+        self.max_time[priority] = max(self.max_time[priority], elapsed)
+
+    def snapshot(self):
+        """
+        Get collected statistics as a dictionary with priorities as keys.
+        """
+        bounds = [str(bucket) for bucket in self.buckets] + ['+inf']
+        return {
+            priority: {
+                'requests': self.requests[priority],
+                'total_time': self.total_time[priority],
+                'max_time': self.max_time[priority],
+                'histogram': dict(zip(bounds, self.counts[priority])),
+            }
+            for priority in self.counts
+        }
+
+
+class RequestScheduler(object):
+    """
+    Weighted fair queue of the requests, which are waiting for processing.
+    """
+    default_weights = {
+        PRIORITY_LOW: 1,
+        PRIORITY_NORMAL: 4,
+        PRIORITY_HIGH: 16,
+    }
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, weights=None,
+                 tenant_key=None, stats=None, loop=None):
+        """
+        Initialization of the scheduler.
+
+        :param concurrency: amount of concurrently processed requests, by
+                            default equal to the amount of workers in the
+                            default executor of the event loop.
+        :param weights: dictionary with shares of the worker per priority.
+        :param tenant_key: function, which takes the request and returns
+                           an identifier of the tenant.
+        :param stats: instance of QueueWaitStats.
+        :param loop: event loop, by default the current one.
+        """
+        self.concurrency = concurrency
+        self.weights = dict(self.default_weights)
+        self.weights.update(weights or {})
+        if tenant_key is not None:
+            self.get_tenant = tenant_key
+        self.stats = stats if stats is not None else QueueWaitStats()
+        self.loop = loop
+        self.active = 0
+        self.pending = 0
+        # Queues of waiters by priority and tenant, where tenants follow
+        # in the order of serving
+        self._queues = {}
+        self._credits = {}
+
+    def get_tenant(self, request):
+        """
+        Get identifier of the tenant, which has sent the request.
+
+        :param request: request from user.
+        """
+        return getattr(request, 'token', None)
+
+    @asyncio.coroutine
+    def acquire(self, request, priority=PRIORITY_NORMAL):
+        """
+        Wait for the turn of the request. Every acquired request must be
+        released after the processing.
+
+        :param request: request from user.
+        :param priority: priority of the requested route.
+        """
+        if self.active < self.concurrency and not self.pending:
+            self.active += 1
+            self.stats.observe(priority, 0.0)
+            return
+
+        if self.loop is None:
+            self.loop = asyncio.get_event_loop()
+        waiter = asyncio.Future(loop=self.loop)
+        tenants = self._queues.setdefault(priority, OrderedDict())
+        queue = tenants.setdefault(self.get_tenant(request), deque())
+        queue.append((waiter, self.loop.time()))
+        self.pending += 1
+        self._wakeup()
+
+        try:
+            yield from waiter
+        except asyncio.CancelledError:
+            # The turn was given, but nobody is going to use it
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        """
+        Mark the acquired request as processed and pass the turn to the
+        next waiting request.
+        """
+        self.active -= 1
+        self._wakeup()
+
+    def _wakeup(self):
+        while self.active < self.concurrency and self.pending:
+            waiter, enqueued, priority = self._pop_next()
+            self.pending -= 1
+            # Cancelled waiters are removed from queues lazily
+            if waiter.cancelled():
+                continue
+            waiter.set_result(None)
+            self.active += 1
+            self.stats.observe(priority, self.loop.time() - enqueued)
+
+    def _pop_next(self):
+        total = 0
+        selected = None
+        for priority, tenants in self._queues.items():
+            if not tenants:
+                self._credits[priority] = 0
+                continue
+            weight = self.weights.get(priority, 1)
+            credit = self._credits.get(priority, 0) + weight
+            self._credits[priority] = credit
+            total += weight
+            if selected is None or credit > self._credits[selected]:
+                selected = priority
+        self._credits[selected] -= total
+
+        tenants = self._queues[selected]
+        tenant, queue = next(iter(tenants.items()))
+        waiter, enqueued = queue.popleft()
+        # Tenant goes to the end of the line, if it has other requests
+        del tenants[tenant]
+        if queue:
+            tenants[tenant] = queue
+        return waiter, enqueued, selected
+
+    def snapshot(self):
+        """
+        Get current state of the scheduler as a dictionary.
+        """
+        return {
+            'active': self.active,
+            'pending': self.pending,
+            'queues': {
+                priority: sum(len(queue) for queue in tenants.values())
+                for priority, tenants in self._queues.items()
+            },
+            'wait_time': self.stats.snapshot(),
+        }
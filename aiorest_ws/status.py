@@ -11,7 +11,7 @@ __all__ = (
     'WS_CLOSED_ABNORMALLY', 'WS_MESSAGE_NOT_CONSISTENT',
     'WS_MESSAGE_VIOLATE_POLICY', 'WS_MESSAGE_TOO_BIG',
     'WS_SERVER_DIDNT_RETURN_EXTENSIONS', 'WS_UNEXPECTED_CONDITION',
-    'WS_FAILURE_TLS',
+    'WS_TRY_AGAIN_LATER', 'WS_FAILURE_TLS',
     'is_not_used', 'is_reserved', 'is_library', 'is_private',
 )
 
@@ -28,6 +28,7 @@ WS_MESSAGE_VIOLATE_POLICY = 1008
 WS_MESSAGE_TOO_BIG = 1009
 WS_SERVER_DIDNT_RETURN_EXTENSIONS = 1010
 WS_UNEXPECTED_CONDITION = 1011
+WS_TRY_AGAIN_LATER = 1013
 WS_FAILURE_TLS = 1015
 
 
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Subscriptions of the clients onto resources, which allow to send updates of
+the resource, instead of waiting for the repeated requests.
+
+Clients subscribe by the GET request with the `subscribe` argument and get
+the usual response with the version of the resource. When the resource
+changes, the application publishes its new representation, and every
+subscriber gets the JSON merge patch (RFC 7396) against the previous
+version, or the full snapshot: periodically, so that the clients could
+resync, and when the change can't be expressed by the merge patch.
+
+The last representation is kept once per resource (topic) and is shared by
+all subscribers, so the diff is computed once per change and rendered once
+per group of subscribers with the same event name and format. Resources of
+the different users (scopes) are different topics.
+"""
+import json
+
+__all__ = (
+    'merge_patch', 'apply_merge_patch', 'Topic', 'SubscriptionManager',
+)
+
+_MISSING = object()
+
+
+def _has_null_members(value):
+    if isinstance(value, dict):
+        return any(
+            member is None or _has_null_members(member)
+            for member in value.values()
+        )
+    return False
+
+
+def merge_patch(source, target):
+    """
+    Get JSON merge patch, which converts the source document into the
+    target one, or None when documents are equal. Raises ValueError, when
+    the target can't be reached by the merge patch, because null values of
+    object members mean removal of the members.
+
+    :param source: previous version of the document.
+    :param target: next version of the document.
+    """
+    if not isinstance(source, dict) or not isinstance(target, dict):
+        if source == target:
+            return None
+        if target is None or _has_null_members(target):
+            raise ValueError("Document can't be expressed by merge patch.")
+        return target
+
+    patch = {}
+    for key in source:
+        if key not in target:
+            patch[key] = None
+    for key, value in target.items():
+        previous = source.get(key, _MISSING)
+        if previous is _MISSING or previous != value:
+            if isinstance(previous, dict) and isinstance(value, dict):
+                patch[key] = merge_patch(previous, value)
+            elif value is None or _has_null_members(value):
+                raise ValueError(
+                    "Document can't be expressed by merge patch."
+                )
+            else:
+                patch[key] = value
+    return patch or None
+
+
+def apply_merge_patch(document, patch):
+    """
+    Apply JSON merge patch to the document and return the result. The
+    passed document isn't modified.
+
+    :param document: document, to which the patch is applied.
+    :param patch: merge patch.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(document) if isinstance(document, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+class Topic(object):
+    """
+    Last published representation of the resource and its subscribers.
+    """
+    def __init__(self, key, data, version=1):
+        """
+        Initialization of the topic.
+
+        :param key: key of the resource.
+        :param data: current representation of the resource.
+        :param version: version of the representation.
+        """
+        self.key = key
+        self.data = data
+        self.version = version
+        # Amount of changes, sent as patches after the last snapshot
+        self.changes = 0
+        # Connections grouped by event name, renderer class and binary
+        # format, because every group needs its own rendered message
+        self.subscribers = {}
+        # Connections, which got the representation different from the
+        # published one, and wait for the snapshot instead of the patch
+        self.stale = set()
+
+    def __len__(self):
+        return sum(
+            len(connections) for connections in self.subscribers.values()
+        )
+
+
+class SubscriptionManager(object):
+    """
+    Registry of topics, which sends updates to the subscribed connections.
+    """
+    def __init__(self, snapshot_interval=100):
+        """
+        Initialization of the manager.
+
+        :param snapshot_interval: amount of changes, after which subscribers
+                                  get the full snapshot instead of the patch.
+        """
+        self.snapshot_interval = snapshot_interval
+        self.topics = {}
+        # Subscriptions of every connection as pairs of topic key and group
+        self.connections = {}
+        self.patches = 0
+        self.snapshots = 0
+
+    def get_topic_key(self, url, args=None, scope=None):
+        """
+        Get key of the resource. Format of the response isn't a part of the
+        key, because the same data is rendered for every format.
+
+        :param url: URL of the resource.
+        :param args: dictionary with arguments of the request.
+        :param scope: identifier of the user, who sees the resource, or None
+                      for the resources, shared by all users.
+        """
+        url = url.strip()
+        if not url.endswith('/'):
+            url += '/'
+        args = {
+            name: value for name, value in (args or {}).items()
+            if name != 'format'
+        }
+        return json.dumps([url, args, scope], sort_keys=True, default=str)
+
+    def subscribe(self, request, renderer, data, scope=None):
+        """
+        Subscribe connection of the request onto the requested resource and
+        return current version of the resource. Other subscribers don't get
+        the passed data; when it differs from the last published one, the
+        connection gets the snapshot with the next update.
+
+        :param request: request from user with the set connection.
+        :param renderer: renderer of the response.
+        :param data: representation of the resource, sent to the client.
+        :param scope: identifier of the user, who sees the resource, or None
+                      for the resources, shared by all users.
+        """
+        key = self.get_topic_key(request.url, request.args, scope)
+        topic = self.topics.get(key)
+        if topic is None:
+            topic = self.topics[key] = Topic(key, data)
+        elif data != topic.data:
+            topic.stale.add(request.connection)
+
+        group = (request.event_name, type(renderer), request.is_binary)
+        topic.subscribers.setdefault(group, set()).add(request.connection)
+        subscriptions = self.connections.setdefault(request.connection, set())
+        subscriptions.add((key, group))
+        return topic.version
+
+    def unsubscribe(self, connection, event_name=_MISSING):
+        """
+        Remove subscriptions of the connection. Topics without subscribers
+        are removed too.
+
+        :param connection: instance of RequestHandlerProtocol.
+        :param event_name: event name of the removed subscriptions, by
+                           default all subscriptions are removed.
+        """
+        subscriptions = self.connections.get(connection)
+        if not subscriptions:
+            return
+
+        for key, group in list(subscriptions):
+            if event_name is not _MISSING and group[0] != event_name:
+                continue
+            subscriptions.discard((key, group))
+            topic = self.topics[key]
+            connections = topic.subscribers[group]
+            connections.discard(connection)
+            if not connections:
+                del topic.subscribers[group]
+            if not any(connection in connections
+                       for connections in topic.subscribers.values()):
+                topic.stale.discard(connection)
+            if not topic.subscribers:
+                del self.topics[key]
+
+        if not subscriptions:
+            del self.connections[connection]
+
+    def publish(self, url, data, args=None, scope=None):
+        """
+        Publish new representation of the resource to subscribers. Returns
+        the version of the resource or None, when nobody subscribed to it.
+
+        :param url: URL of the resource.
+        :param data: new representation of the resource.
+        :param args: dictionary with arguments of the subscribed requests.
+        :param scope: identifier of the user, who sees the resource, or None
+                      for the resources, shared by all users.
+        """
+        topic = self.topics.get(self.get_topic_key(url, args, scope))
+        if topic is None:
+            return None
+        self.update(topic, data)
+        return topic.version
+
+    def update(self, topic, data):
+        """
+        Set new representation of the topic and send the difference with
+        the previous one to subscribers.
+
+        :param topic: instance of Topic.
+        :param data: new representation of the resource.
+        """
+        try:
+            patch = merge_patch(topic.data, data)
+        except ValueError:
+            snapshot = True
+        else:
+            if patch is None:
+                self.resync(topic)
+                return
+            snapshot = topic.changes + 1 >= self.snapshot_interval
+
+        topic.data = data
+        topic.version += 1
+        if snapshot:
+            topic.changes = 0
+            topic.stale.clear()
+            self.snapshots += 1
+            message = {'data': data, 'snapshot': True}
+        else:
+            topic.changes += 1
+            self.patches += 1
+            message = {'patch': patch}
+        message['version'] = topic.version
+        self.broadcast(topic, message, exclude=topic.stale)
+        self.resync(topic)
+
+    def resync(self, topic):
+        """
+        Send the snapshot of the topic to the stale subscribers.
+
+        :param topic: instance of Topic.
+        """
+        if not topic.stale:
+            return
+        self.snapshots += 1
+        message = {'data': topic.data, 'snapshot': True,
+                   'version': topic.version}
+        self.broadcast(topic, message, include=topic.stale)
+        topic.stale.clear()
+
+    def broadcast(self, topic, message, include=None, exclude=()):
+        """
+        Render the message once per group of subscribers and send it.
+
+        :param topic: instance of Topic.
+        :param message: dictionary with content of the message.
+        :param include: set of the connections, which get the message, or
+                        None for all subscribers.
+        :param exclude: set of the connections, which don't get the message.
+        """
+        for group, connections in topic.subscribers.items():
+            if include is not None:
+                connections = connections & include
+            if exclude:
+                connections = connections - exclude
+            if not connections:
+                continue
+            event_name, renderer_class, is_binary = group
+            message['event_name'] = event_name
+            payload = renderer_class().render(message)
+            for connection in connections:
+                connection.send_response(payload, is_binary)
+
+    def snapshot(self):
+        """
+        Get current state of the manager as a dictionary.
+        """
+        return {
+            'topics': len(self.topics),
+            'subscriptions': sum(len(topic) for topic in self.topics.values()),
+            'patches': self.patches,
+            'snapshots': self.snapshots,
+        }
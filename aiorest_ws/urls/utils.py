@@ -15,6 +15,7 @@ __all__ = (
 
 
 class RouteMatch(object):
+    __slots__ = ('view_name', 'args', 'kwargs')
 
     def __init__(self, view_name, args=(), kwargs={}):
         super(RouteMatch, self).__init__()
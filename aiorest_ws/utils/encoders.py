@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of type encoders, used by renderers for converting native Python
+objects (datetimes, decimals, UUIDs, etc.) into primitive values.
+
+Serializers can leave values in the native format (e.g. set `format=None`
+for date/time fields or disable `COERCE_DECIMAL_TO_STRING`) and let the
+renderer convert them in one place, instead of per-value formatting inside
+of every field.
+"""
+import datetime
+import decimal
+import uuid
+
+from aiorest_ws.conf import settings
+
+__all__ = (
+    'encode_datetime', 'encode_date', 'encode_time', 'encode_timedelta',
+    'encode_decimal', 'encode_bytes', 'TypeEncoders', 'DEFAULT_ENCODERS',
+    'default_encoders',
+)
+
+
+def encode_datetime(value):
+    """
+    Convert datetime object into ISO 8601 string. UTC offset is replaced
+    onto the `Z` suffix, as it does the `DateTimeField` class.
+
+    :param value: instance of datetime.datetime.
+    """
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def encode_date(value):
+    """
+    Convert date object into ISO 8601 string.
+
+    :param value: instance of datetime.date.
+    """
+    return value.isoformat()
+
+
+def encode_time(value):
+    """
+    Convert time object into ISO 8601 string.
+
+    :param value: instance of datetime.time.
+    """
+    if value.utcoffset() is not None:
+        raise ValueError("JSON can't represent timezone-aware times.")
+    return value.isoformat()
+
+
+def encode_timedelta(value):
+    """
+    Convert timedelta object into string with total amount of seconds.
+
+    :param value: instance of datetime.timedelta.
+    """
+    return str(value.total_seconds())
+
+
+def encode_decimal(value):
+    """
+    Convert decimal into string, or into float if the decimal values
+    shouldn't be coerced to strings.
+
+    :param value: instance of decimal.Decimal.
+    """
+    if settings.COERCE_DECIMAL_TO_STRING:
+        return '{0:f}'.format(value)
+    return float(value)
+
+
+def encode_bytes(value):
+    """
+    Decode bytes into UTF-8 string.
+
+    :param value: bytes or bytearray object.
+    """
+    return bytes(value).decode('utf-8')
+
+
+DEFAULT_ENCODERS = (
+    (datetime.datetime, encode_datetime),
+    (datetime.date, encode_date),
+    (datetime.time, encode_time),
+    (datetime.timedelta, encode_timedelta),
+    (decimal.Decimal, encode_decimal),
+    (uuid.UUID, str),
+    (bytes, encode_bytes),
+    (bytearray, encode_bytes),
+    (set, list),
+    (frozenset, list),
+)
+
+
+class TypeEncoders(object):
+    """
+    Mapping of types onto the functions, which convert instances of these
+    types into the primitive values.
+
+    Lookups are traversing the inheritance hierarchy in method resolution
+    order and are cached per concrete type, so that the instance can be
+    passed as the `default` argument to the `json.dumps()` function (or
+    to any other codec, which supports this parameter) without overhead.
+    """
+    def __init__(self, encoders=DEFAULT_ENCODERS):
+        self._encoders = {}
+        self._cache = {}
+        for obj_type, encoder in encoders:
+            self.register(obj_type, encoder)
+
+    def register(self, obj_type, encoder):
+        """
+        Register encoder for the specified type.
+
+        :param obj_type: class, which instances will be encoded.
+        :param encoder: callable, which takes an instance of the obj_type and
+                        returns a primitive value.
+        """
+        self._encoders[obj_type] = encoder
+        self._cache.clear()
+
+    def unregister(self, obj_type):
+        """
+        Remove encoder for the specified type.
+
+        :param obj_type: class, which have registered earlier.
+        """
+        self._encoders.pop(obj_type, None)
+        self._cache.clear()
+
+    def get(self, obj_type, default=None):
+        """
+        Get encoder for the specified type or `default` value, when the
+        suitable encoder wasn't found.
+
+        :param obj_type: class, for which necessary to find an encoder.
+        :param default: returned value, when encoder not found.
+        """
+        try:
+            encoder = self._cache[obj_type]
+        except KeyError:
+            encoder = None
+            for cls in obj_type.__mro__:
+                if cls in self._encoders:
+                    encoder = self._encoders[cls]
+                    break
+            self._cache[obj_type] = encoder
+        return encoder if encoder is not None else default
+
+    def copy(self):
+        """
+        Make a copy of the registry, which could be modified independently.
+        """
+        return self.__class__(self._encoders.items())
+
+    def __contains__(self, obj_type):
+        return self.get(obj_type) is not None
+
+    def __call__(self, obj):
+        """
+        Encode the passed object into a primitive value.
+
+        :param obj: object, which necessary to encode.
+        """
+        encoder = self.get(type(obj))
+        if encoder is None:
+            raise TypeError(
+                "Object of type '{0}' is not serializable.".format(
+                    type(obj).__name__
+                )
+            )
+        return encoder(obj)
+
+
+default_encoders = TypeEncoders()
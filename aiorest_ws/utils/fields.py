@@ -7,11 +7,16 @@ import collections
 import inspect
 
 __all__ = (
-    'is_simple_callable', 'method_overridden', 'get_attribute', 'set_value',
-    'to_choices_dict', 'flatten_choices_dict'
+    'is_simple_callable', 'method_overridden', 'call_attribute',
+    'get_attribute', 'set_value', 'to_choices_dict', 'flatten_choices_dict'
 )
 
 
+# Results of `is_simple_callable()` by code object of the function, kind of
+# the callable and amount of default values
+_simple_callables = {}
+
+
 def is_simple_callable(obj):
     """
     True if the object is a callable that takes no arguments.
@@ -22,10 +27,14 @@ def is_simple_callable(obj):
     if not (function or method):
         return False
 
-    args, _, _, defaults = inspect.getargspec(obj)
-    len_args = len(args) if function else len(args) - 1
-    len_defaults = len(defaults) if defaults else 0
-    return len_args <= len_defaults
+    key = (obj.__code__, method, len(obj.__defaults__ or ()))
+    result = _simple_callables.get(key)
+    if result is None:
+        args, _, _, defaults = inspect.getargspec(obj)
+        len_args = len(args) if function else len(args) - 1
+        len_defaults = len(defaults) if defaults else 0
+        result = _simple_callables[key] = len_args <= len_defaults
+    return result
 
 
 def method_overridden(method_name, cls, instance):
@@ -37,6 +46,26 @@ def method_overridden(method_name, cls, instance):
     return default_method is not getattr(instance, method_name).__func__
 
 
+def call_attribute(value, attr):
+    """
+    Returns result of the call, when the value of the attribute is a callable
+    that takes no arguments, otherwise the value itself.
+    """
+    if not is_simple_callable(value):
+        return value
+
+    try:
+        return value()
+    except (AttributeError, KeyError) as exc:
+        # If we raised an Attribute or KeyError here it'd get treated
+        # as an omitted field in `Field.get_attribute()`. Instead we
+        # raise a ValueError to ensure the exception is not masked
+        raise ValueError(
+            'Exception raised in callable attribute "{0}"; '
+            'original exception was: {1}'.format(attr, exc)
+        )
+
+
 def get_attribute(instance, attrs):
     """
     Similar to Python's built in `getattr(instance, attr)`, but takes a list
@@ -53,17 +82,7 @@ def get_attribute(instance, attrs):
         else:
             instance = getattr(instance, attr)
 
-        if is_simple_callable(instance):
-            try:
-                instance = instance()
-            except (AttributeError, KeyError) as exc:
-                # If we raised an Attribute or KeyError here it'd get treated
-                # as an omitted field in `Field.get_attribute()`. Instead we
-                # raise a ValueError to ensure the exception is not masked
-                raise ValueError(
-                    'Exception raised in callable attribute "{0}"; '
-                    'original exception was: {1}'.format(attr, exc)
-                )
+        instance = call_attribute(instance, attr)
 
     return instance
 
@@ -8,3 +8,12 @@ WRONG_UNICODE_SYMBOLS = [
     ("\u2028", "\\u2028"),
     ("\u2029", "\\u2029"),
 ]
+
+# Layouts of serialized lists of objects:
+# - records: list of dictionaries (the default one)
+# - table: {"columns": [names...], "rows": [[values...], ...]}
+# - columns: {name: [values...], ...} (also known as struct-of-arrays)
+RECORDS_LAYOUT = 'records'
+TABLE_LAYOUT = 'table'
+COLUMNS_LAYOUT = 'columns'
+RESPONSE_LAYOUTS = (RECORDS_LAYOUT, TABLE_LAYOUT, COLUMNS_LAYOUT)
@@ -63,6 +63,9 @@ class BoundField(object):
     Returned when iterating over a serializer instance,
     providing an API similar to Django forms and form fields.
     """
+    # Bound fields are created for every field of the serializer, so that
+    # they are stored compactly, without the dictionary of attributes
+    __slots__ = ('_field', '_prefix', 'value', 'errors', 'name')
 
     def __init__(self, field, value, errors, prefix=''):
         self._field = field
@@ -94,6 +97,7 @@ class NestedBoundField(BoundField):
     in order to support nested bound fields. This class is the type of
     `BoundField` that is used for serializer fields.
     """
+    __slots__ = ()
 
     def __init__(self, field, value, errors, prefix=''):
         if value is None or value is '':
@@ -3,10 +3,52 @@
 This module contains classes and functions, used for configuration
 issues with websockets.
 """
-from autobahn.websocket.compress import PerMessageDeflateOffer, \
-    PerMessageDeflateOfferAccept
+import bisect
+import time
+import zlib
 
-__all__ = ('deflate_offer_accept', )
+from autobahn.websocket.compress import PerMessageDeflate, \
+    PerMessageDeflateOffer, PerMessageDeflateOfferAccept
+
+__all__ = (
+    'deflate_offer_accept', 'CompressionStats', 'CompressionPolicy',
+    'PolicyPerMessageDeflate', 'SLOW_CONSUMER_DROP', 'SLOW_CONSUMER_COALESCE',
+    'SLOW_CONSUMER_DISCONNECT', 'SLOW_CONSUMER_POLICIES', 'FlowControlStats',
+    'CONNECTION_CONNECTING', 'CONNECTION_ACTIVE', 'CONNECTION_IDLE',
+    'CONNECTION_PAUSED', 'CONNECTION_CLOSING', 'CONNECTION_CLOSED',
+    'CONNECTION_STATES',
+)
+
+# Policies for the messages, which are sent to the client, which doesn't
+# read data fast enough (when the write buffer is above the high watermark):
+# - drop: message is discarded
+# - coalesce: only the latest message is kept and sent, when the client
+#   will read the buffered data
+# - disconnect: connection is aborted
+SLOW_CONSUMER_DROP = 'drop'
+SLOW_CONSUMER_COALESCE = 'coalesce'
+SLOW_CONSUMER_DISCONNECT = 'disconnect'
+SLOW_CONSUMER_POLICIES = (
+    SLOW_CONSUMER_DROP, SLOW_CONSUMER_COALESCE, SLOW_CONSUMER_DISCONNECT,
+)
+
+# States of the client connections:
+# - connecting: opening handshake isn't completed yet
+# - active: connection is open and processes messages
+# - idle: connection is open, but released memory after the inactivity
+# - paused: the client doesn't read data fast enough
+# - closing: closing handshake is in progress
+# - closed: connection is closed
+CONNECTION_CONNECTING = 'connecting'
+CONNECTION_ACTIVE = 'active'
+CONNECTION_IDLE = 'idle'
+CONNECTION_PAUSED = 'paused'
+CONNECTION_CLOSING = 'closing'
+CONNECTION_CLOSED = 'closed'
+CONNECTION_STATES = (
+    CONNECTION_CONNECTING, CONNECTION_ACTIVE, CONNECTION_IDLE,
+    CONNECTION_PAUSED, CONNECTION_CLOSING, CONNECTION_CLOSED,
+)
 
 
 def deflate_offer_accept(offers):
@@ -21,3 +63,303 @@ def deflate_offer_accept(offers):
     for offer in offers:
         if isinstance(offer, PerMessageDeflateOffer):
             return PerMessageDeflateOfferAccept(offer)
+
+
+class CompressionStats(object):
+    """
+    Histograms of compression ratio (compressed size divided onto the
+    original size) and compression time (in seconds) of outgoing messages.
+    """
+    RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+    TIME_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01)
+
+    def __init__(self, ratio_buckets=None, time_buckets=None):
+        self.ratio_buckets = tuple(ratio_buckets or self.RATIO_BUCKETS)
+        self.time_buckets = tuple(time_buckets or self.TIME_BUCKETS)
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all collected values.
+        """
+        # The last counter of every histogram is used for values, which
+        # are greater than the biggest bucket
+        self.ratio_counts = [0] * (len(self.ratio_buckets) + 1)
+        self.time_counts = [0] * (len(self.time_buckets) + 1)
+        self.compressed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.total_time = 0.0
+
+    def observe(self, size, compressed_size, elapsed):
+        """
+        Register the compressed message.
+
+        :param size: length of the original payload.
+        :param compressed_size: length of the compressed payload.
+        :param elapsed: time spent on compression, in seconds.
+        """
+        ratio = float(compressed_size) / size if size else 1.0
+        self.ratio_counts[bisect.bisect_left(self.ratio_buckets, ratio)] += 1
+        self.time_counts[bisect.bisect_left(self.time_buckets, elapsed)] += 1
+        self.compressed += 1
+        self.bytes_in += size
+        self.bytes_out += compressed_size
+        self.total_time += elapsed
+
+    def skip(self, size):
+        """
+        Register the message, which was sent without compression.
+
+        :param size: length of the payload.
+        """
+        self.skipped += 1
+
+    @property
+    def ratio(self):
+        """
+        Get overall compression ratio of all compressed messages.
+        """
+        return float(self.bytes_out) / self.bytes_in if self.bytes_in else 1.0
+
+    def _histogram(self, buckets, counts):
+        bounds = [str(bucket) for bucket in buckets] + ['+inf']
+        return dict(zip(bounds, counts))
+
+    def snapshot(self):
+        """
+        Get collected statistics as a dictionary.
+        """
+        return {
+            'compressed': self.compressed,
+            'skipped': self.skipped,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': self.ratio,
+            'total_time': self.total_time,
+            'ratio_histogram': self._histogram(
+                self.ratio_buckets, self.ratio_counts
+            ),
+            'time_histogram': self._histogram(
+                self.time_buckets, self.time_counts
+            ),
+        }
+
+
+class PolicyPerMessageDeflate(PerMessageDeflate):
+    """
+    `permessage-deflate` extension processor, which compresses messages with
+    the specified compression level and reports every compressed message to
+    the CompressionStats instance.
+    """
+    def __init__(self, *args, **kwargs):
+        self.level = kwargs.pop('level', zlib.Z_DEFAULT_COMPRESSION)
+        self.stats = kwargs.pop('stats', None)
+        super(PolicyPerMessageDeflate, self).__init__(*args, **kwargs)
+        self._size = 0
+        self._compressed_size = 0
+        self._started_at = None
+
+    @classmethod
+    def create_from(cls, pmce, level=zlib.Z_DEFAULT_COMPRESSION, stats=None):
+        """
+        Create processor with the same negotiated parameters, as used by the
+        passed PerMessageDeflate instance.
+
+        :param pmce: instance of PerMessageDeflate.
+        :param level: compression level (from 0 to 9, or -1 for default).
+        :param stats: instance of CompressionStats or None.
+        """
+        return cls(
+            pmce._isServer,
+            pmce.server_no_context_takeover,
+            pmce.client_no_context_takeover,
+            pmce.server_max_window_bits,
+            pmce.client_max_window_bits,
+            pmce.mem_level,
+            level=level,
+            stats=stats
+        )
+
+    def startCompressMessage(self):
+        if self._isServer:
+            no_context_takeover = self.server_no_context_takeover
+            window_bits = self.server_max_window_bits
+        else:
+            no_context_takeover = self.client_no_context_takeover
+            window_bits = self.client_max_window_bits
+
+        if self._compressor is None or no_context_takeover:
+            self._compressor = zlib.compressobj(
+                self.level, zlib.DEFLATED, -window_bits, self.mem_level
+            )
+        self._size = 0
+        self._compressed_size = 0
+        self._started_at = time.perf_counter()
+
+    def compressMessageData(self, data):
+        compressed = self._compressor.compress(data)
+        self._size += len(data)
+        self._compressed_size += len(compressed)
+        return compressed
+
+    def endCompressMessage(self):
+        data = super(PolicyPerMessageDeflate, self).endCompressMessage()
+        if self.stats is not None:
+            elapsed = time.perf_counter() - self._started_at
+            self.stats.observe(
+                self._size, self._compressed_size + len(data), elapsed
+            )
+        # Release the compressor right away, because it won't be re-used
+        # for the next message without the context takeover
+        if self._isServer and self.server_no_context_takeover:
+            self._compressor = None
+        return data
+
+
+class CompressionPolicy(object):
+    """
+    Policy of compressing outgoing messages with "permessage-deflate"
+    WebSocket extension.
+
+    Instance of this class can be used as an accept function for the
+    compression offers from the clients (as the `deflate_offer_accept`
+    function does) and define, which messages are worth compressing.
+    """
+    def __init__(self, min_size=0, level=zlib.Z_DEFAULT_COMPRESSION,
+                 max_window_bits=None, no_context_takeover=False,
+                 client_no_context_takeover=False, mem_level=None,
+                 stats=None):
+        """
+        Initialization of the compression policy.
+
+        :param min_size: payloads shorter than this length (in bytes) are
+                         sent without compression.
+        :param level: compression level, from 0 to 9 (or -1 for the default
+                      zlib level).
+        :param max_window_bits: size of the server compression window (from
+                                8 to 15), or None for the maximal size.
+        :param no_context_takeover: when True, the server compression
+                                    context isn't kept between messages.
+        :param client_no_context_takeover: when True, the client is asked to
+                                           don't keep compression context
+                                           between messages (if it supports
+                                           this), so that the server doesn't
+                                           need it for decompression too.
+        :param mem_level: amount of memory used for the compressor's
+                          internal state (from 1 to 9), or None for default.
+        :param stats: instance of CompressionStats, which will be used for
+                      collecting statistics.
+        """
+        assert level == zlib.Z_DEFAULT_COMPRESSION or 0 <= level <= 9, \
+            "Argument `level` must be in range from 0 to 9, or -1."
+        assert max_window_bits is None or 8 <= max_window_bits <= 15, \
+            "Argument `max_window_bits` must be in range from 8 to 15."
+        self.min_size = min_size
+        self.level = level
+        self.max_window_bits = max_window_bits
+        self.no_context_takeover = no_context_takeover
+        self.client_no_context_takeover = client_no_context_takeover
+        self.mem_level = mem_level
+        self.stats = stats if stats is not None else CompressionStats()
+
+    def accept(self, offers):
+        """
+        Accept the first "permessage-deflate" offer from the client with
+        parameters of the policy.
+
+        :param offers: iterable object (list, tuple), where every object
+                       is instance of PerMessageDeflateOffer.
+        """
+        for offer in offers:
+            if not isinstance(offer, PerMessageDeflateOffer):
+                continue
+
+            # Server is free to use a smaller window and to drop the context
+            # after each message, but must respect limits of the client
+            window_bits = self.max_window_bits
+            if offer.requestMaxWindowBits:
+                window_bits = min(
+                    window_bits or offer.requestMaxWindowBits,
+                    offer.requestMaxWindowBits
+                )
+            no_context_takeover = None
+            if self.no_context_takeover or offer.requestNoContextTakeover:
+                no_context_takeover = True
+            request_no_context_takeover = False
+            if self.client_no_context_takeover:
+                request_no_context_takeover = offer.acceptNoContextTakeover
+            return PerMessageDeflateOfferAccept(
+                offer,
+                requestNoContextTakeover=request_no_context_takeover,
+                noContextTakeover=no_context_takeover,
+                windowBits=window_bits,
+                memLevel=self.mem_level
+            )
+
+    __call__ = accept
+
+    def should_compress(self, payload):
+        """
+        Check that the payload is worth compressing.
+
+        :param payload: outgoing message in bytes.
+        """
+        if len(payload) < self.min_size:
+            self.stats.skip(len(payload))
+            return False
+        return True
+
+    def configure(self, pmce):
+        """
+        Get compression processor for the established connection.
+
+        :param pmce: negotiated PerMessageCompress instance or None.
+        """
+        if isinstance(pmce, PerMessageDeflate):
+            return PolicyPerMessageDeflate.create_from(
+                pmce, level=self.level, stats=self.stats
+            )
+        return pmce
+
+
+class FlowControlStats(object):
+    """
+    Counters of the outgoing flow control events for all connections.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all collected values.
+        """
+        self.paused = 0
+        self.resumed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.disconnected = 0
+        self.max_buffer_size = 0
+
+    def pause(self, buffer_size):
+        """
+        Register the pause of writing into the connection.
+
+        :param buffer_size: size of the transport write buffer.
+        """
+        self.paused += 1
+        self.max_buffer_size = max(self.max_buffer_size, buffer_size)
+
+    def snapshot(self):
+        """
+        Get collected statistics as a dictionary.
+        """
+        return {
+            'paused': self.paused,
+            'resumed': self.resumed,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'disconnected': self.disconnected,
+            'max_buffer_size': self.max_buffer_size,
+        }
@@ -2,9 +2,13 @@
 """
 XML classes and functions, used for serializing and de-serializing.
 """
-from xml.sax.saxutils import XMLGenerator
+import re
+from itertools import repeat
+from xml.sax.saxutils import XMLGenerator, escape
 
-__all__ = ('SimpleXMLGenerator', )
+__all__ = ('SimpleXMLGenerator', 'XMLStreamGenerator', )
+
+XML_SPECIAL_CHARACTERS = re.compile(r'[&<>]')
 
 
 class SimpleXMLGenerator(XMLGenerator):
@@ -14,8 +18,9 @@ class SimpleXMLGenerator(XMLGenerator):
     root_name = 'root'
     item_tag_name = 'list-item'
 
-    def __init__(self, stream, encoding='utf-8'):
+    def __init__(self, stream, encoding='utf-8', encoders=None):
         super(SimpleXMLGenerator, self).__init__(stream, encoding=encoding)
+        self.encoders = encoders
 
     def parse(self, data):
         """
@@ -35,6 +40,10 @@ class SimpleXMLGenerator(XMLGenerator):
 
         :param value: value, which will have converted to the string.
         """
+        if self.encoders is not None:
+            encoder = self.encoders.get(type(value))
+            if encoder is not None:
+                value = encoder(value)
         return str(value).encode(self._encoding)
 
     def to_xml(self, xml, data):
@@ -58,3 +67,108 @@ class SimpleXMLGenerator(XMLGenerator):
             pass
         else:
             xml.characters(self.to_str(data))
+
+
+class XMLStreamGenerator(object):
+    """
+    XML generator, which walks over the input data iteratively (without
+    recursion) and produces UTF-8 encoded chunks of the document.
+    """
+    root_name = 'root'
+    item_tag_name = 'list-item'
+    chunk_size = 64 * 1024
+
+    def __init__(self, encoding='utf-8', encoders=None, chunk_size=None):
+        self.encoding = encoding
+        self.encoders = encoders
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+
+    def to_str(self, value):
+        """
+        Convert scalar value into the escaped text of a XML node.
+
+        :param value: value, which will have converted to the string.
+        """
+        value_type = type(value)
+        if value_type is not str:
+            if self.encoders is not None:
+                encoder = self.encoders.get(value_type)
+                if encoder is not None:
+                    value = encoder(value)
+            value = str(value)
+
+        if XML_SPECIAL_CHARACTERS.search(value):
+            value = escape(value)
+        return value
+
+    def _children(self, data):
+        """
+        Get iterator over pairs of (tag name, value) for the container.
+
+        :param data: dictionary, list or tuple.
+        """
+        if isinstance(data, dict):
+            return iter(data.items())
+        return zip(repeat(self.item_tag_name), data)
+
+    def iter_chunks(self, data):
+        """
+        Convert data to XML and return iterator over encoded chunks of the
+        document. Every chunk, except the last, is at least of `chunk_size`
+        characters.
+
+        :param data: input data.
+        """
+        encoding = self.encoding
+        chunk_size = self.chunk_size
+        to_str = self.to_str
+        children = self._children
+        containers = (list, tuple, dict)
+
+        parts = [
+            '<?xml version="1.0" encoding="{0}"?>\n'.format(encoding),
+            '<{0}>'.format(self.root_name)
+        ]
+        size = 0
+        stack = []
+        if isinstance(data, containers):
+            stack.append((children(data), None))
+        elif data is not None:
+            parts.append(to_str(data))
+
+        while stack:
+            iterator, tag = stack[-1]
+            for name, value in iterator:
+                if isinstance(value, containers):
+                    parts.append('<' + name + '>')
+                    stack.append((children(value), name))
+                    break
+
+                if value is None:
+                    text = '<' + name + '></' + name + '>'
+                else:
+                    text = '<' + name + '>' + to_str(value) + '</' + name + '>'
+                parts.append(text)
+                size += len(text)
+                if size >= chunk_size:
+                    yield ''.join(parts).encode(encoding)
+                    parts = []
+                    size = 0
+            else:
+                stack.pop()
+                if tag is not None:
+                    parts.append('</' + tag + '>')
+
+        parts.append('</{0}>'.format(self.root_name))
+        yield ''.join(parts).encode(encoding)
+
+    def write(self, stream, data):
+        """
+        Write XML document of the passed data into the binary stream.
+
+        :param stream: file-like object, opened in binary mode.
+        :param data: input data.
+        """
+        for chunk in self.iter_chunks(data):
+            stream.write(chunk)
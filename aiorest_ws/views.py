@@ -3,9 +3,12 @@
 This module provide a function and class-based views and can be used
 with aiorest-ws routers.
 """
-from aiorest_ws.exceptions import IncorrectMethodNameType, \
-    InvalidRenderer, NotSpecifiedHandler, NotSpecifiedMethodName
+from aiorest_ws.admission import PRIORITY_NORMAL
+from aiorest_ws.exceptions import IncorrectArgument, \
+    IncorrectMethodNameType, InvalidRenderer, NotSpecifiedHandler, \
+    NotSpecifiedMethodName
 from aiorest_ws.renderers import JSONRenderer
+from aiorest_ws.utils.formatting import RESPONSE_LAYOUTS
 
 __all__ = ('http_methods', 'View', 'MethodViewMeta', 'MethodBasedView', )
 
@@ -49,6 +52,36 @@ class MethodBasedView(View, metaclass=MethodViewMeta):
     Method-based view for aiorest-ws framework.
     """
     renderers = ()
+    # Layout of serialized lists of objects (records, table or columns),
+    # which can be overridden by the client with the `layout` argument
+    response_layout = None
+    # Default amount of seconds for processing of the request by asynchronous
+    # (coroutine) or thread pool handlers, None means no limit
+    timeout = None
+    # Run synchronous handlers in the executor (thread pool by default)
+    run_in_executor = False
+    executor = None
+    # Priority of the requests, used by the admission controller of the
+    # router for rejecting less important requests under overload
+    priority = PRIORITY_NORMAL
+    # Time to live (in seconds) of the rendered GET responses in the cache
+    # of the router, None disables caching
+    cache_ttl = None
+    # Names of the request arguments, which change the response (None means
+    # all arguments). Responses are cached per user (or token), unless the
+    # `cache_shared` attribute allows to return them to all users
+    cache_vary_args = None
+    cache_shared = False
+    # Tags of the cached responses and tags of the cached responses, which
+    # are invalidated after successful processing of the other methods
+    cache_tags = ()
+    cache_invalidates = ()
+    # Concurrent identical GET requests share one execution of the
+    # asynchronous handler and receive the same rendered response
+    singleflight = False
+    # Attach hash of the rendered data to GET responses as the version,
+    # when the get_version() method doesn't return a version
+    conditional = False
 
     def dispatch(self, request, *args, **kwargs):
         """
@@ -76,6 +109,39 @@ class MethodBasedView(View, metaclass=MethodViewMeta):
             raise NotSpecifiedHandler()
         return handler(request, *args, **kwargs)
 
+    def get_cache_scope(self, request):
+        """
+        Get identifier of the user, used as a scope of the cached responses
+        (unless the `cache_shared` attribute is set) and of the subscriptions.
+
+        :param request: passed request from user.
+        """
+        user = getattr(request, 'user', None)
+        user_id = getattr(user, 'id', None)
+        if user_id is not None:
+            return user_id
+        return getattr(request, 'token', None)
+
+    def get_singleflight_key(self, request):
+        """
+        Get key, which defines identical requests for the `singleflight`
+        attribute. By default it's the key of the cached response.
+
+        :param request: passed request from user.
+        """
+        return None
+
+    def get_version(self, request, *args, **kwargs):
+        """
+        Get version of the requested resource (e.g. time of the last update
+        or a row version), which is cheaper than processing of the request.
+        When it matches the `if_none_match` argument of the request, the
+        handler isn't invoked.
+
+        :param request: passed request from user.
+        """
+        return None
+
     def get_renderer(self, preferred_format, *args, **kwargs):
         """
         Get serialize class, which using to converting response to
@@ -101,3 +167,18 @@ class MethodBasedView(View, metaclass=MethodViewMeta):
             return renderer()
         else:
             return JSONRenderer()
+
+    def get_response_layout(self, request):
+        """
+        Get layout for serialized lists of objects, which can be passed to
+        the serializer as the `layout` argument.
+
+        :param request: passed request from user.
+        """
+        layout = request.get_argument('layout') or self.response_layout
+        if layout is not None and layout not in RESPONSE_LAYOUTS:
+            raise IncorrectArgument(
+                "Argument `layout` must be one of the following values: "
+                "{0}.".format(', '.join(RESPONSE_LAYOUTS))
+            )
+        return layout
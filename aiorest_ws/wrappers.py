@@ -8,6 +8,15 @@ __all__ = ('Request', 'Response', )
 
 
 class Request(object):
+    # Attributes, which are set for every request, are stored in slots.
+    # Additional arguments of the request and attributes, added by
+    # middlewares (e.g. the user), are kept in the dictionary, which is
+    # created only when they are set
+    __slots__ = (
+        '_method', '_url', '_args', '_data', '_event_name', '_deadline',
+        '_cancel', '_if_none_match', '_subscribe', '_unsubscribe',
+        '_cancelled', 'connection', 'is_binary', '__dict__',
+    )
 
     def __init__(self, *args, **kwargs):
         super(Request, self).__init__()
@@ -16,6 +25,18 @@ class Request(object):
         self._args = kwargs.pop('args', {})
         self._data = kwargs.pop('data', None)
         self._event_name = kwargs.pop('event_name', None)
+        self._deadline = kwargs.pop('deadline', None)
+        self._cancel = kwargs.pop('cancel', None)
+        self._if_none_match = kwargs.pop('if_none_match', None)
+        self._subscribe = kwargs.pop('subscribe', False)
+        self._unsubscribe = kwargs.pop('unsubscribe', None)
+        self._cancelled = False
+        # Connection, which has received the request, and format of the
+        # message are set by the protocol, not by the client
+        kwargs.pop('connection', None)
+        kwargs.pop('is_binary', None)
+        self.connection = None
+        self.is_binary = False
 
         for key in kwargs.keys():
             add_property(self, key, kwargs[key])
@@ -55,6 +76,55 @@ class Request(object):
         """
         return self._event_name
 
+    @property
+    def deadline(self):
+        """
+        Get amount of seconds, during which the client waits for response.
+        """
+        return self._deadline
+
+    @property
+    def cancel(self):
+        """
+        Get event name of the request, which should be cancelled.
+        """
+        return self._cancel
+
+    @property
+    def if_none_match(self):
+        """
+        Get version of the response, which the client already has.
+        """
+        return self._if_none_match
+
+    @property
+    def subscribe(self):
+        """
+        Check that the client wants to receive updates of the resource.
+        """
+        return self._subscribe
+
+    @property
+    def unsubscribe(self):
+        """
+        Get event name of the subscriptions, which should be cancelled.
+        """
+        return self._unsubscribe
+
+    @property
+    def is_cancelled(self):
+        """
+        Check that response for the request isn't expected anymore. Handlers,
+        executed in the thread pool, should check it to stop the work.
+        """
+        return self._cancelled
+
+    def set_cancelled(self):
+        """
+        Mark the request as cancelled.
+        """
+        self._cancelled = True
+
     def to_representation(self):
         """
         Serialize request object to dictionary object.
@@ -71,6 +141,7 @@ class Request(object):
 
 
 class Response(object):
+    __slots__ = ('_content', )
 
     def __init__(self):
         super(Response, self).__init__()
@@ -90,11 +161,47 @@ class Response(object):
         """
         self._content['data'] = value
 
+    @property
+    def version(self):
+        """
+        Get version of the response content or None.
+        """
+        return self._content.get('version')
+
+    @version.setter
+    def version(self, value):
+        """
+        Set version of the response content, which the client can pass
+        in the `if_none_match` argument of the next request.
+        """
+        self._content['version'] = value
+
+    def set_not_modified(self, version):
+        """
+        Replace content of response onto the notification, that the client
+        already has the actual version of the content.
+
+        :param version: version of the content.
+        """
+        self._content = {'not_modified': True, 'version': version}
+
+    def set_subscription(self, version):
+        """
+        Notify the client, that updates of the resource will be sent, and
+        from which version.
+
+        :param version: version of the resource.
+        """
+        self._content['subscription'] = {'version': version}
+
     def wrap_exception(self, exception):
         """
         Set content of response, when taken exception.
         """
         self._content = {'detail': exception.detail}
+        retry_after = getattr(exception, 'retry_after', None)
+        if retry_after is not None:
+            self._content['retry_after'] = retry_after
 
     def append_request(self, request):
         """
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the memory footprint of idle WebSocket connections.
+
+Starts the server in a child process, opens N local connections to it,
+sends one request per connection and reports resident memory (RSS) of the
+server per connection, right after the requests and after the switch of
+connections into the idle mode. Linux only, because RSS is taken from
+the /proc filesystem.
+
+Usage:
+    python benchmarks/connections.py -connections 5000 -compress 1
+
+Number of connections is limited by the maximal number of opened files
+(see `ulimit -n`) for both processes.
+"""
+import asyncio
+import ctypes
+import json
+import logging
+import multiprocessing
+import os
+import sys
+
+from autobahn.asyncio.websocket import WebSocketClientFactory, \
+    WebSocketClientProtocol
+from autobahn.websocket.compress import PerMessageDeflateOffer, \
+    PerMessageDeflateResponse, PerMessageDeflateResponseAccept
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiorest_ws.app import Application  # noqa
+from aiorest_ws.command_line import CommandLine  # noqa
+from aiorest_ws.log import logger  # noqa
+from aiorest_ws.routers import SimpleRouter  # noqa
+from aiorest_ws.utils.websocket import CompressionPolicy  # noqa
+from aiorest_ws.views import MethodBasedView  # noqa
+
+
+class Items(MethodBasedView):
+
+    def get(self, request, *args, **kwargs):
+        return [{'id': i, 'name': 'item-{0}'.format(i)} for i in range(50)]
+
+
+def get_rss():
+    """
+    Get resident memory of the current process in kilobytes.
+    """
+    # Freed memory is kept by the allocator for re-use, so return it back
+    # to OS for the honest measurement (available only with glibc)
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    raise RuntimeError("Can't read RSS of the process.")
+
+
+def run_server(port, compress, idle_mode_timeout, pipe):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    logger.setLevel(logging.ERROR)
+
+    router = SimpleRouter()
+    router.register('/items', Items, 'GET')
+    options = {'router': router, 'log_level': 'error'}
+    if compress:
+        options['compression_policy'] = CompressionPolicy(
+            client_no_context_takeover=True
+        )
+    if idle_mode_timeout:
+        options['idle_mode_timeout'] = idle_mode_timeout
+
+    app = Application()
+    url = app.generate_url('127.0.0.1', port)
+    factory = app.generate_factory(url, **options)
+    server = loop.run_until_complete(
+        loop.create_server(factory, '127.0.0.1', port, backlog=4096)
+    )
+
+    def report():
+        command = pipe.recv()
+        if command == 'stop':
+            loop.stop()
+            return
+        idle = sum(1 for protocol in factory.connections if protocol.is_idle)
+        pipe.send((get_rss(), len(factory.connections), idle))
+
+    loop.add_reader(pipe.fileno(), report)
+    pipe.send('ready')
+    loop.run_forever()
+    server.close()
+    loop.close()
+
+
+class BenchmarkClientProtocol(WebSocketClientProtocol):
+
+    def onOpen(self):
+        request = {'method': 'GET', 'url': '/items'}
+        self.sendMessage(json.dumps(request).encode('utf-8'))
+
+    def onMessage(self, payload, isBinary):
+        self.factory.responses.put_nowait(len(payload))
+
+
+def accept_response(response):
+    if isinstance(response, PerMessageDeflateResponse):
+        return PerMessageDeflateResponseAccept(response)
+
+
+def request_stats(pipe):
+    pipe.send('stats')
+    return pipe.recv()
+
+
+@asyncio.coroutine
+def open_connections(loop, port, count, compress):
+    factory = WebSocketClientFactory('ws://127.0.0.1:{0}'.format(port))
+    factory.protocol = BenchmarkClientProtocol
+    factory.responses = asyncio.Queue()
+    if compress:
+        factory.setProtocolOptions(
+            perMessageCompressionOffers=[PerMessageDeflateOffer(), ],
+            perMessageCompressionAccept=accept_response
+        )
+
+    connections = []
+    for _ in range(count):
+        transport, _ = yield from loop.create_connection(
+            factory, '127.0.0.1', port
+        )
+        connections.append(transport)
+    for _ in range(count):
+        yield from factory.responses.get()
+    return connections
+
+
+def main():
+    cmd = CommandLine()
+    cmd.define('-connections', default=1000, help='opened connections',
+               type=int)
+    cmd.define('-port', default=8765, help='listened port', type=int)
+    cmd.define('-compress', default=1, help='use permessage-deflate',
+               type=int)
+    cmd.define('-idle', default=1.0, help='idle mode timeout, 0 to disable',
+               type=float)
+    cmd.define('-max-rss', default=0,
+               help='fail when idle connection takes more KB of RSS',
+               type=float)
+    args = cmd.parse_command_line()
+
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=run_server,
+        args=(args.port, args.compress, args.idle, child_pipe)
+    )
+    server.start()
+    assert parent_pipe.recv() == 'ready'
+
+    loop = asyncio.get_event_loop()
+    base_rss, _, _ = request_stats(parent_pipe)
+    connections = loop.run_until_complete(
+        open_connections(loop, args.port, args.connections, args.compress)
+    )
+    active_rss, opened, _ = request_stats(parent_pipe)
+    idle_rss, idle = active_rss, 0
+    if args.idle:
+        loop.run_until_complete(asyncio.sleep(args.idle * 2 + 0.5))
+        idle_rss, _, idle = request_stats(parent_pipe)
+
+    for transport in connections:
+        transport.close()
+    parent_pipe.send('stop')
+    server.join()
+
+    active = float(active_rss - base_rss) / opened
+    print("Connections: {0} (idle: {1})".format(opened, idle))
+    print("Base RSS: {0} KB".format(base_rss))
+    print("RSS per active connection: {0:.2f} KB".format(active))
+    if args.idle:
+        per_idle = float(idle_rss - base_rss) / opened
+        print("RSS per idle connection: {0:.2f} KB".format(per_idle))
+    else:
+        per_idle = active
+
+    if args.max_rss and per_idle > args.max_rss:
+        print("FAILED: more than {0} KB per connection".format(args.max_rss))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the server throughput and latency with different event loops
+and socket options.
+
+For every configuration starts the server in a child process, opens N
+local connections to it and sends the mix of requests (small object, list
+of objects and echo of the sent data) over every connection, waiting for
+the response before the next request. Reports requests per second and
+percentiles of the response latency.
+
+Usage:
+    python benchmarks/loops.py -loops asyncio,uvloop -connections 50
+
+Configurations with uvloop are skipped, when it isn't installed.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+from autobahn.asyncio.websocket import WebSocketClientFactory, \
+    WebSocketClientProtocol
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiorest_ws import app as app_module  # noqa
+from aiorest_ws.app import Application  # noqa
+from aiorest_ws.command_line import CommandLine  # noqa
+from aiorest_ws.log import logger  # noqa
+from aiorest_ws.routers import SimpleRouter  # noqa
+from aiorest_ws.views import MethodBasedView  # noqa
+
+
+class Status(MethodBasedView):
+
+    def get(self, request, *args, **kwargs):
+        return {'status': 'ok'}
+
+
+class Items(MethodBasedView):
+
+    def get(self, request, *args, **kwargs):
+        return [{'id': i, 'name': 'item-{0}'.format(i)} for i in range(50)]
+
+
+class Echo(MethodBasedView):
+
+    def post(self, request, *args, **kwargs):
+        return request.data
+
+
+MESSAGES = (
+    {'method': 'GET', 'url': '/status'},
+    {'method': 'GET', 'url': '/items'},
+    {'method': 'POST', 'url': '/echo', 'data': {'text': 'x' * 256}},
+)
+
+
+def run_server(port, loop_name, tcp_nodelay, pipe):
+    logger.setLevel(logging.ERROR)
+    router = SimpleRouter()
+    router.register('/status', Status, 'GET')
+    router.register('/items', Items, 'GET')
+    router.register('/echo', Echo, 'POST')
+
+    app = Application()
+    loop = app.get_event_loop(loop_name)
+    url = app.generate_url('127.0.0.1', port)
+    factory = app.generate_factory(
+        url, router=router, log_level='error', tcp_nodelay=tcp_nodelay
+    )
+    server = loop.run_until_complete(loop.create_server(
+        factory, '127.0.0.1', port, backlog=1024, reuse_address=True
+    ))
+
+    def stop():
+        pipe.recv()
+        loop.stop()
+
+    loop.add_reader(pipe.fileno(), stop)
+    pipe.send(type(loop).__module__)
+    loop.run_forever()
+    server.close()
+    loop.close()
+
+
+class BenchmarkClientProtocol(WebSocketClientProtocol):
+
+    def onOpen(self):
+        self.waiter = None
+        self.factory.opened.put_nowait(self)
+
+    def onMessage(self, payload, isBinary):
+        self.waiter.set_result(payload)
+
+    @asyncio.coroutine
+    def request(self, message):
+        self.waiter = asyncio.Future(loop=self.factory.loop)
+        self.sendMessage(message)
+        return (yield from self.waiter)
+
+
+@asyncio.coroutine
+def run_client(protocol, messages, requests, latencies):
+    for index in range(requests):
+        started = time.perf_counter()
+        yield from protocol.request(messages[index % len(messages)])
+        latencies.append(time.perf_counter() - started)
+
+
+@asyncio.coroutine
+def run_clients(loop, port, connections, requests):
+    factory = WebSocketClientFactory(
+        'ws://127.0.0.1:{0}'.format(port), loop=loop
+    )
+    factory.protocol = BenchmarkClientProtocol
+    factory.opened = asyncio.Queue(loop=loop)
+
+    transports = []
+    protocols = []
+    for _ in range(connections):
+        transport, _ = yield from loop.create_connection(
+            factory, '127.0.0.1', port
+        )
+        transports.append(transport)
+        protocols.append((yield from factory.opened.get()))
+
+    messages = [json.dumps(message).encode('utf-8') for message in MESSAGES]
+    latencies = []
+    started = time.perf_counter()
+    yield from asyncio.gather(*[
+        run_client(protocol, messages, requests, latencies)
+        for protocol in protocols
+    ], loop=loop)
+    elapsed = time.perf_counter() - started
+
+    for transport in transports:
+        transport.close()
+    return elapsed, sorted(latencies)
+
+
+def percentile(values, percent):
+    index = min(int(len(values) * percent / 100.0), len(values) - 1)
+    return values[index]
+
+
+def benchmark(port, loop_name, tcp_nodelay, connections, requests):
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=run_server, args=(port, loop_name, tcp_nodelay, child_pipe)
+    )
+    server.start()
+    loop_module = parent_pipe.recv()
+
+    loop = asyncio.new_event_loop()
+    elapsed, latencies = loop.run_until_complete(
+        run_clients(loop, port, connections, requests)
+    )
+    loop.close()
+    parent_pipe.send('stop')
+    server.join()
+
+    print("{0:<8} {1:<8} {2:>10.0f} {3:>9.3f} {4:>9.3f} {5:>9.3f}".format(
+        loop_module.split('.')[0], str(tcp_nodelay),
+        len(latencies) / elapsed,
+        percentile(latencies, 50) * 1000,
+        percentile(latencies, 99) * 1000,
+        latencies[-1] * 1000
+    ))
+
+
+def main():
+    cmd = CommandLine()
+    cmd.define('-loops', default='asyncio,uvloop',
+               help='comma-separated event loops', type=str)
+    cmd.define('-nodelay', default='default,1,0',
+               help='comma-separated TCP_NODELAY values', type=str)
+    cmd.define('-connections', default=50, help='opened connections',
+               type=int)
+    cmd.define('-requests', default=200, help='requests per connection',
+               type=int)
+    cmd.define('-port', default=8766, help='listened port', type=int)
+    args = cmd.parse_command_line()
+
+    print("{0:<8} {1:<8} {2:>10} {3:>9} {4:>9} {5:>9}".format(
+        'loop', 'nodelay', 'req/s', 'p50, ms', 'p99, ms', 'max, ms'
+    ))
+    nodelay_values = {'default': None, '1': True, '0': False}
+    for loop_name in args.loops.split(','):
+        if loop_name == 'uvloop' and app_module.uvloop is None:
+            print("uvloop isn't installed, skipped.")
+            continue
+        for nodelay in args.nodelay.split(','):
+            benchmark(
+                args.port, loop_name, nodelay_values[nodelay],
+                args.connections, args.requests
+            )
+
+
+if __name__ == '__main__':
+    main()
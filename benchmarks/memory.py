@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the memory, used by the per-row and per-request objects and
+by the serialized data.
+
+Every helper object with `__slots__` is compared with the dict-backed
+object, which has the same attributes (the layout of these classes before
+slots). Then N rows are serialized by the list serializer with the default
+output (OrderedDict and ReturnList) and with the `plain_data` option.
+Memory is measured by tracemalloc.
+
+Usage:
+    python benchmarks/memory.py -rows 100000
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiorest_ws.command_line import CommandLine  # noqa
+from aiorest_ws.db.orm import fields  # noqa
+from aiorest_ws.db.orm.relations import PKOnlyObject  # noqa
+from aiorest_ws.db.orm.serializers import ListSerializer, Serializer  # noqa
+from aiorest_ws.urls.utils import RouteMatch  # noqa
+from aiorest_ws.utils.serializer_helpers import BoundField  # noqa
+from aiorest_ws.wrappers import Request, Response  # noqa
+
+
+class User(object):
+
+    def __init__(self, pk):
+        self.id = pk
+        self.username = 'user-{0}'.format(pk)
+        self.email = 'user-{0}@example.com'.format(pk)
+        self.rating = pk / 10.0
+        self.is_active = pk % 2 == 0
+
+
+class UserSerializer(Serializer):
+    id = fields.IntegerField()
+    username = fields.CharField()
+    email = fields.CharField()
+    rating = fields.FloatField()
+    is_active = fields.BooleanField()
+
+
+class PlainUserSerializer(UserSerializer):
+
+    class Meta:
+        plain_data = True
+
+
+class DictBacked(object):
+    pass
+
+
+def get_slots(instance):
+    """
+    Returns names and values of the slots, set for the object.
+    """
+    for cls in reversed(type(instance).__mro__):
+        for name in cls.__dict__.get('__slots__', ()):
+            if name == '__dict__':
+                continue
+            try:
+                yield name, object.__getattribute__(instance, name)
+            except AttributeError:
+                pass
+
+
+def copy_slotted(instance):
+    clone = object.__new__(type(instance))
+    for name, value in get_slots(instance):
+        object.__setattr__(clone, name, value)
+    return clone
+
+
+def copy_dict_backed(instance):
+    clone = DictBacked()
+    for name, value in get_slots(instance):
+        setattr(clone, name, value)
+    return clone
+
+
+def measure(factory, count):
+    """
+    Returns amount of bytes, allocated by the factory and still used by
+    the created objects, and the peak of the allocated memory.
+
+    :param factory: function, which takes the index and returns the object.
+    :param count: amount of created objects.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(index) for index in range(count)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current, peak
+
+
+def report(name, count, baseline, optimized):
+    print("{0:<14} {1:>12.1f} {2:>12.1f} {3:>9.1f}%".format(
+        name, baseline / count, optimized / count,
+        100.0 * (baseline - optimized) / baseline
+    ))
+
+
+def benchmark_helpers(count):
+    field = UserSerializer().fields['id']
+    helpers = (
+        ('PKOnlyObject', lambda index: PKOnlyObject(index)),
+        ('BoundField', lambda index: BoundField(field, index, None)),
+        ('RouteMatch', lambda index: RouteMatch('view', (index, ), {})),
+        ('Request', lambda index: Request(
+            method='GET', url='/users/', args={}, event_name='users'
+        )),
+        ('Response', lambda index: Response()),
+    )
+    print("{0:<14} {1:>12} {2:>12} {3:>10}".format(
+        'object', 'dict, B', 'slots, B', 'saved'
+    ))
+    for name, factory in helpers:
+        # Objects are copied with the same values, so that only the memory
+        # of the objects themselves is compared
+        instances = [factory(index) for index in range(count)]
+        baseline, _ = measure(
+            lambda index: copy_dict_backed(instances[index]), count
+        )
+        optimized, _ = measure(
+            lambda index: copy_slotted(instances[index]), count
+        )
+        report(name, count, baseline, optimized)
+
+
+def benchmark_data(count):
+    rows = [User(pk) for pk in range(count)]
+    print("{0:<14} {1:>12} {2:>12} {3:>10}".format(
+        'data', 'retained, MB', 'peak, MB', 'saved'
+    ))
+    results = []
+    for name, child_class in (('default', UserSerializer),
+                              ('plain', PlainUserSerializer)):
+        gc.collect()
+        tracemalloc.start()
+        data = ListSerializer(rows, child=child_class()).data
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del data
+        results.append(current)
+        print("{0:<14} {1:>12.1f} {2:>12.1f} {3:>9.1f}%".format(
+            name, current / 2.0 ** 20, peak / 2.0 ** 20,
+            100.0 * (results[0] - current) / results[0]
+        ))
+
+
+def main():
+    cmd = CommandLine()
+    cmd.define('-rows', default=100000, help='created objects and rows',
+               type=int)
+    args = cmd.parse_command_line()
+
+    benchmark_helpers(args.rows)
+    print()
+    benchmark_data(args.rows)
+
+
+if __name__ == '__main__':
+    main()
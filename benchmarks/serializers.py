@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the optimized serialization paths against the generic one.
+
+Serializes the list of plain objects with the same serializer class:
+row by row with and without `compile_representation`, and by the list
+serializer with and without `bulk_representation` (column-wise extraction)
+for every layout. `.data` of the list serializer is measured with the
+default ReturnList/OrderedDict output and with the `plain_data` option.
+Reports rows per second for every implementation.
+
+Usage:
+    python benchmarks/serializers.py -rows 10000 -repeat 5
+"""
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiorest_ws.command_line import CommandLine  # noqa
+from aiorest_ws.db.orm import fields  # noqa
+from aiorest_ws.db.orm.serializers import ListSerializer, Serializer  # noqa
+from aiorest_ws.utils.formatting import RESPONSE_LAYOUTS  # noqa
+
+
+class User(object):
+
+    def __init__(self, pk):
+        self.id = pk
+        self.username = 'user-{0}'.format(pk)
+        self.email = 'user-{0}@example.com'.format(pk)
+        self.first_name = 'First'
+        self.last_name = 'Last'
+        self.rating = pk / 10.0
+        self.is_active = pk % 2 == 0
+        self.role = 'admin' if pk % 10 == 0 else 'user'
+        self.created = datetime.datetime(2016, 1, 1, 12, 0, 0)
+        self.comment = None
+
+    def get_full_name(self):
+        return '{0} {1}'.format(self.first_name, self.last_name)
+
+
+class UserSerializer(Serializer):
+    id = fields.IntegerField()
+    username = fields.CharField()
+    email = fields.CharField()
+    first_name = fields.CharField()
+    last_name = fields.CharField()
+    full_name = fields.ReadOnlyField(source='get_full_name')
+    rating = fields.FloatField()
+    is_active = fields.BooleanField()
+    role = fields.ChoiceField(choices=['admin', 'user'])
+    created = fields.DateTimeField()
+    comment = fields.CharField(read_only=True)
+
+
+class CompiledUserSerializer(UserSerializer):
+    compile_representation = True
+
+
+class PlainUserSerializer(UserSerializer):
+
+    class Meta:
+        plain_data = True
+
+
+class RowListSerializer(ListSerializer):
+    bulk_representation = False
+
+
+def benchmark(serializer_class, rows, repeat):
+    serializer = serializer_class()
+    to_representation = serializer.to_representation
+
+    def run():
+        for row in rows:
+            to_representation(row)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def benchmark_list(list_serializer_class, layout, rows, repeat):
+    serializer = list_serializer_class(child=UserSerializer(), layout=layout)
+
+    def run():
+        serializer.to_representation(rows)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def benchmark_data(serializer_class, rows, repeat):
+
+    def run():
+        ListSerializer(rows, child=serializer_class()).data
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def report(name, rows, elapsed, baseline):
+    print("{0:<18} {1:>12.0f} {2:>10.2f}".format(
+        name, rows / elapsed, baseline / elapsed
+    ))
+
+
+def main():
+    cmd = CommandLine()
+    cmd.define('-rows', default=10000, help='serialized objects', type=int)
+    cmd.define('-repeat', default=5, help='repeats of the measurement',
+               type=int)
+    args = cmd.parse_command_line()
+
+    rows = [User(pk) for pk in range(args.rows)]
+    assert UserSerializer().to_representation(rows[1]) == \
+        CompiledUserSerializer().to_representation(rows[1])
+
+    generic = benchmark(UserSerializer, rows, args.repeat)
+    compiled = benchmark(CompiledUserSerializer, rows, args.repeat)
+    print("{0:<18} {1:>12} {2:>10}".format('path', 'rows/s', 'speedup'))
+    report('generic', args.rows, generic, generic)
+    report('compiled', args.rows, compiled, generic)
+
+    for layout in RESPONSE_LAYOUTS:
+        row_by_row = benchmark_list(
+            RowListSerializer, layout, rows, args.repeat
+        )
+        bulk = benchmark_list(ListSerializer, layout, rows, args.repeat)
+        report('{0} (rows)'.format(layout), args.rows, row_by_row, generic)
+        report('{0} (bulk)'.format(layout), args.rows, bulk, generic)
+
+    data = benchmark_data(UserSerializer, rows, args.repeat)
+    plain_data = benchmark_data(PlainUserSerializer, rows, args.repeat)
+    report('data', args.rows, data, generic)
+    report('data (plain)', args.rows, plain_data, generic)
+
+
+if __name__ == '__main__':
+    main()
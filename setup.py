@@ -45,6 +45,7 @@ args = dict(
     zip_safe=False,
     platforms='any',
     install_requires=requirements,
+    extras_require={'uvloop': ['uvloop', ]},
     tests_require=test_requirements,
     classifiers=[
         'License :: OSI Approved :: BSD License',
@@ -567,6 +567,70 @@ class TestModelSerializer(SQLAlchemyUnitTest):
             "NestedSerializer"
         )
 
+    def test_model_introspected_once_per_class(self):
+        calls = []
+
+        class UserSerializer(ModelSerializer):
+
+            class Meta:
+                model = self.TestModelSerializerUserModel
+                fields = ('id', 'name')
+
+            def get_field_info(self, model):
+                calls.append(model)
+                return super(UserSerializer, self).get_field_info(model)
+
+        first, second = UserSerializer(), UserSerializer()
+        self.assertEqual(list(first.fields.keys()), ['id', 'name'])
+        self.assertIsNot(first.fields['name'], second.fields['name'])
+        self.assertIs(first.fields['name'].parent, first)
+        self.assertEqual(calls, [self.TestModelSerializerUserModel, ])
+
+        UserSerializer.clear_field_plans()
+        UserSerializer().fields
+        self.assertEqual(len(calls), 2)
+
+    def test_warm_up(self):
+
+        class BaseUserSerializer(ModelSerializer):
+            pass
+
+        class UserSerializer(BaseUserSerializer):
+
+            class Meta:
+                model = self.TestModelSerializerUserModel
+                exclude = ('addresses', )
+
+        self.assertEqual(BaseUserSerializer.warm_up(), [UserSerializer, ])
+        key = (UserSerializer, self.TestModelSerializerUserModel)
+        self.assertIn(key, ModelSerializer._model_field_plans)
+        BaseUserSerializer.clear_field_plans()
+        self.assertNotIn(key, ModelSerializer._model_field_plans)
+
+    def test_nested_serializer_class_is_cached(self):
+
+        class UserSerializer(ModelSerializer):
+
+            class Meta:
+                model = self.TestModelSerializerUserModel
+                depth = 1
+
+        instance = UserSerializer()
+        nested_class = type(instance.fields['addresses'])
+        relation_info = instance.get_field_info(
+            self.TestModelSerializerUserModel
+        ).relations['addresses']
+        self.assertIs(
+            instance.build_nested_field('addresses', relation_info, 1)[0],
+            nested_class
+        )
+        self.assertIn(nested_class, UserSerializer.warm_up())
+
+        UserSerializer.clear_field_plans()
+        self.assertIsNot(
+            type(UserSerializer().fields['addresses']), nested_class
+        )
+
     def test_build_property_field(self):
 
         class UserSerializer(ModelSerializer):
@@ -109,3 +109,67 @@ class TestUniqueORMValidator(SQLAlchemyUnitTest):
 
         with self.assertRaises(ValidationError):
             self.assertIsNone(validator('Eve'))
+
+    @override_settings(SQLALCHEMY_SESSION=SESSION)
+    def test_get_existing_values(self):
+        validator = UniqueORMValidator(
+            self.TableWithUniqueName, 'name'
+        )
+        self.assertEqual(
+            validator.get_existing_values(['Adam', 'John', 'Eve']),
+            {'Adam', 'Eve'}
+        )
+
+    @override_settings(SQLALCHEMY_SESSION=SESSION)
+    def test_get_existing_values_excludes_current_instance(self):
+        validator = UniqueORMValidator(
+            self.TableWithUniqueName, 'name'
+        )
+        validator.instance = self.session.query(validator.model)\
+            .filter(self.TableWithUniqueName.name == 'Adam')\
+            .first()
+        self.assertEqual(
+            validator.get_existing_values(['Adam', 'Bob']), {'Bob'}
+        )
+
+    @override_settings(SQLALCHEMY_SESSION=SESSION)
+    def test_validate_batch(self):
+        validator = UniqueORMValidator(
+            self.TableWithUniqueName, 'name'
+        )
+        values = [(0, 'John'), (1, 'Bob'), (2, 'Jane'), (3, 'John')]
+        self.assertEqual(
+            validator.validate_batch(values),
+            {1: [validator.message], 3: [validator.message]}
+        )
+
+
+class TestUniqueORMValidatorWithCollation(SQLAlchemyUnitTest):
+
+    class TableWithUniqueCode(Base):
+        __tablename__ = 'test_unique_nocase_field'
+        id = Column(Integer, primary_key=True)
+        code = Column(String(50, collation='NOCASE'), unique=True)
+
+    tables = [TableWithUniqueCode.__table__, ]
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestUniqueORMValidatorWithCollation, cls).setUpClass()
+        cls.session = SESSION()
+        cls.session.add_all([
+            cls.TableWithUniqueCode(code='ABC'),
+            cls.TableWithUniqueCode(code='xyz'),
+        ])
+        cls.session.commit()
+
+    @override_settings(SQLALCHEMY_SESSION=SESSION)
+    def test_validate_batch(self):
+        validator = UniqueORMValidator(
+            self.TableWithUniqueCode, 'code'
+        )
+        values = [(0, 'abc'), (1, 'def'), (2, 'xyz')]
+        self.assertEqual(
+            validator.validate_batch(values),
+            {0: [validator.message], 2: [validator.message]}
+        )
@@ -3,7 +3,7 @@ import copy
 import unittest
 
 from aiorest_ws.db.orm.abstract import AbstractSerializer, AbstractField, \
-    empty, SkipField
+    FieldPlan, empty, SkipField
 from aiorest_ws.db.orm.exceptions import ValidationError
 
 
@@ -75,6 +75,60 @@ class TestAbstractSerializer(unittest.TestCase):
         self.assertNotEqual(instance, instance_copy)
         self.assertEqual(instance.validators, instance_copy.validators)
 
+    def test_get_factory(self):
+        instance = AbstractSerializer(
+            label='test_value', validators=[FakeValidator, ]
+        )
+        instance.bind('field', None)
+        instance_copy = instance.get_factory()()
+        self.assertIsInstance(instance_copy, AbstractSerializer)
+        self.assertIsNot(instance, instance_copy)
+        self.assertIsNone(instance_copy.field_name)
+        self.assertEqual(instance_copy.label, 'test_value')
+        self.assertEqual(instance.validators, instance_copy.validators)
+
+    def test_get_factory_copies_mutable_arguments(self):
+        child = AbstractSerializer()
+        instance = AbstractSerializer(
+            [1, 2], default={'key': [1]}, initial={'key': 1}, source=child
+        )
+        factory = instance.get_factory()
+        first, second = factory(), factory()
+        self.assertEqual(first._args, ([1, 2], ))
+        self.assertIsNot(first._args[0], instance._args[0])
+        self.assertIsNot(first._args[0], second._args[0])
+        self.assertEqual(first.default, {'key': [1]})
+        self.assertIsNot(first.default['key'], instance.default['key'])
+        self.assertEqual(first.initial, {'key': 1})
+        self.assertIsNot(first.initial, second.initial)
+        self.assertIsInstance(first.source, AbstractSerializer)
+        self.assertIsNot(first.source, child)
+        self.assertIsNot(first.source, second.source)
+
+    def test_get_factory_with_overridden_deepcopy(self):
+
+        class ShallowField(AbstractSerializer):
+
+            def __deepcopy__(self, memo):
+                return copy.copy(self)
+
+        instance = ShallowField(label='test_value')
+        instance.extra = 'value'
+        self.assertEqual(instance.get_factory()().extra, 'value')
+
+    def test_get_default_error_messages(self):
+
+        class FakeSerializer(AbstractSerializer):
+            default_error_messages = {'invalid': 'Invalid value.'}
+
+        messages = FakeSerializer.get_default_error_messages()
+        self.assertEqual(messages['invalid'], 'Invalid value.')
+        self.assertIn('required', messages)
+        self.assertIs(FakeSerializer.get_default_error_messages(), messages)
+        self.assertNotIn(
+            'invalid', AbstractSerializer.get_default_error_messages()
+        )
+
     def test_bind(self):
         instance = AbstractSerializer(label='test_value')
         instance.bind('field', None)
@@ -264,6 +318,24 @@ class TestAbstractSerializer(unittest.TestCase):
             instance.raise_error('unknown')
 
 
+class TestFieldPlan(unittest.TestCase):
+
+    def test_build(self):
+        field = AbstractField(label='test_value')
+        plan = FieldPlan({'field': field})
+        self.assertEqual(len(plan), 1)
+        first, second = plan.build(), plan.build()
+        self.assertEqual(list(first.keys()), ['field', ])
+        self.assertIsNot(first['field'], field)
+        self.assertIsNot(first['field'], second['field'])
+        self.assertEqual(first['field'].label, 'test_value')
+
+    def test_prototypes_are_read_only(self):
+        plan = FieldPlan({'field': AbstractField()})
+        with self.assertRaises(TypeError):
+            plan.prototypes['other'] = AbstractField()
+
+
 class TestAbstractField(unittest.TestCase):
 
     def test_get_default(self):
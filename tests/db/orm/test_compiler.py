@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from aiorest_ws.db.orm import fields
+from aiorest_ws.db.orm.abstract import SkipField
+from aiorest_ws.db.orm.compiler import can_extract_columns, \
+    compile_to_representation, extract_column, get_field_shape
+from aiorest_ws.db.orm.serializers import Serializer
+
+
+class FakeUser(object):
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def get_full_name(self):
+        return '{0} {1}'.format(self.first_name, self.last_name)
+
+
+class UserSerializer(Serializer):
+    compile_representation = True
+    id = fields.IntegerField()
+    first_name = fields.CharField()
+    rating = fields.FloatField()
+    full_name = fields.ReadOnlyField(source='get_full_name')
+    nickname = fields.CharField(read_only=True)
+    role = fields.ChoiceField(choices=['admin', 'user'])
+    group = fields.CharField(source='group.name', read_only=True)
+    greeting = fields.SerializerMethodField()
+
+    def get_greeting(self, obj):
+        return 'Hello, {0}!'.format(type(obj).__name__)
+
+
+class FakeGroup(object):
+    name = 'staff'
+
+
+class TestCompileToRepresentation(unittest.TestCase):
+
+    def get_user(self, **kwargs):
+        data = {
+            'id': '1', 'first_name': 'John', 'last_name': 'Doe',
+            'rating': 4, 'nickname': 'jd', 'role': 'admin',
+            'group': FakeGroup(),
+        }
+        data.update(kwargs)
+        return FakeUser(**data)
+
+    def assertSameRepresentation(self, instance):
+        serializer = UserSerializer()
+        self.assertEqual(
+            serializer.to_representation(instance),
+            serializer._to_representation(instance)
+        )
+        return serializer.to_representation(instance)
+
+    def test_to_representation(self):
+        data = self.assertSameRepresentation(self.get_user())
+        self.assertEqual(data, {
+            'id': 1, 'first_name': 'John', 'rating': 4.0,
+            'full_name': 'John Doe', 'nickname': 'jd', 'role': 'admin',
+            'group': 'staff', 'greeting': 'Hello, FakeUser!'
+        })
+        self.assertEqual(list(data.keys()), [
+            'id', 'first_name', 'rating', 'full_name', 'nickname', 'role',
+            'group', 'greeting'
+        ])
+        self.assertIsInstance(data['id'], int)
+
+    def test_to_representation_with_none_values(self):
+        data = self.assertSameRepresentation(
+            self.get_user(first_name=None, rating=None, group=None)
+        )
+        self.assertIsNone(data['first_name'])
+        self.assertIsNone(data['rating'])
+        self.assertIsNone(data['group'])
+
+    def test_to_representation_skips_missing_read_only_field(self):
+        user = self.get_user()
+        del user.nickname
+        data = self.assertSameRepresentation(user)
+        self.assertNotIn('nickname', data)
+
+    def test_to_representation_raises_error_for_missing_field(self):
+        user = self.get_user()
+        del user.rating
+        with self.assertRaises(AttributeError) as context:
+            UserSerializer().to_representation(user)
+        self.assertIn('`rating`', str(context.exception))
+        self.assertIn('UserSerializer', str(context.exception))
+
+    def test_to_representation_of_mapping(self):
+        data = {
+            'id': 1, 'first_name': 'John', 'rating': 1.0,
+            'get_full_name': 'John Doe', 'role': 'user',
+            'group': {'name': 'staff'}
+        }
+        self.assertEqual(
+            self.assertSameRepresentation(data)['group'], 'staff'
+        )
+
+    def test_to_representation_of_none(self):
+        self.assertSameRepresentation(None)
+
+    def test_generated_code_is_shared(self):
+        first, second = UserSerializer(), UserSerializer()
+        first.to_representation(self.get_user())
+        second.to_representation(self.get_user())
+        self.assertIsNot(
+            first._compiled_to_representation,
+            second._compiled_to_representation
+        )
+        self.assertIs(
+            first._compiled_to_representation.__code__,
+            second._compiled_to_representation.__code__
+        )
+
+    def test_get_field_shape(self):
+        fields_map = UserSerializer().fields
+        self.assertEqual(get_field_shape(fields_map['id']),
+                         (True, False, 'int({0})'))
+        self.assertEqual(get_field_shape(fields_map['nickname']),
+                         (True, True, 'str({0})'))
+        self.assertEqual(get_field_shape(fields_map['role']),
+                         (True, False, None))
+        self.assertEqual(get_field_shape(fields_map['group']),
+                         (False, False, 'str({0})'))
+        self.assertEqual(get_field_shape(fields_map['greeting']),
+                         (False, False, None))
+
+    def test_to_representation_with_plain_data(self):
+
+        class PlainUserSerializer(UserSerializer):
+
+            class Meta:
+                plain_data = True
+
+        serializer = PlainUserSerializer()
+        data = serializer.to_representation(self.get_user())
+        self.assertIs(type(data), dict)
+        self.assertEqual(data, serializer._to_representation(self.get_user()))
+        self.assertIs(
+            type(serializer._to_representation(self.get_user())), dict
+        )
+
+    def test_compile_without_fields(self):
+        to_representation = compile_to_representation([], None)
+        self.assertEqual(to_representation(object()), {})
+
+
+class TestExtractColumn(unittest.TestCase):
+
+    def setUp(self):
+        self.fields = UserSerializer().fields
+        self.rows = [
+            FakeUser(id=1, first_name='John', last_name='Doe', rating=4,
+                     group=FakeGroup()),
+            FakeUser(id='2', first_name='Jane', last_name='Roe', rating=None,
+                     group=FakeGroup()),
+        ]
+
+    def test_can_extract_columns(self):
+        self.assertTrue(can_extract_columns(self.rows))
+        self.assertTrue(can_extract_columns([]))
+        self.assertFalse(can_extract_columns(self.rows + [None]))
+        self.assertFalse(can_extract_columns(self.rows + [{'id': 1}]))
+
+    def test_extract_column_converts_values(self):
+        self.assertEqual(extract_column(self.fields['id'], self.rows), [1, 2])
+        self.assertEqual(
+            extract_column(self.fields['rating'], self.rows), [4.0, None]
+        )
+
+    def test_extract_column_returns_values_of_target_type(self):
+        values = extract_column(self.fields['first_name'], self.rows)
+        self.assertEqual(values, ['John', 'Jane'])
+        self.assertIs(values[0], self.rows[0].first_name)
+
+    def test_extract_column_calls_methods(self):
+        self.assertEqual(
+            extract_column(self.fields['full_name'], self.rows),
+            ['John Doe', 'Jane Roe']
+        )
+
+    def test_extract_column_with_nested_source(self):
+        self.assertEqual(
+            extract_column(self.fields['group'], self.rows),
+            ['staff', 'staff']
+        )
+
+    def test_extract_column_with_field_method(self):
+        self.assertEqual(
+            extract_column(self.fields['greeting'], self.rows),
+            ['Hello, FakeUser!', 'Hello, FakeUser!']
+        )
+
+    def test_extract_column_with_skipped_values(self):
+        self.rows[1].nickname = 'jr'
+        self.assertEqual(
+            extract_column(self.fields['nickname'], self.rows, SkipField),
+            [SkipField, 'jr']
+        )
+
+    def test_extract_column_raises_error_for_missing_field(self):
+        del self.rows[1].first_name
+        with self.assertRaises(AttributeError):
+            extract_column(self.fields['first_name'], self.rows)
+
+    def test_extract_column_reads_every_attribute_once(self):
+        reads = []
+
+        class CountedUser(object):
+
+            def __init__(self, pk):
+                self.pk = pk
+
+            @property
+            def nickname(self):
+                reads.append(self.pk)
+                return 'user-{0}'.format(self.pk)
+
+        rows = [CountedUser(1), FakeUser(id=2), CountedUser(3)]
+        self.assertEqual(
+            extract_column(self.fields['nickname'], rows, SkipField),
+            ['user-1', SkipField, 'user-3']
+        )
+        self.assertEqual(reads, [1, 3])
@@ -45,6 +45,9 @@ class TestPKOnlyObject(unittest.TestCase):
         instance = PKOnlyObject(1)
         self.assertEqual(instance.pk, 1)
 
+    def test_has_no_dict(self):
+        self.assertFalse(hasattr(PKOnlyObject(1), '__dict__'))
+
 
 class TestRelatedField(unittest.TestCase):
 
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 import unittest
+from unittest import mock
 
 import copy
 from collections import OrderedDict
 
+from aiorest_ws.conf import settings
 from aiorest_ws.exceptions import ImproperlyConfigured
 from aiorest_ws.db.orm import fields
 from aiorest_ws.db.orm.abstract import empty, SkipField
@@ -15,6 +17,8 @@ from aiorest_ws.db.orm.validators import MinValueValidator, \
     BaseUniqueFieldValidator
 from aiorest_ws.utils.serializer_helpers import BoundField, NestedBoundField, \
     ReturnList, ReturnDict
+from aiorest_ws.utils.formatting import RESPONSE_LAYOUTS, TABLE_LAYOUT, \
+    COLUMNS_LAYOUT
 from aiorest_ws.utils.structures import FieldInfo, RelationInfo
 
 
@@ -336,6 +340,38 @@ class TestSerializer(unittest.TestCase):
         self.assertIn('pk', serialzier_fields.keys())
         self.assertIsInstance(serialzier_fields['pk'], fields.IntegerField)
 
+    def test_get_field_plan(self):
+
+        class FakeSerializer(Serializer):
+            pk = fields.IntegerField()
+
+        class FakeChildSerializer(FakeSerializer):
+            name = fields.CharField()
+
+        plan = FakeSerializer.get_field_plan()
+        self.assertIs(FakeSerializer.get_field_plan(), plan)
+        self.assertEqual(list(plan.prototypes.keys()), ['pk', ])
+        self.assertEqual(
+            list(FakeChildSerializer.get_field_plan().prototypes.keys()),
+            ['pk', 'name']
+        )
+
+        FakeSerializer._declared_fields['name'] = fields.CharField()
+        self.assertIsNot(FakeSerializer.get_field_plan(), plan)
+        self.assertIn('name', FakeSerializer().fields)
+
+    def test_fields_are_not_shared_between_instances(self):
+
+        class FakeSerializer(Serializer):
+            pk = fields.IntegerField()
+
+        first, second = FakeSerializer(), FakeSerializer()
+        self.assertIsNot(first.fields['pk'], second.fields['pk'])
+        self.assertIs(first.fields['pk'].parent, first)
+        del first.fields['pk']
+        self.assertIn('pk', second.fields)
+        self.assertIn('pk', FakeSerializer().fields)
+
     def test_get_validators(self):
 
         class UniqueTogetherValidator(BaseUniqueFieldValidator):
@@ -539,6 +575,30 @@ class TestSerializer(unittest.TestCase):
             {'pk': 1, 'string': 'test'}
         )
 
+    def test_get_columns(self):
+
+        class FakeSerializer(Serializer):
+            pk = fields.IntegerField(read_only=True)
+            password = fields.CharField(write_only=True)
+            string = fields.CharField()
+
+        instance = FakeSerializer()
+        self.assertEqual(instance.get_columns(), ['pk', 'string'])
+
+    def test_to_row(self):
+
+        class FakeSerializer(Serializer):
+            pk = fields.IntegerField(read_only=True)
+            value = fields.IntegerField(required=False)
+            nullable = fields.IntegerField(allow_null=True)
+            string = fields.CharField()
+
+        instance = FakeSerializer()
+        self.assertEqual(
+            instance.to_row({'pk': '1', 'nullable': None, 'string': 'test'}),
+            [1, None, None, 'test']
+        )
+
     def test_validate(self):
 
         class FakeSerializer(Serializer):
@@ -608,6 +668,32 @@ class TestSerializer(unittest.TestCase):
         self.assertIsInstance(instance.data, ReturnDict)
         self.assertEqual(instance.data, {'pk': 1})
 
+    def test_data_property_with_plain_data(self):
+
+        class FakeSerializer(Serializer):
+            pk = fields.IntegerField()
+
+            class Meta:
+                plain_data = True
+
+        instance = FakeSerializer({'pk': '1'})
+        self.assertIs(type(instance.data), dict)
+        self.assertIs(instance.data, instance.data)
+        self.assertEqual(instance.data, {'pk': 1})
+        self.assertEqual(instance['pk'].value, 1)
+
+    def test_plain_data_from_settings(self):
+
+        class FakeSerializer(Serializer):
+            pk = fields.IntegerField()
+
+        with mock.patch.dict(settings.REST_CONFIG, {'PLAIN_DATA': True}):
+            instance = FakeSerializer({'pk': 1})
+            self.assertTrue(instance.plain_data)
+            self.assertIs(type(instance.data), dict)
+        self.assertFalse(FakeSerializer().plain_data)
+        self.assertIs(FakeSerializer().dict_class, OrderedDict)
+
     def test_error_property(self):
 
         class FakeSerializer(Serializer):
@@ -881,6 +967,80 @@ class TestListSerializer(unittest.TestCase):
             [{'string': 'test'}, ]
         )
 
+    def get_unique_serializer(self, **kwargs):
+
+        class FakeUniqueValidator(BaseUniqueFieldValidator):
+            existing = {'taken'}
+
+            def __call__(self, value):
+                self.calls.append(value)
+                if value in self.existing:
+                    raise ValidationError(self.message)
+
+            def get_existing_values(self, values):
+                self.batches.append(values)
+                return self.existing.intersection(values)
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+            string = fields.CharField(
+                required=False, validators=[FakeUniqueValidator(None)]
+            )
+
+            def run_validation(self, data=empty):
+                value = self.to_internal_value(data)
+                self.run_validators(value)
+                return value
+
+        instance = FakeSerializer(many=True, **kwargs)
+        validator = instance.child.fields['string'].validators[0]
+        validator.calls = []
+        validator.batches = []
+        return instance, validator
+
+    def test_to_internal_value_with_batch_validators(self):
+        instance, validator = self.get_unique_serializer()
+        data = [
+            {'pk': 1, 'string': 'a'},
+            {'pk': 2, 'string': 'taken'},
+            {'pk': 3},
+            {'pk': 'invalid', 'string': 'b'},
+            {'pk': 5, 'string': 'a'},
+        ]
+        with self.assertRaises(ValidationError) as context:
+            instance.to_internal_value(data)
+
+        errors = context.exception.detail
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(errors[0], {})
+        self.assertEqual(errors[1], {'string': [validator.message]})
+        self.assertEqual(errors[2], {})
+        self.assertEqual(list(errors[3].keys()), ['pk'])
+        self.assertEqual(errors[4], {'string': [validator.message]})
+        self.assertEqual(validator.calls, [])
+        self.assertEqual(validator.batches, [['a', 'taken']])
+        self.assertIsNone(instance.deferred_validators)
+
+    def test_to_internal_value_without_batch_validation(self):
+        instance, validator = self.get_unique_serializer()
+        instance.batch_validation = False
+        data = [{'pk': 1, 'string': 'a'}, {'pk': 2, 'string': 'taken'}]
+        with self.assertRaises(ValidationError) as context:
+            instance.to_internal_value(data)
+
+        self.assertEqual(
+            context.exception.detail, [{}, {'string': [validator.message]}]
+        )
+        self.assertEqual(validator.calls, ['a', 'taken'])
+        self.assertEqual(validator.batches, [])
+
+    def test_child_validation_applies_batch_validators(self):
+        instance, validator = self.get_unique_serializer()
+        with self.assertRaises(ValidationError):
+            instance.child.run_validation({'pk': 1, 'string': 'taken'})
+        self.assertEqual(validator.calls, ['taken'])
+
     def test_to_representation_return_list_of_objects(self):
 
         class FakeModel(object):
@@ -1237,6 +1397,187 @@ class TestListSerializer(unittest.TestCase):
         self.assertIsInstance(instance.errors, ReturnList)
         self.assertEqual(instance.errors, errors)
 
+    def test_init_raises_assertion_error_for_invalid_layout(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+
+        with self.assertRaises(AssertionError):
+            FakeSerializer(many=True, layout='unknown')
+
+    def test_layout_from_meta(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+
+            class Meta:
+                list_layout = 'table'
+
+        instance = FakeSerializer(many=True)
+        self.assertEqual(instance.layout, 'table')
+
+    def test_to_table(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+            string = fields.CharField(required=False)
+
+        data = [{'pk': 1, 'string': 'a'}, {'pk': 2}]
+        instance = FakeSerializer(many=True)
+        self.assertEqual(
+            instance.to_table(data),
+            {'columns': ['pk', 'string'], 'rows': [[1, 'a'], [2, None]]}
+        )
+
+    def test_to_table_with_overridden_to_representation(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+
+            def to_representation(self, instance):
+                return {'pk': instance['pk'] * 10}
+
+        instance = FakeSerializer(many=True)
+        self.assertEqual(
+            instance.to_table([{'pk': 1}, {'pk': 2}]),
+            {'columns': ['pk'], 'rows': [[10], [20]]}
+        )
+
+    def test_to_columns(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+            string = fields.CharField()
+
+        data = [{'pk': 1, 'string': 'a'}, {'pk': 2, 'string': 'b'}]
+        instance = FakeSerializer(many=True)
+        self.assertEqual(
+            instance.to_columns(data),
+            {'pk': [1, 2], 'string': ['a', 'b']}
+        )
+
+    def test_to_columns_for_empty_list(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+
+        instance = FakeSerializer(many=True)
+        self.assertEqual(instance.to_columns([]), {'pk': []})
+
+    def test_data_property_with_table_layout(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+
+        instance = FakeSerializer([{'pk': 1}], many=True, layout='table')
+        self.assertIsInstance(instance.data, ReturnDict)
+        self.assertEqual(instance.data, {'columns': ['pk'], 'rows': [[1]]})
+
+    def test_data_property_with_plain_data(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+
+            class Meta:
+                plain_data = True
+
+        class FakeObject(object):
+            pk = '1'
+
+        for data in ([{'pk': 1}], [FakeObject()]):
+            instance = FakeSerializer(data, many=True)
+            self.assertIs(type(instance.data), list)
+            self.assertIs(type(instance.data[0]), dict)
+            self.assertEqual(instance.data, [{'pk': 1}])
+
+        for layout in (TABLE_LAYOUT, COLUMNS_LAYOUT):
+            instance = FakeSerializer([FakeObject()], many=True, layout=layout)
+            self.assertIs(type(instance.data), dict)
+
+    def test_data_property_with_columns_layout(self):
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+
+        instance = FakeSerializer([{'pk': 1}], many=True, layout='columns')
+        self.assertIsInstance(instance.data, ReturnDict)
+        self.assertEqual(instance.data, {'pk': [1]})
+
+    def get_bulk_serializer_class(self):
+
+        class FakeUser(object):
+
+            def __init__(self, pk, name=None):
+                self.pk = pk
+                if name is not None:
+                    self.name = name
+
+            def get_title(self):
+                return 'User #{0}'.format(self.pk)
+
+        class FakeSerializer(Serializer):
+            default_list_serializer = ListSerializer
+            pk = fields.IntegerField()
+            name = fields.CharField(read_only=True)
+            title = fields.ReadOnlyField(source='get_title')
+
+        return FakeUser, FakeSerializer
+
+    def test_bulk_representation_for_every_layout(self):
+        FakeUser, FakeSerializer = self.get_bulk_serializer_class()
+        data = [FakeUser('1', 'a'), FakeUser(2), FakeUser(3, 'c')]
+        for layout in RESPONSE_LAYOUTS:
+            instance = FakeSerializer(many=True, layout=layout)
+            self.assertIsNotNone(instance.extract_columns(data))
+            instance.bulk_representation = False
+            expected = instance.to_representation(data)
+            instance.bulk_representation = True
+            self.assertEqual(instance.to_representation(data), expected)
+
+    def test_bulk_representation_skips_missing_fields(self):
+        FakeUser, FakeSerializer = self.get_bulk_serializer_class()
+        instance = FakeSerializer(many=True)
+        self.assertEqual(
+            instance.to_representation([FakeUser(1, 'a'), FakeUser(2)]),
+            [{'pk': 1, 'name': 'a', 'title': 'User #1'},
+             {'pk': 2, 'title': 'User #2'}]
+        )
+
+    def test_extract_columns_for_mappings(self):
+        FakeUser, FakeSerializer = self.get_bulk_serializer_class()
+        instance = FakeSerializer(many=True)
+        self.assertIsNone(instance.extract_columns([{'pk': 1}]))
+        self.assertIsNone(instance.extract_columns([FakeUser(1), None]))
+
+    def test_extract_columns_without_bulk_representation(self):
+        FakeUser, FakeSerializer = self.get_bulk_serializer_class()
+        instance = FakeSerializer(many=True)
+        instance.bulk_representation = False
+        self.assertIsNone(instance.extract_columns([FakeUser(1)]))
+
+    def test_extract_columns_with_overridden_to_representation(self):
+        FakeUser, FakeSerializer = self.get_bulk_serializer_class()
+
+        class CustomSerializer(FakeSerializer):
+
+            def to_representation(self, instance):
+                return {'pk': instance.pk}
+
+        instance = CustomSerializer(many=True)
+        self.assertIsNone(instance.extract_columns([FakeUser(1)]))
+        self.assertEqual(
+            instance.to_representation([FakeUser(1)]), [{'pk': 1}]
+        )
+
 
 class TestModelSerialiazer(unittest.TestCase):
 
@@ -13,6 +13,34 @@ class FakeField(AbstractField):
     pass
 
 
+class FakeUniqueValidator(BaseUniqueFieldValidator):
+
+    def __init__(self, existing, *args, **kwargs):
+        super(FakeUniqueValidator, self).__init__(None, *args, **kwargs)
+        self.existing = existing
+        self.calls = []
+
+    def __call__(self, value):
+        self.calls.append(value)
+        if value in self.existing:
+            raise ValidationError(self.message)
+
+
+class CaseInsensitiveUniqueValidator(FakeUniqueValidator):
+
+    def __call__(self, value):
+        self.calls.append(value)
+        if value.lower() in {existing.lower() for existing in self.existing}:
+            raise ValidationError(self.message)
+
+    def get_existing_values(self, values):
+        values = {value.lower() for value in values}
+        return {
+            existing for existing in self.existing
+            if existing.lower() in values
+        }
+
+
 class TestBaseValidator(unittest.TestCase):
 
     @classmethod
@@ -168,3 +196,55 @@ class TestBaseUniqueFieldValidator(unittest.TestCase):
         self.assertEqual(
             instance.__repr__(), "<BaseUniqueFieldValidator(queryset=None)>"
         )
+
+    def test_get_existing_values(self):
+        instance = FakeUniqueValidator(['a', 'c'])
+        self.assertEqual(
+            instance.get_existing_values(['a', 'b', 'c']), {'a', 'c'}
+        )
+
+    def test_validate_batch(self):
+        instance = FakeUniqueValidator(['a'])
+        errors = instance.validate_batch([(0, 'a'), (2, 'b'), (5, 'c')])
+        self.assertEqual(errors, {0: [instance.message]})
+
+    def test_validate_batch_with_repeated_values(self):
+        instance = FakeUniqueValidator([])
+        errors = instance.validate_batch([(0, 'a'), (1, 'b'), (2, 'a')])
+        self.assertEqual(errors, {2: [instance.message]})
+        self.assertEqual(instance.calls, ['a', 'b'])
+
+    def test_validate_batch_with_unhashable_values(self):
+        instance = FakeUniqueValidator([])
+        instance.existing = [['a']]
+        errors = instance.validate_batch([(0, ['a']), (1, ['b'])])
+        self.assertEqual(errors, {0: [instance.message]})
+
+    def test_validate_batch_splits_values_by_batch_size(self):
+        instance = FakeUniqueValidator(['c'])
+        instance.batch_size = 2
+        batches = []
+        get_existing_values = instance.get_existing_values
+
+        def fake_get_existing_values(values):
+            batches.append(values)
+            return get_existing_values(values)
+
+        instance.get_existing_values = fake_get_existing_values
+        values = list(enumerate(['a', 'b', 'c', 'd', 'e']))
+        self.assertEqual(
+            instance.validate_batch(values), {2: [instance.message]}
+        )
+        self.assertEqual(batches, [['a', 'b'], ['c', 'd'], ['e']])
+
+    def test_validate_batch_with_database_comparison(self):
+        instance = CaseInsensitiveUniqueValidator(['A', 'c'])
+        instance.batch_size = 2
+        errors = instance.validate_batch(
+            list(enumerate(['a', 'b', 'c', 'd']))
+        )
+        self.assertEqual(
+            errors, {0: [instance.message], 2: [instance.message]}
+        )
+        # Only the chunk with the inexact match is checked one by one
+        self.assertEqual(instance.calls, ['a', 'b'])
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+import unittest
+
+from aiorest_ws.admission import PRIORITY_LOW, PRIORITY_NORMAL, \
+    PRIORITY_HIGH, LoopLagMonitor, AdmissionController
+from aiorest_ws.exceptions import Overloaded
+
+
+class LoopLagMonitorTestCase(unittest.TestCase):
+
+    def test_update(self):
+        monitor = LoopLagMonitor(decay=0.5)
+        monitor.update(0.2)
+        self.assertEqual(monitor.lag, 0.2)
+        monitor.update(0.0)
+        self.assertEqual(monitor.lag, 0.1)
+        monitor.update(0.3)
+        self.assertEqual(monitor.lag, 0.3)
+        self.assertEqual(monitor.max_lag, 0.3)
+
+    def test_start_and_stop(self):
+        loop = asyncio.new_event_loop()
+        monitor = LoopLagMonitor(interval=0.001, loop=loop)
+        self.assertFalse(monitor.is_running)
+        monitor.start()
+        self.assertTrue(monitor.is_running)
+        loop.run_until_complete(asyncio.sleep(0.01, loop=loop))
+        monitor.stop()
+        self.assertFalse(monitor.is_running)
+        loop.close()
+        self.assertGreaterEqual(monitor.lag, 0.0)
+
+    def test_measure_blocked_loop(self):
+        loop = asyncio.new_event_loop()
+        monitor = LoopLagMonitor(interval=0.001, loop=loop)
+        monitor.start()
+        # Blocking call delays the scheduled measurement
+        loop.call_soon(time.sleep, 0.02)
+        loop.run_until_complete(asyncio.sleep(0.03, loop=loop))
+        monitor.stop()
+        loop.close()
+        self.assertGreaterEqual(monitor.max_lag, 0.015)
+
+
+class AdmissionControllerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(AdmissionControllerTestCase, self).setUp()
+        self.monitor = LoopLagMonitor()
+        self.monitor._handle = object()
+        self.controller = AdmissionController(
+            max_lag=0.1, max_in_flight=2, retry_after=3,
+            monitor=self.monitor
+        )
+
+    def test_default_thresholds(self):
+        self.assertEqual(self.controller.thresholds[PRIORITY_LOW], 1.0)
+        self.assertEqual(self.controller.thresholds[PRIORITY_NORMAL], 2.0)
+        self.assertIsNone(self.controller.thresholds[PRIORITY_HIGH])
+
+    def test_custom_thresholds(self):
+        controller = AdmissionController(thresholds={PRIORITY_NORMAL: 1.5})
+        self.assertEqual(controller.thresholds[PRIORITY_LOW], 1.0)
+        self.assertEqual(controller.thresholds[PRIORITY_NORMAL], 1.5)
+
+    def test_load(self):
+        self.assertEqual(self.controller.load, 0.0)
+        self.monitor.update(0.05)
+        self.assertEqual(self.controller.load, 0.5)
+        self.controller.in_flight = 2
+        self.assertEqual(self.controller.load, 1.0)
+
+    def test_acquire_and_release(self):
+        self.controller.acquire(PRIORITY_LOW)
+        self.assertEqual(self.controller.in_flight, 1)
+        self.controller.release()
+        self.assertEqual(self.controller.in_flight, 0)
+        self.assertEqual(self.controller.admitted[PRIORITY_LOW], 1)
+
+    def test_acquire_rejects_low_priority_by_in_flight(self):
+        self.controller.acquire(PRIORITY_NORMAL)
+        self.controller.acquire(PRIORITY_NORMAL)
+        with self.assertRaises(Overloaded) as context:
+            self.controller.acquire(PRIORITY_LOW)
+        self.assertEqual(context.exception.retry_after, 3)
+        self.controller.acquire(PRIORITY_NORMAL)
+        self.assertEqual(self.controller.rejected[PRIORITY_LOW], 1)
+        self.assertEqual(self.controller.in_flight, 3)
+
+    def test_acquire_rejects_by_loop_lag(self):
+        self.monitor.update(0.2)
+        self.assertRaises(Overloaded, self.controller.acquire, PRIORITY_LOW)
+        self.assertRaises(
+            Overloaded, self.controller.acquire, PRIORITY_NORMAL
+        )
+        self.controller.acquire(PRIORITY_HIGH)
+        self.assertEqual(self.controller.in_flight, 1)
+        self.assertEqual(self.controller.rejected[PRIORITY_NORMAL], 1)
+
+    def test_acquire_starts_monitor(self):
+        loop = asyncio.new_event_loop()
+        monitor = LoopLagMonitor(loop=loop)
+        controller = AdmissionController(monitor=monitor)
+        controller.acquire()
+        self.assertTrue(monitor.is_running)
+        monitor.stop()
+        loop.close()
+
+    def test_snapshot(self):
+        self.controller.acquire(PRIORITY_HIGH)
+        snapshot = self.controller.snapshot()
+        self.assertEqual(snapshot['in_flight'], 1)
+        self.assertEqual(snapshot['admitted'][PRIORITY_HIGH], 1)
+        self.assertEqual(snapshot['rejected'][PRIORITY_HIGH], 0)
+        self.assertEqual(snapshot['load'], 0.5)
@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import ssl
 import unittest
 
+from unittest import mock
+
+from aiorest_ws.admission import AdmissionController
 from aiorest_ws.app import Application
+from aiorest_ws.cache import ResponseCache
 from aiorest_ws.routers import SimpleRouter
+from aiorest_ws.scheduler import RequestScheduler
+from aiorest_ws.subscriptions import SubscriptionManager
 from aiorest_ws.request import RequestHandlerFactory, RequestHandlerProtocol
-from aiorest_ws.utils.websocket import deflate_offer_accept as accept
+from aiorest_ws.utils.websocket import deflate_offer_accept as accept, \
+    CompressionPolicy
 
 from tests.fixtures.fakes import FakeTokenMiddleware
 
@@ -143,6 +151,18 @@ class ApplicationTestCase(unittest.TestCase):
         self.assertEqual(factory.log._log_level, 'debug')
         self.assertEqual(factory.protocol, RequestHandlerProtocol)
 
+    def test_set_idle_mode(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        factory = self.app._init_factory(url)
+        self.app._set_idle_mode(factory, idle_mode_timeout=30)
+        self.assertEqual(factory.idle_mode_timeout, 30)
+
+    def test_set_idle_mode_defaults(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        factory = self.app._init_factory(url)
+        self.app._set_idle_mode(factory)
+        self.assertIsNone(factory.idle_mode_timeout)
+
     def test_enable_compressing(self):
         url = self.app.generate_url('127.0.0.1', 8080)
         options = {}
@@ -167,6 +187,117 @@ class ApplicationTestCase(unittest.TestCase):
         self.assertTrue(callable(factory.perMessageCompressionAccept))
         self.assertEqual(factory.perMessageCompressionAccept, accept)
 
+    def test_enable_compressing_with_policy(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        policy = CompressionPolicy(min_size=256)
+        options = {'compression_policy': policy}
+        factory = self.app._init_factory(url)
+        self.app._enable_compressing(factory, **options)
+        self.assertEqual(factory.compression_policy, policy)
+        self.assertEqual(factory.perMessageCompressionAccept, policy)
+
+    def test_set_flow_control(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        options = {
+            'write_buffer_high': 1024, 'write_buffer_low': 256,
+            'slow_consumer_policy': 'drop'
+        }
+        factory = self.app._init_factory(url)
+        self.app._set_flow_control(factory, **options)
+        self.assertEqual(factory.write_buffer_high, 1024)
+        self.assertEqual(factory.write_buffer_low, 256)
+        self.assertEqual(factory.slow_consumer_policy, 'drop')
+
+    def test_set_flow_control_with_invalid_policy(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        factory = self.app._init_factory(url)
+        with self.assertRaises(AssertionError):
+            self.app._set_flow_control(factory, slow_consumer_policy='wait')
+
+    def test_set_message_batching(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        factory = self.app._init_factory(url)
+        self.app._set_message_batching(
+            factory, batch_window=0.001, batch_size=16
+        )
+        self.assertEqual(factory.batch_window, 0.001)
+        self.assertEqual(factory.batch_size, 16)
+
+    def test_set_keepalive(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        factory = self.app._init_factory(url)
+        self.app._set_keepalive(
+            factory, idle_timeout=300, auto_ping_interval=20,
+            auto_ping_timeout=5, close_handshake_timeout=2
+        )
+        self.assertEqual(factory.idle_timeout, 300)
+        self.assertEqual(factory.autoPingInterval, 20)
+        self.assertEqual(factory.autoPingTimeout, 5)
+        self.assertEqual(factory.closeHandshakeTimeout, 2)
+
+    def test_set_keepalive_defaults(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        factory = self.app._init_factory(url)
+        self.app._set_keepalive(factory)
+        self.assertIsNone(factory.idle_timeout)
+        self.assertEqual(factory.autoPingInterval, 0)
+
+    def test_set_socket_options(self):
+        url = self.app.generate_url('127.0.0.1', 8080)
+        factory = self.app._init_factory(url)
+        self.app._set_socket_options(factory, tcp_nodelay=True)
+        self.assertTrue(factory.tcp_nodelay)
+
+    def test_get_event_loop(self):
+        loop = asyncio.get_event_loop()
+        self.assertIs(self.app.get_event_loop(), loop)
+        self.assertIs(self.app.get_event_loop('asyncio'), loop)
+
+    @mock.patch('aiorest_ws.app.uvloop', None)
+    @mock.patch('aiorest_ws.log.logger.warning')
+    def test_get_event_loop_without_uvloop(self, log_warning):
+        loop = asyncio.get_event_loop()
+        self.assertIs(self.app.get_event_loop('uvloop'), loop)
+        self.assertEqual(log_warning.call_count, 1)
+
+    @mock.patch('aiorest_ws.app.asyncio.set_event_loop')
+    @mock.patch('aiorest_ws.app.asyncio.set_event_loop_policy')
+    def test_get_event_loop_with_uvloop(self, set_policy, set_loop):
+        policy = mock.Mock(spec=asyncio.AbstractEventLoopPolicy)
+        loop = asyncio.new_event_loop()
+        fake_uvloop = mock.Mock()
+        fake_uvloop.EventLoopPolicy.return_value = policy
+        with mock.patch('aiorest_ws.app.uvloop', fake_uvloop), \
+                mock.patch('aiorest_ws.app.asyncio.new_event_loop',
+                           return_value=loop):
+            self.assertIs(self.app.get_event_loop('uvloop'), loop)
+        loop.close()
+        set_policy.assert_called_once_with(policy)
+        set_loop.assert_called_once_with(loop)
+
+    @mock.patch('aiorest_ws.app.asyncio.set_event_loop')
+    def test_get_event_loop_with_loop_instance(self, set_loop):
+        loop = asyncio.new_event_loop()
+        self.assertIs(self.app.get_event_loop(loop), loop)
+        loop.close()
+        set_loop.assert_called_once_with(loop)
+
+    def test_get_event_loop_with_invalid_value(self):
+        with self.assertRaises(AssertionError):
+            self.app.get_event_loop('tokio')
+
+    def test_shutdown(self):
+        loop = asyncio.new_event_loop()
+        factory = mock.Mock()
+        factory.shutdown.return_value = asyncio.sleep(0, loop=loop)
+        loop.run_until_complete(
+            self.app.shutdown(factory, shutdown_timeout=3, retry_after=2)
+        )
+        loop.close()
+        factory.shutdown.assert_called_once_with(
+            timeout=3, retry_after=2, jitter=5.0
+        )
+
     def test_factory_router_not_defined(self):
         url = self.app.generate_url('127.0.0.1', 8080)
         options = {}
@@ -184,6 +315,40 @@ class ApplicationTestCase(unittest.TestCase):
         self.app._set_factory_router(factory, **options)
         self.assertIsInstance(factory.router, CustomRouter)
 
+    def test_set_factory_router_with_admission_controller(self):
+        controller = AdmissionController()
+        url = self.app.generate_url('127.0.0.1', 8080)
+        options = {
+            'router': SimpleRouter(), 'admission_controller': controller
+        }
+        factory = self.app._init_factory(url)
+        self.app._set_factory_router(factory, **options)
+        self.assertIs(factory.router.admission_controller, controller)
+
+    def test_set_factory_router_with_scheduler(self):
+        scheduler = RequestScheduler()
+        url = self.app.generate_url('127.0.0.1', 8080)
+        options = {'router': SimpleRouter(), 'scheduler': scheduler}
+        factory = self.app._init_factory(url)
+        self.app._set_factory_router(factory, **options)
+        self.assertIs(factory.router.scheduler, scheduler)
+
+    def test_set_factory_router_with_response_cache(self):
+        cache = ResponseCache()
+        url = self.app.generate_url('127.0.0.1', 8080)
+        options = {'router': SimpleRouter(), 'response_cache': cache}
+        factory = self.app._init_factory(url)
+        self.app._set_factory_router(factory, **options)
+        self.assertIs(factory.router.response_cache, cache)
+
+    def test_set_factory_router_with_subscriptions(self):
+        subscriptions = SubscriptionManager()
+        url = self.app.generate_url('127.0.0.1', 8080)
+        options = {'router': SimpleRouter(), 'subscriptions': subscriptions}
+        factory = self.app._init_factory(url)
+        self.app._set_factory_router(factory, **options)
+        self.assertIs(factory.router.subscriptions, subscriptions)
+
     def test_generate_factory(self):
         url = self.app.generate_url('127.0.0.1', 8080)
         factory = self.app.generate_factory(
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from aiorest_ws.cache import ResponseCache
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(ResponseCacheTestCase, self).setUp()
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_entries=2, clock=self.clock)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_set_and_get(self):
+        self.cache.set('key', b'payload', 10)
+        self.assertEqual(self.cache.get('key'), b'payload')
+        self.assertEqual(self.cache.hits, 1)
+        self.assertIn('key', self.cache)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_expiration(self):
+        self.cache.set('key', b'payload', 10, tags=('users', ))
+        self.clock.time = 10
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.snapshot()['tags'], 0)
+
+    def test_lru_eviction(self):
+        self.cache.set('first', b'1', 10)
+        self.cache.set('second', b'2', 10)
+        self.cache.get('first')
+        self.cache.set('third', b'3', 10)
+        self.assertIn('first', self.cache)
+        self.assertNotIn('second', self.cache)
+        self.assertIn('third', self.cache)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_set_replaces_tags(self):
+        self.cache.set('key', b'1', 10, tags=('users', ))
+        self.cache.set('key', b'2', 10, tags=('groups', ))
+        self.assertEqual(self.cache.invalidate('users'), 0)
+        self.assertEqual(self.cache.get('key'), b'2')
+
+    def test_invalidate(self):
+        self.cache.set('users', b'1', 10, tags=('users', ))
+        self.cache.set('user', b'2', 10, tags=('users', 'user-1'))
+        self.assertEqual(self.cache.invalidate('user-1'), 1)
+        self.assertIn('users', self.cache)
+        self.assertEqual(self.cache.invalidate('users', 'unknown'), 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_clear(self):
+        self.cache.set('key', b'payload', 10, tags=('users', ))
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.invalidate('users'), 0)
+
+    def test_snapshot(self):
+        self.cache.set('key', b'payload', 10, tags=('users', ))
+        self.cache.get('key')
+        self.cache.get('missing')
+        self.assertEqual(self.cache.snapshot(), {
+            'entries': 1, 'tags': 1, 'hits': 1, 'misses': 1, 'evictions': 0
+        })
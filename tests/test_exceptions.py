@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from aiorest_ws.exceptions import BaseAPIException
+from aiorest_ws.exceptions import BaseAPIException, Overloaded
 
 
 class BaseAPIExceptionTestCase(unittest.TestCase):
@@ -17,3 +17,12 @@ class BaseAPIExceptionTestCase(unittest.TestCase):
     def test_str_output(self):
         exception = BaseAPIException()
         self.assertEqual(str(exception), exception.detail)
+
+
+class OverloadedTestCase(unittest.TestCase):
+
+    def test_retry_after(self):
+        exception = Overloaded(retry_after=2.5)
+        self.assertEqual(exception.detail, exception.default_detail)
+        self.assertEqual(exception.retry_after, 2.5)
+        self.assertIsNone(Overloaded().retry_after)
@@ -1,11 +1,21 @@
 # -*- coding: utf -*-
+import asyncio
 import json
+import socket
 import unittest
 
 from base64 import b64encode
+from unittest import mock
 
+from autobahn.websocket.compress import PerMessageDeflate
+
+from aiorest_ws.exceptions import ShuttingDown
 from aiorest_ws.routers import SimpleRouter
 from aiorest_ws.request import RequestHandlerFactory, RequestHandlerProtocol
+from aiorest_ws.wrappers import Request
+from aiorest_ws.utils.websocket import CompressionPolicy, \
+    PolicyPerMessageDeflate, SLOW_CONSUMER_COALESCE, \
+    SLOW_CONSUMER_DISCONNECT, SLOW_CONSUMER_DROP
 
 
 class RequestHandlerProtocolTestCase(unittest.TestCase):
@@ -13,6 +23,7 @@ class RequestHandlerProtocolTestCase(unittest.TestCase):
     def setUp(self):
         super(RequestHandlerProtocolTestCase, self).setUp()
         self.protocol = RequestHandlerProtocol()
+        self.protocol.factory = RequestHandlerFactory()
 
     def test_encode_message(self):
         message = json.dumps({'key': 'value'}).encode('utf-8')
@@ -36,6 +47,560 @@ class RequestHandlerProtocolTestCase(unittest.TestCase):
         request = self.protocol._decode_message(message, isBinary=True)
         self.assertEqual({'url': request.url}, data)
 
+    def test_on_connect_without_compression_policy(self):
+        self.protocol.onConnect(None)
+        self.assertIsNone(self.protocol.compression_policy)
+
+    def test_on_connect_with_compression_policy(self):
+        policy = CompressionPolicy()
+        self.protocol.factory.compression_policy = policy
+        self.protocol.onConnect(None)
+        self.assertEqual(self.protocol.compression_policy, policy)
+        self.assertEqual(self.protocol.perMessageCompressionAccept,
+                         policy.accept)
+
+    def test_on_open_configures_compression(self):
+        pmce = PerMessageDeflate(True, False, False, 0, 0, None)
+        self.protocol.compression_policy = CompressionPolicy(level=1)
+        self.protocol._perMessageCompress = pmce
+        self.protocol.websocket_extensions_in_use = [pmce, ]
+        self.protocol.onOpen()
+        configured = self.protocol._perMessageCompress
+        self.assertIsInstance(configured, PolicyPerMessageDeflate)
+        self.assertEqual(configured.level, 1)
+        self.assertEqual(self.protocol.websocket_extensions_in_use,
+                         [configured, ])
+
+    def test_send_message_does_not_touch_client_activity(self):
+        self.protocol.is_idle = True
+        self.protocol.last_client_activity = 0
+        target = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                 '.sendMessage'
+        with mock.patch(target):
+            self.protocol.sendMessage(b'message')
+
+        self.assertFalse(self.protocol.is_idle)
+        self.assertIsNotNone(self.protocol.last_activity)
+        self.assertEqual(self.protocol.last_client_activity, 0)
+
+    def test_on_pong_does_not_touch_client_activity(self):
+        self.protocol.last_client_activity = 0
+        self.protocol.onPong(b'')
+        self.assertEqual(self.protocol.last_client_activity, 0)
+        self.assertIsNotNone(self.protocol.last_pong)
+
+    def test_send_message_skips_compression_for_small_payloads(self):
+        self.protocol.compression_policy = CompressionPolicy(min_size=10)
+        self.protocol._perMessageCompress = mock.Mock()
+        target = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                 '.sendMessage'
+        with mock.patch(target) as send_message:
+            self.protocol.sendMessage(b'short')
+            self.protocol.sendMessage(b'long enough message')
+
+        self.assertTrue(send_message.call_args_list[0][1]['doNotCompress'])
+        self.assertFalse(send_message.call_args_list[1][1]['doNotCompress'])
+
+    def test_on_open_and_on_close_register_connection(self):
+        self.protocol._perMessageCompress = None
+        self.protocol.onOpen()
+        self.assertIn(self.protocol, self.protocol.factory.connections)
+        self.assertIsNotNone(self.protocol.last_activity)
+        self.assertIsNotNone(self.protocol.last_client_activity)
+
+        self.protocol.onClose(True, 1000, None)
+        self.assertNotIn(self.protocol, self.protocol.factory.connections)
+
+    def test_connection_state(self):
+        self.protocol.state = self.protocol.STATE_CONNECTING
+        self.assertEqual(self.protocol.connection_state, 'connecting')
+        self.protocol.state = self.protocol.STATE_OPEN
+        self.assertEqual(self.protocol.connection_state, 'active')
+        self.protocol.is_idle = True
+        self.assertEqual(self.protocol.connection_state, 'idle')
+        self.protocol.is_paused = True
+        self.assertEqual(self.protocol.connection_state, 'paused')
+        self.protocol.state = self.protocol.STATE_CLOSING
+        self.assertEqual(self.protocol.connection_state, 'closing')
+        self.protocol.state = self.protocol.STATE_CLOSED
+        self.assertEqual(self.protocol.connection_state, 'closed')
+
+    def test_close_idle(self):
+        self.protocol.sendClose = mock.Mock()
+        self.protocol.close_idle()
+        self.protocol.sendClose.assert_called_once_with(
+            code=1000, reason=u"Idle timeout."
+        )
+        self.assertEqual(self.protocol.factory.reaped['idle_timeout'], 1)
+
+    @mock.patch('autobahn.asyncio.websocket.WebSocketServerProtocol.'
+                'onAutoPingTimeout')
+    def test_on_auto_ping_timeout(self, on_timeout):
+        self.protocol.onAutoPingTimeout()
+        on_timeout.assert_called_once_with()
+        self.assertEqual(self.protocol.factory.reaped['ping_timeout'], 1)
+
+    @mock.patch('autobahn.asyncio.websocket.WebSocketServerProtocol.'
+                'onOpenHandshakeTimeout')
+    def test_on_open_handshake_timeout(self, on_timeout):
+        self.protocol.onOpenHandshakeTimeout()
+        on_timeout.assert_called_once_with()
+        self.assertEqual(
+            self.protocol.factory.reaped['handshake_timeout'], 1
+        )
+
+    def test_enter_idle_mode(self):
+        pmce = PerMessageDeflate(True, False, True, 0, 0, None)
+        pmce.startCompressMessage()
+        pmce.startDecompressMessage()
+        self.protocol._perMessageCompress = pmce
+        self.protocol.inside_message = False
+        self.protocol.send_state = self.protocol.SEND_STATE_GROUND
+        self.protocol.http_request_data = b'GET / HTTP/1.1'
+
+        self.assertTrue(self.protocol.enter_idle_mode())
+        self.assertTrue(self.protocol.is_idle)
+        self.assertIsNone(pmce._compressor)
+        self.assertIsNone(pmce._decompressor)
+        self.assertIsNone(self.protocol.http_request_data)
+
+        self.protocol.touch()
+        self.assertFalse(self.protocol.is_idle)
+
+    def test_enter_idle_mode_keeps_client_context(self):
+        pmce = PerMessageDeflate(True, False, False, 0, 0, None)
+        pmce.startDecompressMessage()
+        self.protocol._perMessageCompress = pmce
+        self.protocol.inside_message = False
+        self.protocol.send_state = self.protocol.SEND_STATE_GROUND
+
+        self.assertTrue(self.protocol.enter_idle_mode())
+        self.assertIsNotNone(pmce._decompressor)
+
+    def test_enter_idle_mode_inside_message(self):
+        self.protocol.inside_message = True
+        self.assertFalse(self.protocol.enter_idle_mode())
+        self.assertFalse(self.protocol.is_idle)
+
+
+class RequestHandlerProtocolFlowControlTestCase(unittest.TestCase):
+
+    send_message = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                   '.sendMessage'
+
+    def setUp(self):
+        super(RequestHandlerProtocolFlowControlTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.factory = RequestHandlerFactory(loop=self.loop)
+        self.protocol = RequestHandlerProtocol()
+        self.protocol.factory = self.factory
+        self.protocol.transport = mock.Mock()
+        self.protocol.transport.get_write_buffer_size.return_value = 1024
+
+    def tearDown(self):
+        self.loop.close()
+        super(RequestHandlerProtocolFlowControlTestCase, self).tearDown()
+
+    def test_connection_made_sets_watermarks(self):
+        self.factory.write_buffer_high = 64 * 1024
+        self.factory.write_buffer_low = 16 * 1024
+        transport = mock.Mock()
+        target = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                 '.connection_made'
+        with mock.patch(target):
+            self.protocol.connection_made(transport)
+        transport.set_write_buffer_limits.assert_called_once_with(
+            high=64 * 1024, low=16 * 1024
+        )
+        self.assertIn(self.protocol, self.factory.handshakes)
+        transport.get_extra_info.assert_not_called()
+
+    def test_connection_made_sets_tcp_nodelay(self):
+        self.factory.tcp_nodelay = True
+        transport = mock.Mock()
+        target = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                 '.connection_made'
+        with mock.patch(target):
+            self.protocol.connection_made(transport)
+        sock = transport.get_extra_info.return_value
+        sock.setsockopt.assert_called_once_with(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+        )
+
+    def test_pause_and_resume_writing(self):
+        self.protocol.pause_writing()
+        self.assertTrue(self.protocol.is_paused)
+        self.protocol.resume_writing()
+        self.assertFalse(self.protocol.is_paused)
+
+        stats = self.factory.flow_control_stats.snapshot()
+        self.assertEqual(stats['paused'], 1)
+        self.assertEqual(stats['resumed'], 1)
+        self.assertEqual(stats['max_buffer_size'], 1024)
+
+    def test_drain_without_pause(self):
+        self.loop.run_until_complete(self.protocol.drain())
+
+    def test_drain_waits_for_resume(self):
+        self.protocol.pause_writing()
+        drain = asyncio.ensure_future(self.protocol.drain(), loop=self.loop)
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.assertFalse(drain.done())
+
+        self.protocol.resume_writing()
+        self.loop.run_until_complete(drain)
+        self.assertTrue(drain.done())
+
+    def test_drain_on_connection_lost(self):
+        self.protocol.pause_writing()
+        drain = asyncio.ensure_future(self.protocol.drain(), loop=self.loop)
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        target = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                 '.connection_lost'
+        with mock.patch(target):
+            self.protocol.connection_lost(None)
+        self.loop.run_until_complete(drain)
+        self.assertTrue(drain.done())
+
+    def test_slow_consumer_without_policy(self):
+        self.protocol.pause_writing()
+        with mock.patch(self.send_message) as send_message:
+            self.protocol.sendMessage(b'message')
+        self.assertEqual(send_message.call_count, 1)
+
+    def test_slow_consumer_drop(self):
+        self.factory.slow_consumer_policy = SLOW_CONSUMER_DROP
+        self.protocol.pause_writing()
+        with mock.patch(self.send_message) as send_message:
+            self.protocol.sendMessage(b'message')
+            self.protocol.resume_writing()
+        send_message.assert_not_called()
+        self.assertEqual(self.factory.flow_control_stats.dropped, 1)
+
+    def test_slow_consumer_coalesce(self):
+        self.factory.slow_consumer_policy = SLOW_CONSUMER_COALESCE
+        self.protocol.pause_writing()
+        with mock.patch(self.send_message) as send_message:
+            self.protocol.sendMessage(b'first')
+            self.protocol.sendMessage(b'second', isBinary=True)
+            send_message.assert_not_called()
+            self.protocol.resume_writing()
+
+        self.assertEqual(send_message.call_count, 1)
+        self.assertEqual(send_message.call_args[0], (b'second', ))
+        self.assertTrue(send_message.call_args[1]['isBinary'])
+        self.assertEqual(self.factory.flow_control_stats.coalesced, 1)
+
+    def test_slow_consumer_disconnect(self):
+        self.factory.slow_consumer_policy = SLOW_CONSUMER_DISCONNECT
+        self.protocol.pause_writing()
+        self.protocol.dropConnection = mock.Mock()
+        with mock.patch(self.send_message) as send_message:
+            self.protocol.sendMessage(b'message')
+        send_message.assert_not_called()
+        self.protocol.dropConnection.assert_called_once_with(abort=True)
+        self.assertEqual(self.factory.flow_control_stats.disconnected, 1)
+
+    def test_send_stream(self):
+        with mock.patch(self.send_message) as send_message:
+            self.loop.run_until_complete(
+                self.protocol.send_stream([b'first', b'second'])
+            )
+        self.assertEqual(
+            [call[0][0] for call in send_message.call_args_list],
+            [b'first', b'second']
+        )
+
+
+class RequestHandlerProtocolBatchingTestCase(unittest.TestCase):
+
+    send_message = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                   '.sendMessage'
+
+    def setUp(self):
+        super(RequestHandlerProtocolBatchingTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.factory = RequestHandlerFactory(loop=self.loop)
+        self.factory.batch_window = 0.001
+        self.protocol = RequestHandlerProtocol()
+        self.protocol.factory = self.factory
+        self.protocol.transport = mock.Mock()
+
+    def tearDown(self):
+        self.loop.close()
+        super(RequestHandlerProtocolBatchingTestCase, self).tearDown()
+
+    def test_send_batched_within_window(self):
+        with mock.patch(self.send_message) as send_message:
+            self.protocol.send_batched(b'{"data": 1}')
+            self.protocol.send_batched(b'{"data": 2}')
+            send_message.assert_not_called()
+            self.loop.run_until_complete(asyncio.sleep(0.01, loop=self.loop))
+
+        send_message.assert_called_once_with(
+            b'[{"data": 1},{"data": 2}]', isBinary=False, fragmentSize=None,
+            sync=False, doNotCompress=False
+        )
+
+    def test_send_batched_with_batch_size(self):
+        self.factory.batch_size = 2
+        with mock.patch(self.send_message) as send_message:
+            self.protocol.send_batched(b'{"data": 1}')
+            self.protocol.send_batched(b'{"data": 2}')
+            self.protocol.send_batched(b'{"data": 3}')
+            self.assertEqual(send_message.call_count, 1)
+            self.loop.run_until_complete(asyncio.sleep(0.01, loop=self.loop))
+
+        self.assertEqual(send_message.call_count, 2)
+        self.assertEqual(send_message.call_args[0], (b'{"data": 3}', ))
+
+    def test_flush_empty_batch(self):
+        with mock.patch(self.send_message) as send_message:
+            self.protocol.flush_batch()
+        send_message.assert_not_called()
+
+    def test_on_message_batches_json_responses(self):
+        self.factory.router.process_request = mock.Mock(
+            return_value=b'{"data": 1}'
+        )
+        payload = json.dumps({'method': 'GET', 'url': '/api'}).encode('utf-8')
+        with mock.patch(self.send_message) as send_message:
+            for _ in range(2):
+                self.loop.run_until_complete(
+                    self.protocol.onMessage(payload, False)
+                )
+            self.loop.run_until_complete(asyncio.sleep(0.01, loop=self.loop))
+        self.assertEqual(send_message.call_count, 1)
+        self.assertEqual(
+            send_message.call_args[0], (b'[{"data": 1},{"data": 1}]', )
+        )
+
+    def test_on_message_sends_other_formats_directly(self):
+        self.factory.router.process_request = mock.Mock(
+            return_value=b'<root></root>'
+        )
+        payload = json.dumps({'method': 'GET', 'url': '/api'}).encode('utf-8')
+        self.protocol._batch = [b'{"data": 1}', ]
+        with mock.patch(self.send_message) as send_message:
+            self.loop.run_until_complete(
+                self.protocol.onMessage(payload, False)
+            )
+        self.assertEqual(
+            [call[0][0] for call in send_message.call_args_list],
+            [b'{"data": 1}', b'<root></root>']
+        )
+
+
+class RequestHandlerShutdownTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(RequestHandlerShutdownTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.factory = RequestHandlerFactory(loop=self.loop)
+        self.factory.closeHandshakeTimeout = 0
+        self.protocol = RequestHandlerProtocol()
+        self.protocol.factory = self.factory
+        self.protocol.state = self.protocol.STATE_OPEN
+        self.protocol.sendCloseFrame = mock.Mock()
+        self.factory.connections.add(self.protocol)
+
+    def tearDown(self):
+        self.loop.close()
+        super(RequestHandlerShutdownTestCase, self).tearDown()
+
+    def test_on_message_tracks_task(self):
+        tasks = []
+
+        @asyncio.coroutine
+        def process_request(request, isBinary):
+            tasks.extend(self.protocol.tasks.items())
+
+        self.protocol.process_request = process_request
+        task = asyncio.ensure_future(
+            self.protocol.onMessage(b'{"event_name": "test"}', False),
+            loop=self.loop
+        )
+        self.loop.run_until_complete(task)
+        self.assertEqual(tasks, [(task, 'test'), ])
+        self.assertEqual(self.protocol.tasks, {})
+
+    def test_on_message_cancels_request(self):
+        handler = asyncio.ensure_future(
+            asyncio.sleep(10, loop=self.loop), loop=self.loop
+        )
+        other = asyncio.ensure_future(
+            asyncio.sleep(10, loop=self.loop), loop=self.loop
+        )
+        self.protocol.tasks[handler] = 'first'
+        self.protocol.tasks[other] = 'second'
+        self.loop.run_until_complete(
+            self.protocol.onMessage(b'{"cancel": "first"}', False)
+        )
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.assertTrue(handler.cancelled())
+        self.assertFalse(other.cancelled())
+        other.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+
+    def test_connection_lost_cancels_handlers(self):
+        handler = asyncio.ensure_future(
+            asyncio.sleep(10, loop=self.loop), loop=self.loop
+        )
+        self.protocol.tasks[handler] = None
+        target = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                 '.connection_lost'
+        with mock.patch(target):
+            self.protocol.connection_lost(None)
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.assertTrue(handler.cancelled())
+        self.assertNotIn(self.protocol, self.factory.connections)
+        self.assertNotIn(self.protocol, self.factory.connections)
+
+    def test_process_request_with_coroutine_response(self):
+        @asyncio.coroutine
+        def response():
+            return b'{"data": 1}'
+
+        self.factory.router.process_request = mock.Mock(
+            return_value=response()
+        )
+        self.protocol.sendMessage = mock.Mock()
+        self.loop.run_until_complete(
+            self.protocol.process_request(Request(), False)
+        )
+        self.protocol.sendMessage.assert_called_once_with(
+            b'{"data": 1}', isBinary=False
+        )
+
+    def test_on_message_unsubscribes(self):
+        subscriptions = mock.Mock()
+        self.factory.router.subscriptions = subscriptions
+        self.protocol.process_request = mock.Mock()
+        self.loop.run_until_complete(
+            self.protocol.onMessage(b'{"unsubscribe": "users"}', False)
+        )
+        subscriptions.unsubscribe.assert_called_once_with(
+            self.protocol, 'users'
+        )
+        self.protocol.process_request.assert_not_called()
+
+    def test_on_message_sets_connection(self):
+        requests = []
+
+        @asyncio.coroutine
+        def process_request(request, isBinary):
+            requests.append(request)
+
+        self.protocol.process_request = process_request
+        self.loop.run_until_complete(
+            self.protocol.onMessage(b'{"event_name": "test"}', False)
+        )
+        self.assertIs(requests[0].connection, self.protocol)
+        self.assertFalse(requests[0].is_binary)
+
+    def test_connection_lost_unsubscribes(self):
+        subscriptions = mock.Mock()
+        self.factory.router.subscriptions = subscriptions
+        target = 'autobahn.asyncio.websocket.WebSocketServerProtocol' \
+                 '.connection_lost'
+        with mock.patch(target):
+            self.protocol.connection_lost(None)
+        subscriptions.unsubscribe.assert_called_once_with(self.protocol)
+
+    def test_send_response(self):
+        self.protocol.sendMessage = mock.Mock()
+        self.protocol.send_response(b'{"patch": {}}')
+        self.protocol.sendMessage.assert_called_once_with(
+            b'{"patch": {}}', isBinary=False
+        )
+
+    @mock.patch('aiorest_ws.log.logger.info')
+    def test_on_message_rejected_on_shutdown(self, log_info):
+        self.factory.is_shutting_down = True
+        self.factory._retry_after = (2, None)
+        self.protocol.process_request = mock.Mock()
+        self.protocol.send_response = mock.Mock()
+        self.loop.run_until_complete(self.protocol.onMessage(
+            b'{"method": "GET", "url": "/api/", "event_name": "e"}', False
+        ))
+        self.protocol.process_request.assert_not_called()
+        response, is_binary = self.protocol.send_response.call_args[0]
+        self.assertFalse(is_binary)
+        self.assertEqual(json.loads(response.decode('utf-8')), {
+            'detail': ShuttingDown.default_detail, 'retry_after': 2.0,
+            'event_name': 'e'
+        })
+        log_info.assert_called_once_with('"GET /api/" rejected on shutdown')
+
+    def test_on_message_cancels_request_on_shutdown(self):
+        self.factory.is_shutting_down = True
+        self.protocol.cancel_request = mock.Mock()
+        self.protocol.send_response = mock.Mock()
+        self.loop.run_until_complete(
+            self.protocol.onMessage(b'{"cancel": "e"}', False)
+        )
+        self.protocol.cancel_request.assert_called_once_with('e')
+        self.protocol.send_response.assert_not_called()
+
+    def test_go_away(self):
+        self.protocol.go_away('{"retry_after": 1}')
+        self.protocol.sendCloseFrame.assert_called_once_with(
+            code=1001, reasonUtf8=b'{"retry_after": 1}'
+        )
+
+    def test_go_away_for_closed_connection(self):
+        self.protocol.state = self.protocol.STATE_CLOSED
+        self.protocol.go_away()
+        self.protocol.sendCloseFrame.assert_not_called()
+
+    def test_get_going_away_reason(self):
+        self.assertIsNone(self.factory.get_going_away_reason())
+        self.assertEqual(
+            self.factory.get_going_away_reason(retry_after=2),
+            '{"retry_after": 2.0}'
+        )
+        reason = json.loads(
+            self.factory.get_going_away_reason(retry_after=2, jitter=3)
+        )
+        self.assertTrue(2 <= reason['retry_after'] <= 5)
+
+    def test_get_shutdown_error(self):
+        self.assertIsNone(self.factory.get_shutdown_error().retry_after)
+        self.loop.run_until_complete(self.factory.shutdown(retry_after=3))
+        error = self.factory.get_shutdown_error()
+        self.assertIsInstance(error, ShuttingDown)
+        self.assertEqual(error.retry_after, 3.0)
+
+    def test_shutdown_waits_for_handlers(self):
+        handler = asyncio.ensure_future(
+            asyncio.sleep(0.01, loop=self.loop), loop=self.loop
+        )
+        self.protocol.tasks[handler] = None
+        self.loop.run_until_complete(
+            self.factory.shutdown(timeout=1, retry_after=1)
+        )
+        self.assertTrue(self.factory.is_shutting_down)
+        self.assertFalse(handler.cancelled())
+        self.protocol.sendCloseFrame.assert_called_once_with(
+            code=1001, reasonUtf8=b'{"retry_after": 1.0}'
+        )
+
+    def test_shutdown_cancels_handlers_after_timeout(self):
+        handler = asyncio.ensure_future(
+            asyncio.sleep(10, loop=self.loop), loop=self.loop
+        )
+        self.protocol.tasks[handler] = None
+        self.loop.run_until_complete(self.factory.shutdown(timeout=0.01))
+        self.assertTrue(handler.cancelled())
+        self.protocol.sendCloseFrame.assert_called_once_with(
+            code=1001, reasonUtf8=None
+        )
+
+    def test_shutdown_without_connections(self):
+        self.factory.connections.clear()
+        self.loop.run_until_complete(self.factory.shutdown(timeout=1))
+        self.assertTrue(self.factory.is_shutting_down)
+
 
 class RequestHandlerFactoryTestCase(unittest.TestCase):
 
@@ -53,6 +618,92 @@ class RequestHandlerFactoryTestCase(unittest.TestCase):
         self.factory.router = ImplementedRouter()
         self.assertIsInstance(self.factory.router, ImplementedRouter)
 
+    def test_release_idle_connections(self):
+        self.factory.idle_mode_timeout = 10
+        active, idle = mock.Mock(is_idle=False), mock.Mock(is_idle=False)
+        idle.enter_idle_mode.return_value = True
+        active.last_activity = self.factory.loop.time()
+        idle.last_activity = active.last_activity - 60
+        self.factory.register_connection(active)
+        self.factory.register_connection(idle)
+        self.assertIsNotNone(self.factory._idle_mode_handle)
+
+        self.assertEqual(self.factory.release_idle_connections(), 1)
+        idle.enter_idle_mode.assert_called_once_with()
+        active.enter_idle_mode.assert_not_called()
+        self.factory._idle_mode_handle.cancel()
+
+    def test_release_idle_connections_with_pongs(self):
+        self.factory.idle_mode_timeout = 10
+        protocol = RequestHandlerProtocol()
+        protocol.factory = self.factory
+        protocol.last_activity = self.factory.loop.time() - 60
+        self.factory.register_connection(protocol)
+        # Pongs onto the automatic pings arrive, but messages don't
+        protocol.onPong(b'')
+        self.assertFalse(protocol.is_idle)
+
+        with mock.patch.object(protocol, 'enter_idle_mode') as enter:
+            enter.return_value = True
+            self.assertEqual(self.factory.release_idle_connections(), 1)
+        enter.assert_called_once_with()
+        self.factory._idle_mode_handle.cancel()
+
+    def test_close_idle_connections(self):
+        self.factory.idle_timeout = 10
+        active = mock.Mock(connection_state='active')
+        idle = mock.Mock(connection_state='idle')
+        closing = mock.Mock(connection_state='closing')
+        active.last_client_activity = self.factory.loop.time()
+        idle.last_client_activity = active.last_client_activity - 60
+        closing.last_client_activity = active.last_client_activity - 60
+        # Messages, sent to the client, don't postpone the idle timeout
+        idle.last_activity = active.last_client_activity
+        for protocol in (active, idle, closing):
+            self.factory.register_connection(protocol)
+        self.assertIsNotNone(self.factory._idle_timeout_handle)
+
+        self.assertEqual(self.factory.close_idle_connections(), 1)
+        idle.close_idle.assert_called_once_with()
+        active.close_idle.assert_not_called()
+        closing.close_idle.assert_not_called()
+        self.factory._idle_timeout_handle.cancel()
+
+    def test_close_idle_connections_with_pongs(self):
+        self.factory.idle_timeout = 10
+        protocol = RequestHandlerProtocol()
+        protocol.factory = self.factory
+        protocol.state = protocol.STATE_OPEN
+        protocol.last_client_activity = self.factory.loop.time() - 60
+        self.factory.register_connection(protocol)
+        # Pongs onto the automatic pings arrive, but messages don't
+        protocol.onPong(b'')
+
+        with mock.patch.object(protocol, 'sendClose') as send_close:
+            self.assertEqual(self.factory.close_idle_connections(), 1)
+        send_close.assert_called_once_with(code=1000, reason=u"Idle timeout.")
+        self.factory._idle_timeout_handle.cancel()
+
+    def test_get_connection_stats(self):
+        self.factory.handshakes.add(mock.Mock(connection_state='connecting'))
+        self.factory.connections.add(mock.Mock(connection_state='active'))
+        self.factory.connections.add(mock.Mock(connection_state='active'))
+        self.factory.connections.add(mock.Mock(connection_state='idle'))
+        self.factory.reaped['ping_timeout'] = 2
+        stats = self.factory.get_connection_stats()
+        self.assertEqual(stats['states'], {
+            'connecting': 1, 'active': 2, 'idle': 1, 'paused': 0,
+            'closing': 0, 'closed': 0,
+        })
+        self.assertEqual(stats['reaped']['ping_timeout'], 2)
+
+    def test_register_connection_without_idle_mode(self):
+        protocol = mock.Mock()
+        self.factory.register_connection(protocol)
+        self.assertEqual(self.factory.connections, {protocol, })
+        self.assertIsNone(self.factory._idle_mode_handle)
+        self.assertIsNone(self.factory._idle_timeout_handle)
+
     def test_router_setter_with_invalid_router_class(self):
         class InvalidRouter(object):
             pass
@@ -1,15 +1,23 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import json
+import threading
 import unittest
 import unittest.mock
 
 from fixtures.fakes import InvalidEndpoint, FakeView, FakeGetView, \
     FakeEndpoint, FakeTokenMiddleware, FakeTokenMiddlewareWithExc
 
+from aiorest_ws.admission import AdmissionController, PRIORITY_LOW
+from aiorest_ws.cache import ResponseCache
 from aiorest_ws.decorators import endpoint
 from aiorest_ws.endpoints import PlainEndpoint
-from aiorest_ws.exceptions import EndpointValueError, NotSpecifiedURL
-from aiorest_ws.routers import SimpleRouter
+from aiorest_ws.exceptions import EndpointValueError, IncorrectArgument, \
+    NotSpecifiedURL
+from aiorest_ws.renderers import JSONRenderer
+from aiorest_ws.routers import SimpleRouter, VERSION_PLACEHOLDER
+from aiorest_ws.scheduler import RequestScheduler
+from aiorest_ws.subscriptions import SubscriptionManager
 from aiorest_ws.views import MethodBasedView
 from aiorest_ws.wrappers import Request
 
@@ -242,6 +250,750 @@ class RestWSRouterTestCase(unittest.TestCase):
         self.assertIn('event_name', json_response)
         self.assertIsNone(json_response['event_name'])
 
+    def test_get_timeout(self):
+        handler = FakeGetView()
+        self.assertIsNone(self.router.get_timeout(Request(), handler))
+
+        handler.timeout = 5
+        self.assertEqual(self.router.get_timeout(Request(), handler), 5)
+        request = Request(deadline=2)
+        self.assertEqual(self.router.get_timeout(request, handler), 2)
+
+        handler.timeout = None
+        self.assertEqual(self.router.get_timeout(request, handler), 2)
+        request = Request(deadline='1.5')
+        self.assertEqual(self.router.get_timeout(request, handler), 1.5)
+
+    def test_get_timeout_with_invalid_deadline(self):
+        handler = FakeGetView()
+        handler.timeout = 5
+        for deadline in ('abc', [1], True, 0, -1, float('nan'),
+                         float('inf')):
+            request = Request(deadline=deadline)
+            with self.assertRaises(IncorrectArgument):
+                self.router.get_timeout(request, handler)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.exception')
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_invalid_deadline(self, log_info,
+                                                   log_exception):
+        calls = []
+
+        class AsyncView(MethodBasedView):
+            @asyncio.coroutine
+            def get(self, request, *args, **kwargs):
+                calls.append(request)
+                return 'async'
+
+        self.router.register('/api/get/', AsyncView, 'GET')
+        for deadline in ('abc', [1], 0, -5):
+            request = Request(method='GET', url='/api/get/',
+                              deadline=deadline, event_name='e')
+            response = json.loads(
+                self.router.process_request(request).decode('utf-8')
+            )
+            self.assertEqual(response['event_name'], 'e')
+            self.assertIn('`deadline`', response['detail'])
+        self.assertEqual(calls, [])
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_coroutine_handler(self, log_info):
+        class AsyncView(MethodBasedView):
+            @asyncio.coroutine
+            def get(self, request, *args, **kwargs):
+                yield from asyncio.sleep(0)
+                return 'async'
+
+        self.router.register('/api/get/', AsyncView, 'GET')
+        request = Request(**{'method': 'GET', 'url': '/api/get/'})
+        response = self.router.process_request(request)
+        self.assertTrue(asyncio.iscoroutine(response))
+
+        loop = asyncio.new_event_loop()
+        response = loop.run_until_complete(response)
+        loop.close()
+        self.assertEqual(
+            json.loads(response.decode('utf-8')),
+            {'data': 'async', 'event_name': None}
+        )
+
+    @unittest.mock.patch('aiorest_ws.log.logger.exception')
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_deadline(self, log_info, log_exception):
+        cancelled = []
+
+        class AsyncView(MethodBasedView):
+            @asyncio.coroutine
+            def get(self, request, *args, **kwargs):
+                try:
+                    yield from asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+        self.router.register('/api/get/', AsyncView, 'GET')
+        request = Request(**{
+            'method': 'GET', 'url': '/api/get/', 'deadline': 0.01
+        })
+        loop = asyncio.new_event_loop()
+        response = loop.run_until_complete(
+            self.router.process_request(request)
+        )
+        loop.close()
+        json_response = json.loads(response.decode('utf-8'))
+        self.assertIn('detail', json_response)
+        self.assertEqual(cancelled, [True, ])
+        self.assertTrue(request.is_cancelled)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_in_executor(self, log_info):
+        threads = []
+
+        class ThreadPoolView(MethodBasedView):
+            run_in_executor = True
+
+            def get(self, request, *args, **kwargs):
+                threads.append(threading.current_thread())
+                return 'thread'
+
+        self.router.register('/api/get/', ThreadPoolView, 'GET')
+        request = Request(**{'method': 'GET', 'url': '/api/get/'})
+        loop = asyncio.new_event_loop()
+        response = loop.run_until_complete(
+            self.router.process_request(request)
+        )
+        loop.close()
+        json_response = json.loads(response.decode('utf-8'))
+        self.assertEqual(json_response['data'], 'thread')
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    @unittest.mock.patch('aiorest_ws.log.logger.exception')
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_in_executor_with_timeout(self, log_info,
+                                                      log_exception):
+        stopped = threading.Event()
+
+        class ThreadPoolView(MethodBasedView):
+            run_in_executor = True
+            timeout = 0.01
+
+            def get(self, request, *args, **kwargs):
+                while not request.is_cancelled:
+                    stopped.wait(0.001)
+                stopped.set()
+
+        self.router.register('/api/get/', ThreadPoolView, 'GET')
+        request = Request(**{'method': 'GET', 'url': '/api/get/'})
+        loop = asyncio.new_event_loop()
+        response = loop.run_until_complete(
+            self.router.process_request(request)
+        )
+        loop.close()
+        self.assertIn('detail', json.loads(response.decode('utf-8')))
+        self.assertTrue(stopped.wait(1))
+
+    @unittest.mock.patch('aiorest_ws.log.logger.exception')
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_admission_controller(self, log_info,
+                                                       log_exception):
+        controller = AdmissionController(max_in_flight=1)
+        controller.monitor._handle = object()
+        self.router.admission_controller = controller
+
+        class ReportView(MethodBasedView):
+            priority = PRIORITY_LOW
+
+            def get(self, request, *args, **kwargs):
+                return 'report'
+
+        self.router.register('/api/report/', ReportView, 'GET')
+        request = Request(**{'method': 'GET', 'url': '/api/report/'})
+        response = self.router.process_request(request).decode('utf-8')
+        self.assertEqual(json.loads(response)['data'], 'report')
+        self.assertEqual(controller.in_flight, 0)
+
+        controller.in_flight = 1
+        response = self.router.process_request(request).decode('utf-8')
+        json_response = json.loads(response)
+        self.assertNotIn('data', json_response)
+        self.assertEqual(json_response['retry_after'], 1.0)
+        self.assertEqual(controller.rejected[PRIORITY_LOW], 1)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_admission_of_coroutine(self, log_info):
+        controller = AdmissionController()
+        controller.monitor._handle = object()
+        self.router.admission_controller = controller
+        in_flight = []
+
+        class AsyncView(MethodBasedView):
+            @asyncio.coroutine
+            def get(self, request, *args, **kwargs):
+                in_flight.append(controller.in_flight)
+                yield from asyncio.sleep(0)
+                return 'async'
+
+        self.router.register('/api/get/', AsyncView, 'GET')
+        request = Request(**{'method': 'GET', 'url': '/api/get/'})
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(self.router.process_request(request))
+        loop.close()
+        self.assertEqual(in_flight, [1, ])
+        self.assertEqual(controller.in_flight, 0)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_scheduler(self, log_info):
+        scheduler = RequestScheduler()
+        self.router.scheduler = scheduler
+        active = []
+
+        class ReportView(MethodBasedView):
+            priority = PRIORITY_LOW
+
+            def get(self, request, *args, **kwargs):
+                active.append(scheduler.active)
+                return 'report'
+
+        self.router.register('/api/report/', ReportView, 'GET')
+        request = Request(**{'method': 'GET', 'url': '/api/report/'})
+        response = self.router.process_request(request)
+        self.assertTrue(asyncio.iscoroutine(response))
+
+        loop = asyncio.new_event_loop()
+        response = loop.run_until_complete(response)
+        loop.close()
+        self.assertEqual(json.loads(response.decode('utf-8'))['data'],
+                         'report')
+        self.assertEqual(active, [1, ])
+        self.assertEqual(scheduler.active, 0)
+        self.assertIn(PRIORITY_LOW, scheduler.stats.snapshot())
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_response_cache(self, log_info):
+        calls = []
+
+        class UsersView(MethodBasedView):
+            cache_ttl = 60
+            cache_vary_args = ('page', )
+            cache_tags = ('users', )
+
+            def get(self, request, *args, **kwargs):
+                calls.append(request.args)
+                return len(calls)
+
+        self.router.response_cache = ResponseCache()
+        self.router.register('/api/users/', UsersView, 'GET')
+
+        def get(**args):
+            request = Request(method='GET', url='/api/users/', args=args)
+            return json.loads(
+                self.router.process_request(request).decode('utf-8')
+            )['data']
+
+        self.assertEqual(get(page=1), 1)
+        self.assertEqual(get(page=1, ignored=True), 1)
+        self.assertEqual(get(page=2), 2)
+        self.assertEqual(get(page=1, format='json'), 1)
+        self.assertEqual(self.router.response_cache.hits, 2)
+
+        self.router.response_cache.invalidate('users')
+        self.assertEqual(get(page=1), 3)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_response_cache_of_other_event(
+            self, log_info):
+        calls = []
+
+        class UsersView(MethodBasedView):
+            cache_ttl = 60
+            conditional = True
+
+            def get(self, request, *args, **kwargs):
+                calls.append(request.event_name)
+                return [{'id': 1}]
+
+        self.router.response_cache = ResponseCache()
+        self.router.register('/api/users/', UsersView, 'GET')
+        responses = []
+        for event_name in ('first', 'second'):
+            request = Request(method='GET', url='/api/users/',
+                              event_name=event_name)
+            responses.append(json.loads(
+                self.router.process_request(request).decode('utf-8')
+            ))
+        self.assertEqual(calls, ['first'])
+        self.assertEqual(self.router.response_cache.hits, 1)
+        self.assertEqual(responses[1], {
+            'data': [{'id': 1}], 'version': responses[0]['version'],
+            'event_name': 'second'
+        })
+
+        request = Request(method='GET', url='/api/users/',
+                          event_name='third',
+                          if_none_match=responses[0]['version'])
+        self.assertEqual(
+            json.loads(self.router.process_request(request).decode('utf-8')),
+            {'not_modified': True, 'version': responses[0]['version'],
+             'event_name': 'third'}
+        )
+        self.assertEqual(calls, ['first'])
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_subscription(self, log_info):
+        class UsersView(MethodBasedView):
+            cache_ttl = 60
+
+            def get(self, request, *args, **kwargs):
+                return [{'id': 1}]
+
+        connection = unittest.mock.Mock()
+        self.router.response_cache = ResponseCache()
+        self.router.subscriptions = SubscriptionManager()
+        self.router.register('/api/users/', UsersView, 'GET')
+        request = Request(method='GET', url='/api/users/', subscribe=True,
+                          event_name='users')
+        request.connection = connection
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        self.assertEqual(response['data'], [{'id': 1}])
+        self.assertEqual(response['subscription'], {'version': 1})
+        self.assertEqual(len(self.router.response_cache), 0)
+        self.assertEqual(
+            self.router.subscriptions.publish('/api/users', [{'id': 2}]), 2
+        )
+        self.assertEqual(connection.send_response.call_count, 1)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_subscription_and_if_none_match(
+            self, log_info):
+        class UsersView(MethodBasedView):
+            conditional = True
+
+            def get(self, request, *args, **kwargs):
+                return [{'id': 1}]
+
+            def get_version(self, request, *args, **kwargs):
+                return request.get_argument('version')
+
+        self.router.subscriptions = SubscriptionManager()
+        self.router.register('/api/users/', UsersView, 'GET')
+        for args in ({'version': 'v1'}, {}):
+            request = Request(method='GET', url='/api/users/', args=args,
+                              subscribe=True, event_name='users')
+            request.connection = unittest.mock.Mock()
+            version = json.loads(
+                self.router.process_request(request).decode('utf-8')
+            )['version']
+
+            request = Request(method='GET', url='/api/users/', args=args,
+                              subscribe=True, event_name='users',
+                              if_none_match=version)
+            request.connection = unittest.mock.Mock()
+            response = json.loads(
+                self.router.process_request(request).decode('utf-8')
+            )
+            self.assertNotIn('not_modified', response)
+            self.assertEqual(response['data'], [{'id': 1}])
+            self.assertEqual(response['subscription'], {'version': 1})
+
+        self.assertEqual(len(self.router.subscriptions.topics), 2)
+        self.assertEqual(len(self.router.subscriptions.connections), 4)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_subscription_per_user(self, log_info):
+        class ProfileView(MethodBasedView):
+
+            def get(self, request, *args, **kwargs):
+                return {'name': request.token}
+
+        self.router.subscriptions = SubscriptionManager()
+        self.router.register('/api/profile/', ProfileView, 'GET')
+        connections = []
+        for token in ('first', 'second'):
+            request = Request(method='GET', url='/api/profile/',
+                              subscribe=True, token=token)
+            request.connection = unittest.mock.Mock()
+            connections.append(request.connection)
+            self.router.process_request(request)
+        self.assertEqual(len(self.router.subscriptions.topics), 2)
+        for connection in connections:
+            connection.send_response.assert_not_called()
+
+        self.router.subscriptions.publish(
+            '/api/profile/', {'name': 'renamed'}, scope='first'
+        )
+        self.assertEqual(connections[0].send_response.call_count, 1)
+        connections[1].send_response.assert_not_called()
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_subscription_without_connection(
+            self, log_info):
+        self.router.subscriptions = SubscriptionManager()
+        self.router.register('/api/users/', FakeGetView, 'GET')
+        request = Request(method='GET', url='/api/users/', subscribe=True)
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        self.assertNotIn('subscription', response)
+        self.assertEqual(self.router.subscriptions.topics, {})
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_response_cache_by_user(self, log_info):
+        class ProfileView(MethodBasedView):
+            cache_ttl = 60
+
+            def get(self, request, *args, **kwargs):
+                return request.token
+
+        self.router.response_cache = ResponseCache()
+        self.router.register('/api/profile/', ProfileView, 'GET')
+        for token in ('first', 'second', 'first'):
+            request = Request(method='GET', url='/api/profile/', token=token)
+            response = self.router.process_request(request).decode('utf-8')
+            self.assertEqual(json.loads(response)['data'], token)
+        self.assertEqual(self.router.response_cache.hits, 1)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_shared_response_cache(self, log_info):
+        class CountriesView(MethodBasedView):
+            cache_ttl = 60
+            cache_shared = True
+
+            def get(self, request, *args, **kwargs):
+                return request.token
+
+        self.router.response_cache = ResponseCache()
+        self.router.register('/api/countries/', CountriesView, 'GET')
+        for token in ('first', 'second'):
+            request = Request(method='GET', url='/api/countries/', token=token)
+            response = self.router.process_request(request).decode('utf-8')
+            self.assertEqual(json.loads(response)['data'], 'first')
+        self.assertEqual(self.router.response_cache.hits, 1)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.exception')
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_response_cache_and_invalidation(
+            self, log_info, log_exception):
+        class UsersView(MethodBasedView):
+            cache_ttl = 60
+            cache_tags = ('users', )
+            cache_invalidates = ('users', )
+
+            def get(self, request, *args, **kwargs):
+                return 'users'
+
+            def post(self, request, *args, **kwargs):
+                if request.data is None:
+                    raise NotSpecifiedURL()
+                return 'created'
+
+        cache = ResponseCache()
+        self.router.response_cache = cache
+        self.router.register('/api/users/', UsersView, ['GET', 'POST'])
+        self.router.process_request(Request(method='GET', url='/api/users/'))
+        self.assertEqual(len(cache), 1)
+
+        # Failed requests don't invalidate the cache
+        self.router.process_request(Request(method='POST', url='/api/users/'))
+        self.assertEqual(len(cache), 1)
+
+        self.router.process_request(
+            Request(method='POST', url='/api/users/', data={'name': 'user'})
+        )
+        self.assertEqual(len(cache), 0)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_response_cache_of_coroutine(self, log_info):
+        class AsyncView(MethodBasedView):
+            cache_ttl = 60
+
+            @asyncio.coroutine
+            def get(self, request, *args, **kwargs):
+                yield from asyncio.sleep(0)
+                return 'async'
+
+        cache = ResponseCache()
+        self.router.response_cache = cache
+        self.router.register('/api/get/', AsyncView, 'GET')
+        request = Request(**{'method': 'GET', 'url': '/api/get/'})
+        loop = asyncio.new_event_loop()
+        response = loop.run_until_complete(
+            self.router.process_request(request)
+        )
+        loop.close()
+        self.assertEqual(self.router.process_request(request), response)
+        self.assertEqual(cache.hits, 1)
+
+    def _make_singleflight_view(self, calls, **attrs):
+        class ReportView(MethodBasedView):
+            singleflight = True
+
+            @asyncio.coroutine
+            def get(self, request, *args, **kwargs):
+                calls.append(request.args)
+                count = len(calls)
+                yield from asyncio.sleep(0.01)
+                return count
+
+        for name, value in attrs.items():
+            setattr(ReportView, name, value)
+        return ReportView
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_singleflight_of_other_events(
+            self, log_info):
+        calls = []
+        view = self._make_singleflight_view(calls)
+        self.router.register('/api/report/', view, 'GET')
+        requests = [
+            Request(method='GET', url='/api/report/', event_name=event_name)
+            for event_name in ('first', 'second')
+        ]
+
+        @asyncio.coroutine
+        def run():
+            return (yield from asyncio.gather(*[
+                self.router.process_request(request) for request in requests
+            ]))
+
+        loop = asyncio.new_event_loop()
+        responses = loop.run_until_complete(run())
+        loop.close()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            [json.loads(response.decode('utf-8')) for response in responses],
+            [{'data': 1, 'event_name': 'first'},
+             {'data': 1, 'event_name': 'second'}]
+        )
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_singleflight(self, log_info):
+        calls = []
+        view = self._make_singleflight_view(calls)
+        self.router.register('/api/report/', view, 'GET')
+
+        requests = [
+            Request(method='GET', url='/api/report/', args={'year': 2016}),
+            Request(method='GET', url='/api/report/', args={'year': 2016}),
+            Request(method='GET', url='/api/report/', args={'year': 2017}),
+        ]
+
+        @asyncio.coroutine
+        def run():
+            return (yield from asyncio.gather(*[
+                self.router.process_request(request) for request in requests
+            ]))
+
+        loop = asyncio.new_event_loop()
+        responses = loop.run_until_complete(run())
+        loop.close()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(responses[0], responses[1])
+        self.assertNotEqual(responses[0], responses[2])
+        self.assertEqual(self.router._flights, {})
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_singleflight_key(self, log_info):
+        calls = []
+        view = self._make_singleflight_view(
+            calls, get_singleflight_key=lambda self, request: 'report'
+        )
+        self.router.register('/api/report/', view, 'GET')
+        requests = [
+            Request(method='GET', url='/api/report/', args={'year': year})
+            for year in (2016, 2017)
+        ]
+
+        @asyncio.coroutine
+        def run():
+            return (yield from asyncio.gather(*[
+                self.router.process_request(request) for request in requests
+            ]))
+
+        loop = asyncio.new_event_loop()
+        responses = loop.run_until_complete(run())
+        loop.close()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(responses[0], responses[1])
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_cancelled_singleflight(self, log_info):
+        calls = []
+        view = self._make_singleflight_view(calls)
+        self.router.register('/api/report/', view, 'GET')
+
+        @asyncio.coroutine
+        def run():
+            leader = asyncio.ensure_future(self.router.process_request(
+                Request(method='GET', url='/api/report/')
+            ))
+            yield from asyncio.sleep(0)
+            follower = asyncio.ensure_future(self.router.process_request(
+                Request(method='GET', url='/api/report/')
+            ))
+            yield from asyncio.sleep(0)
+            leader.cancel()
+            return (yield from follower)
+
+        loop = asyncio.new_event_loop()
+        response = loop.run_until_complete(run())
+        loop.close()
+        self.assertEqual(json.loads(response.decode('utf-8'))['data'], 1)
+        self.assertEqual(len(calls), 1)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_cancelled_last_singleflight_waiter(
+            self, log_info):
+        calls = []
+        view = self._make_singleflight_view(calls)
+        self.router.register('/api/report/', view, 'GET')
+
+        @asyncio.coroutine
+        def run():
+            request = asyncio.ensure_future(self.router.process_request(
+                Request(method='GET', url='/api/report/')
+            ))
+            yield from asyncio.sleep(0)
+            flight = list(self.router._flights.values())[0]
+            request.cancel()
+            yield from asyncio.sleep(0)
+            return flight
+
+        loop = asyncio.new_event_loop()
+        flight = loop.run_until_complete(run())
+        loop.close()
+        self.assertTrue(flight.future.cancelled())
+        self.assertEqual(flight.waiters, 0)
+        self.assertEqual(self.router._flights, {})
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_version(self, log_info):
+        calls = []
+
+        class ArticleView(MethodBasedView):
+            def get_version(self, request, *args, **kwargs):
+                return 42
+
+            def get(self, request, *args, **kwargs):
+                calls.append(request)
+                return 'article'
+
+        self.router.register('/api/article/', ArticleView, 'GET')
+        request = Request(method='GET', url='/api/article/', event_name='a')
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        self.assertEqual(response['data'], 'article')
+        self.assertEqual(response['version'], '42')
+
+        request = Request(method='GET', url='/api/article/', event_name='a',
+                          if_none_match='42')
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        self.assertEqual(response, {
+            'not_modified': True, 'version': '42', 'event_name': 'a'
+        })
+        self.assertEqual(len(calls), 1)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_content_version(self, log_info):
+        class ArticleView(MethodBasedView):
+            conditional = True
+
+            def get(self, request, *args, **kwargs):
+                return {'title': 'article'}
+
+        self.router.register('/api/article/', ArticleView, 'GET')
+        request = Request(method='GET', url='/api/article/')
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        version = response['version']
+        self.assertEqual(len(version), 40)
+        self.assertNotEqual(version, VERSION_PLACEHOLDER)
+        self.assertEqual(response['data'], {'title': 'article'})
+
+        request = Request(method='GET', url='/api/article/',
+                          if_none_match=version)
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        self.assertTrue(response['not_modified'])
+        self.assertNotIn('data', response)
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_content_version_of_other_event(
+            self, log_info):
+        class ArticleView(MethodBasedView):
+            conditional = True
+
+            def get(self, request, *args, **kwargs):
+                return {'title': 'article'}
+
+        self.router.register('/api/article/', ArticleView, 'GET')
+        request = Request(method='GET', url='/api/article/',
+                          event_name='first')
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        self.assertEqual(
+            response['version'],
+            self.router.get_content_version(
+                JSONRenderer().render({'title': 'article'})
+            )
+        )
+
+        request = Request(method='GET', url='/api/article/',
+                          event_name='second',
+                          if_none_match=response['version'])
+        response = json.loads(
+            self.router.process_request(request).decode('utf-8')
+        )
+        self.assertEqual(response, {
+            'not_modified': True, 'version': response['version'],
+            'event_name': 'second'
+        })
+
+    @unittest.mock.patch('aiorest_ws.log.logger.info')
+    def test_process_request_with_content_version_of_coroutine(
+            self, log_info):
+        class AsyncView(MethodBasedView):
+            conditional = True
+
+            @asyncio.coroutine
+            def get(self, request, *args, **kwargs):
+                yield from asyncio.sleep(0)
+                return 'async'
+
+        self.router.register('/api/get/', AsyncView, 'GET')
+        loop = asyncio.new_event_loop()
+        request = Request(method='GET', url='/api/get/')
+        response = loop.run_until_complete(
+            self.router.process_request(request)
+        )
+        version = json.loads(response.decode('utf-8'))['version']
+        request = Request(method='GET', url='/api/get/',
+                          if_none_match=version)
+        response = loop.run_until_complete(
+            self.router.process_request(request)
+        )
+        loop.close()
+        self.assertEqual(json.loads(response.decode('utf-8')), {
+            'not_modified': True, 'version': version, 'event_name': None
+        })
+
+    def test_get_flight_key_with_if_none_match(self):
+        handler = FakeGetView()
+        renderer = JSONRenderer()
+        request = Request(method='GET', url='/api/')
+        conditional = Request(method='GET', url='/api/', if_none_match='v1')
+        self.assertNotEqual(
+            self.router.get_flight_key(request, handler, renderer),
+            self.router.get_flight_key(conditional, handler, renderer)
+        )
+
     def test_register_url(self):
         endpoint = FakeEndpoint('/api/', None, 'GET', 'good')
         self.router._register_url(endpoint)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from aiorest_ws.admission import PRIORITY_LOW, PRIORITY_NORMAL, \
+    PRIORITY_HIGH
+from aiorest_ws.scheduler import DEFAULT_CONCURRENCY, QueueWaitStats, \
+    RequestScheduler
+from aiorest_ws.wrappers import Request
+
+
+class QueueWaitStatsTestCase(unittest.TestCase):
+
+    def test_observe(self):
+        stats = QueueWaitStats(buckets=(0.01, 0.1))
+        stats.observe(PRIORITY_LOW, 0.005)
+        stats.observe(PRIORITY_LOW, 0.5)
+        stats.observe(PRIORITY_HIGH, 0.05)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot[PRIORITY_LOW]['requests'], 2)
+        self.assertEqual(snapshot[PRIORITY_LOW]['max_time'], 0.5)
+        self.assertEqual(
+            snapshot[PRIORITY_LOW]['histogram'],
+            {'0.01': 1, '0.1': 0, '+inf': 1}
+        )
+        self.assertEqual(
+            snapshot[PRIORITY_HIGH]['histogram'],
+            {'0.01': 0, '0.1': 1, '+inf': 0}
+        )
+
+    def test_reset(self):
+        stats = QueueWaitStats()
+        stats.observe(PRIORITY_NORMAL, 0.1)
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {})
+
+
+class RequestSchedulerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(RequestSchedulerTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.scheduler = RequestScheduler(concurrency=1, loop=self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        super(RequestSchedulerTestCase, self).tearDown()
+
+    def run_requests(self, requests):
+        """
+        Run requests (tuples of tenant and priority) through the busy
+        scheduler and return them in the order of processing.
+        """
+        order = []
+
+        @asyncio.coroutine
+        def process(tenant, priority):
+            request = Request(token=tenant)
+            yield from self.scheduler.acquire(request, priority)
+            order.append((tenant, priority))
+            self.scheduler.release()
+
+        @asyncio.coroutine
+        def run():
+            # Occupy the worker, so that all requests are queued
+            yield from self.scheduler.acquire(Request(), PRIORITY_HIGH)
+            tasks = [
+                asyncio.ensure_future(process(*item), loop=self.loop)
+                for item in requests
+            ]
+            yield from asyncio.sleep(0, loop=self.loop)
+            self.scheduler.release()
+            yield from asyncio.gather(*tasks, loop=self.loop)
+
+        self.loop.run_until_complete(run())
+        return order
+
+    def test_acquire_without_waiting(self):
+        self.loop.run_until_complete(self.scheduler.acquire(Request()))
+        self.assertEqual(self.scheduler.active, 1)
+        self.assertEqual(self.scheduler.pending, 0)
+        self.scheduler.release()
+        self.assertEqual(self.scheduler.active, 0)
+
+    def test_default_concurrency(self):
+        scheduler = RequestScheduler()
+        self.assertEqual(scheduler.concurrency, DEFAULT_CONCURRENCY)
+        self.assertGreater(scheduler.concurrency, 1)
+
+    def test_get_tenant(self):
+        self.assertEqual(self.scheduler.get_tenant(Request(token='a')), 'a')
+        self.assertIsNone(self.scheduler.get_tenant(Request()))
+
+    def test_custom_tenant_key(self):
+        scheduler = RequestScheduler(tenant_key=lambda request: request.url)
+        self.assertEqual(scheduler.get_tenant(Request(url='/api/')), '/api/')
+
+    def test_fairness_between_tenants(self):
+        requests = [('spammer', PRIORITY_LOW)] * 3 + [('user', PRIORITY_LOW)]
+        order = self.run_requests(requests)
+        self.assertEqual(order[:2], [
+            ('spammer', PRIORITY_LOW), ('user', PRIORITY_LOW)
+        ])
+
+    def test_weighted_priorities(self):
+        requests = [('a', PRIORITY_LOW)] * 2 + [('a', PRIORITY_HIGH)] * 40
+        order = self.run_requests(requests)
+        positions = [
+            index for index, item in enumerate(order)
+            if item[1] == PRIORITY_LOW
+        ]
+        # Low priority requests are delayed, but don't starve
+        self.assertEqual(len(order), 42)
+        self.assertGreater(positions[0], 0)
+        self.assertLess(positions[0], 17)
+        self.assertLess(positions[1], 34)
+
+    def test_wait_time_stats(self):
+        self.run_requests([('a', PRIORITY_LOW), ('b', PRIORITY_NORMAL)])
+        snapshot = self.scheduler.snapshot()
+        self.assertEqual(snapshot['active'], 0)
+        self.assertEqual(snapshot['pending'], 0)
+        self.assertEqual(snapshot['wait_time'][PRIORITY_LOW]['requests'], 1)
+        self.assertEqual(
+            snapshot['wait_time'][PRIORITY_NORMAL]['requests'], 1
+        )
+
+    def test_cancel_waiting_request(self):
+        @asyncio.coroutine
+        def run():
+            yield from self.scheduler.acquire(Request())
+            task = asyncio.ensure_future(
+                self.scheduler.acquire(Request()), loop=self.loop
+            )
+            yield from asyncio.sleep(0, loop=self.loop)
+            task.cancel()
+            yield from asyncio.sleep(0, loop=self.loop)
+            self.scheduler.release()
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.scheduler.active, 0)
+        self.assertEqual(self.scheduler.pending, 0)
+
+    def test_cancel_after_wakeup(self):
+        @asyncio.coroutine
+        def run():
+            yield from self.scheduler.acquire(Request())
+            task = asyncio.ensure_future(
+                self.scheduler.acquire(Request()), loop=self.loop
+            )
+            yield from asyncio.sleep(0, loop=self.loop)
+            self.scheduler.release()
+            task.cancel()
+            yield from asyncio.sleep(0, loop=self.loop)
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.scheduler.active, 0)
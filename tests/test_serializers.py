@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
+import datetime
+import decimal
 import unittest
+import uuid
 
 from aiorest_ws.exceptions import SerializerError
 from aiorest_ws.renderers import BaseRenderer, JSONRenderer, \
     XMLRenderer
+from aiorest_ws.utils.encoders import TypeEncoders
 
 
 class BaseSerializerTestCase(unittest.TestCase):
@@ -15,6 +19,12 @@ class BaseSerializerTestCase(unittest.TestCase):
     def test_serialize(self):
         self.assertIsNone(self.bs.render({}))
 
+    def test_render_chunks(self):
+        self.assertEqual(list(self.bs.render_chunks({})), [None])
+
+    def test_render_envelope(self):
+        self.assertIsNone(self.bs.render_envelope({'data': 1}, 'data', b'1'))
+
 
 class JSONSerializerTestCase(unittest.TestCase):
 
@@ -57,6 +67,41 @@ class JSONSerializerTestCase(unittest.TestCase):
         output = self.json.render(data)
         self.assertEqual(output, b'["\\u2028", "\\u2029"]')
 
+    def test_native_types(self):
+        data = {
+            'datetime': datetime.datetime(2016, 6, 1, 12, 30),
+            'decimal': decimal.Decimal('3.14'),
+            'uuid': uuid.UUID('12345678123456781234567812345678'),
+            'bytes': b'value'
+        }
+        output = self.json.render(data)
+        self.assertIn(b'"datetime":"2016-06-01T12:30:00"', output)
+        self.assertIn(b'"decimal":"3.14"', output)
+        self.assertIn(b'"uuid":"12345678-1234-5678-1234-567812345678"', output)
+        self.assertIn(b'"bytes":"value"', output)
+
+    def test_custom_encoders(self):
+        self.json.encoders = TypeEncoders(())
+        self.assertRaises(
+            SerializerError, self.json.render, [decimal.Decimal('3.14')]
+        )
+
+        self.json.encoders.register(decimal.Decimal, float)
+        output = self.json.render([decimal.Decimal('3.14')])
+        self.assertEqual(output, b'[3.14]')
+
+    def test_render_envelope(self):
+        self.json.compact = False
+        data = {'objects': [1, 2, 3], 'name': u"王"}
+        content = {'data': data, 'version': '1'}
+        self.assertEqual(
+            self.json.render_envelope(
+                content, 'data', self.json.render(data)
+            ),
+            self.json.render(content)
+        )
+        self.assertEqual(content['data'], data)
+
 
 class XMLSerializerTestCase(unittest.TestCase):
 
@@ -74,3 +119,34 @@ class XMLSerializerTestCase(unittest.TestCase):
                    '</list-item><list-item>3</list-item>' \
                    '</objects>'.encode('utf-8')
         self.assertIn(bytes(expected), output)
+
+    def test_native_types(self):
+        data = {'date': datetime.date(2016, 6, 1)}
+        output = self.xml.render(data)
+        self.assertIn(b'<date>2016-06-01</date>', output)
+
+    def test_render_chunks(self):
+        data = {'objects': list(range(100))}
+        output = b''.join(self.xml.render_chunks(data))
+        self.assertEqual(output, self.xml.render(data))
+
+    def test_render_chunks_invalid_data(self):
+        with self.assertRaises(SerializerError):
+            list(self.xml.render_chunks({None: 'test'}))
+
+    def test_render_envelope(self):
+        for data in ({'objects': [1, 2], 'name': 'a<b'}, [1], None, 'text'):
+            content = {'data': data, 'version': '1', 'event_name': 'e'}
+            self.assertEqual(
+                self.xml.render_envelope(
+                    content, 'data', self.xml.render(data)
+                ),
+                self.xml.render(content)
+            )
+
+    def test_render_envelope_with_foreign_document(self):
+        content = {'data': [1], 'event_name': 'e'}
+        self.assertEqual(
+            self.xml.render_envelope(content, 'data', b'<other/>'),
+            self.xml.render(content)
+        )
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from unittest import mock
+
+from aiorest_ws.renderers import JSONRenderer
+from aiorest_ws.subscriptions import merge_patch, apply_merge_patch, \
+    SubscriptionManager
+from aiorest_ws.wrappers import Request
+
+
+class MergePatchTestCase(unittest.TestCase):
+
+    def test_equal_documents(self):
+        self.assertIsNone(merge_patch({'a': 1}, {'a': 1}))
+        self.assertIsNone(merge_patch([1, 2], [1, 2]))
+
+    def test_changed_members(self):
+        source = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': [1]}
+        target = {'a': 1, 'b': {'c': 4}, 'e': [1, 2], 'f': 'new'}
+        patch = merge_patch(source, target)
+        self.assertEqual(
+            patch, {'b': {'c': 4, 'd': None}, 'e': [1, 2], 'f': 'new'}
+        )
+        self.assertEqual(apply_merge_patch(source, patch), target)
+        self.assertEqual(source['b'], {'c': 2, 'd': 3})
+
+    def test_replaced_document(self):
+        self.assertEqual(merge_patch([1], [2]), [2])
+        self.assertEqual(merge_patch({'a': 1}, [2]), [2])
+        self.assertEqual(apply_merge_patch({'a': 1}, [2]), [2])
+
+    def test_null_members(self):
+        with self.assertRaises(ValueError):
+            merge_patch({'a': 1}, {'a': None})
+        with self.assertRaises(ValueError):
+            merge_patch({'a': 1}, {'a': {'b': None}})
+        with self.assertRaises(ValueError):
+            merge_patch({'a': 1}, None)
+
+
+class SubscriptionManagerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(SubscriptionManagerTestCase, self).setUp()
+        self.manager = SubscriptionManager(snapshot_interval=3)
+
+    def subscribe(self, url='/api/users/', event_name='users', data=None,
+                  scope=None, **args):
+        connection = mock.Mock()
+        request = Request(method='GET', url=url, event_name=event_name,
+                          args=args)
+        request.connection = connection
+        version = self.manager.subscribe(
+            request, JSONRenderer(), data if data is not None else {'a': 1},
+            scope
+        )
+        return connection, version
+
+    def get_messages(self, connection):
+        return [
+            json.loads(call[0][0].decode('utf-8'))
+            for call in connection.send_response.call_args_list
+        ]
+
+    def test_get_topic_key(self):
+        self.assertEqual(
+            self.manager.get_topic_key('/api/users', {'format': 'json'}),
+            self.manager.get_topic_key('/api/users/')
+        )
+        self.assertNotEqual(
+            self.manager.get_topic_key('/api/users/', {'page': 1}),
+            self.manager.get_topic_key('/api/users/', {'page': 2})
+        )
+        self.assertNotEqual(
+            self.manager.get_topic_key('/api/users/', scope=1),
+            self.manager.get_topic_key('/api/users/', scope=2)
+        )
+
+    def test_subscribe(self):
+        connection, version = self.subscribe()
+        self.assertEqual(version, 1)
+        self.assertEqual(self.manager.snapshot()['subscriptions'], 1)
+        other, version = self.subscribe(data={'a': 1})
+        self.assertEqual(version, 1)
+        self.assertEqual(self.manager.snapshot()['topics'], 1)
+        connection.send_response.assert_not_called()
+
+    def test_subscribe_with_changed_data(self):
+        connection, _ = self.subscribe()
+        other, version = self.subscribe(data={'a': 2})
+        self.assertEqual(version, 1)
+        connection.send_response.assert_not_called()
+        other.send_response.assert_not_called()
+
+        self.manager.publish('/api/users/', {'a': 3})
+        self.assertEqual(
+            self.get_messages(connection),
+            [{'patch': {'a': 3}, 'version': 2, 'event_name': 'users'}]
+        )
+        self.assertEqual(
+            self.get_messages(other),
+            [{'data': {'a': 3}, 'snapshot': True, 'version': 2,
+              'event_name': 'users'}]
+        )
+        self.manager.publish('/api/users/', {'a': 4})
+        self.assertEqual(self.get_messages(other)[1]['patch'], {'a': 4})
+
+    def test_subscribe_with_changed_data_and_unchanged_publish(self):
+        connection, _ = self.subscribe()
+        other, _ = self.subscribe(data={'a': 2})
+        self.manager.publish('/api/users/', {'a': 1})
+        connection.send_response.assert_not_called()
+        self.assertEqual(
+            self.get_messages(other),
+            [{'data': {'a': 1}, 'snapshot': True, 'version': 1,
+              'event_name': 'users'}]
+        )
+
+    def test_subscribe_with_scope(self):
+        first, _ = self.subscribe(scope=1)
+        second, _ = self.subscribe(data={'a': 2}, scope=2)
+        self.assertEqual(len(self.manager.topics), 2)
+        self.assertIsNone(self.manager.publish('/api/users/', {'a': 3}))
+        self.assertEqual(
+            self.manager.publish('/api/users/', {'a': 3}, scope=1), 2
+        )
+        self.assertEqual(self.get_messages(first)[0]['patch'], {'a': 3})
+        second.send_response.assert_not_called()
+
+    def test_publish_without_subscribers(self):
+        self.assertIsNone(self.manager.publish('/api/users/', {'a': 2}))
+
+    def test_publish_patches_and_snapshots(self):
+        connection, _ = self.subscribe()
+        for value in range(2, 6):
+            self.manager.publish('/api/users/', {'a': value})
+        self.manager.publish('/api/users/', {'a': 5})
+        self.manager.publish('/api/users/', {'a': None})
+        messages = self.get_messages(connection)
+        self.assertEqual(
+            [message['version'] for message in messages], [2, 3, 4, 5, 6]
+        )
+        self.assertEqual(messages[0]['patch'], {'a': 2})
+        self.assertEqual(
+            messages[2], {'data': {'a': 4}, 'snapshot': True, 'version': 4,
+                          'event_name': 'users'}
+        )
+        self.assertEqual(messages[4]['data'], {'a': None})
+        self.assertEqual(self.manager.snapshot()['patches'], 3)
+        self.assertEqual(self.manager.snapshot()['snapshots'], 2)
+
+    def test_publish_renders_once_per_group(self):
+        first, _ = self.subscribe()
+        second, _ = self.subscribe()
+        third, _ = self.subscribe(event_name='other')
+        self.manager.publish('/api/users/', {'a': 2})
+        self.assertIs(
+            first.send_response.call_args[0][0],
+            second.send_response.call_args[0][0]
+        )
+        self.assertEqual(self.get_messages(third)[0]['event_name'], 'other')
+
+    def test_unsubscribe(self):
+        connection, _ = self.subscribe()
+        self.subscribe(url='/api/groups/')
+        self.manager.unsubscribe(connection)
+        self.assertEqual(self.manager.topics.keys(), {
+            self.manager.get_topic_key('/api/groups/')
+        })
+        self.assertNotIn(connection, self.manager.connections)
+        self.manager.unsubscribe(connection)
+
+    def test_unsubscribe_by_event_name(self):
+        connection, _ = self.subscribe()
+        request = Request(method='GET', url='/api/groups/',
+                          event_name='groups')
+        request.connection = connection
+        self.manager.subscribe(request, JSONRenderer(), {})
+        self.manager.unsubscribe(connection, 'users')
+        self.assertEqual(len(self.manager.topics), 1)
+        self.assertEqual(len(self.manager.connections[connection]), 1)
+        self.manager.publish('/api/groups/', {'b': 1})
+        self.assertEqual(connection.send_response.call_count, 1)
@@ -3,8 +3,10 @@ import unittest
 
 from fixtures.fakes import FakeGetView
 
+from aiorest_ws.auth.user.models import User
 from aiorest_ws.exceptions import NotSpecifiedHandler, \
-    NotSpecifiedMethodName, IncorrectMethodNameType, InvalidRenderer
+    NotSpecifiedMethodName, IncorrectArgument, IncorrectMethodNameType, \
+    InvalidRenderer
 from aiorest_ws.renderers import JSONRenderer
 from aiorest_ws.views import View
 from aiorest_ws.wrappers import Request
@@ -73,3 +75,40 @@ class MethodBaseViewTestCase(unittest.TestCase):
         format = None
         self.view.renderers = 'JSONSerializer'
         self.assertRaises(InvalidRenderer, self.view.get_renderer, format)
+
+    def test_get_response_layout(self):
+        request = Request(**{'method': 'GET'})
+        self.assertIsNone(self.view.get_response_layout(request))
+
+    def test_get_response_layout_from_view(self):
+        request = Request(**{'method': 'GET'})
+        self.view.response_layout = 'table'
+        self.assertEqual(self.view.get_response_layout(request), 'table')
+
+    def test_get_response_layout_from_request(self):
+        request = Request(**{'method': 'GET', 'args': {'layout': 'columns'}})
+        self.view.response_layout = 'table'
+        self.assertEqual(self.view.get_response_layout(request), 'columns')
+
+    def test_get_response_layout_failed(self):
+        request = Request(**{'method': 'GET', 'args': {'layout': 'unknown'}})
+        self.assertRaises(
+            IncorrectArgument, self.view.get_response_layout, request
+        )
+
+    def test_get_cache_scope(self):
+        request = Request(**{'method': 'GET', 'token': 'secret'})
+        self.assertEqual(self.view.get_cache_scope(request), 'secret')
+
+    def test_get_cache_scope_by_user(self):
+        user = User(id=7)
+        request = Request(**{'method': 'GET', 'token': 'secret', 'user': user})
+        self.assertEqual(self.view.get_cache_scope(request), 7)
+
+    def test_get_singleflight_key(self):
+        request = Request(**{'method': 'GET'})
+        self.assertIsNone(self.view.get_singleflight_key(request))
+
+    def test_get_version(self):
+        request = Request(**{'method': 'GET'})
+        self.assertIsNone(self.view.get_version(request))
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from aiorest_ws.exceptions import BaseAPIException
+from aiorest_ws.exceptions import BaseAPIException, Overloaded
 from aiorest_ws.wrappers import Request, Response
 
 
@@ -11,6 +11,14 @@ class RequestTestCase(unittest.TestCase):
         options = {'token': 'base64token'}
         request = Request(**options)
         self.assertEqual(request.token, 'base64token')
+        self.assertEqual(request.__dict__, {'_token': 'base64token'})
+
+    def test_init_stores_attributes_in_slots(self):
+        request = Request(method='get', url='/user/')
+        self.assertEqual(request.__dict__, {})
+        request.connection = connection = object()
+        self.assertIs(request.connection, connection)
+        self.assertEqual(request.__dict__, {})
 
     def test_method_property(self):
         options = {}
@@ -98,6 +106,36 @@ class RequestTestCase(unittest.TestCase):
             request.to_representation(), {'event_name': options['event_name']}
         )
 
+    def test_deadline_property(self):
+        self.assertIsNone(Request().deadline)
+        self.assertEqual(Request(deadline=1.5).deadline, 1.5)
+
+    def test_cancel_property(self):
+        self.assertIsNone(Request().cancel)
+        self.assertEqual(Request(cancel='event').cancel, 'event')
+
+    def test_if_none_match_property(self):
+        self.assertIsNone(Request().if_none_match)
+        self.assertEqual(Request(if_none_match='v1').if_none_match, 'v1')
+
+    def test_subscribe_properties(self):
+        request = Request(subscribe=True, unsubscribe='users')
+        self.assertTrue(request.subscribe)
+        self.assertEqual(request.unsubscribe, 'users')
+        self.assertFalse(Request().subscribe)
+        self.assertIsNone(Request().unsubscribe)
+
+    def test_connection_is_not_set_by_client(self):
+        request = Request(connection='fake', is_binary=True)
+        self.assertIsNone(request.connection)
+        self.assertFalse(request.is_binary)
+
+    def test_set_cancelled(self):
+        request = Request()
+        self.assertFalse(request.is_cancelled)
+        request.set_cancelled()
+        self.assertTrue(request.is_cancelled)
+
     def test_get_argument(self):
         options = {'args': {'param': 'test'}}
         request = Request(**options)
@@ -119,6 +157,7 @@ class ResponseTestCase(unittest.TestCase):
     def test_init(self):
         response = Response()
         self.assertEqual(response._content, {})
+        self.assertFalse(hasattr(response, '__dict__'))
 
     def test_content_getter_with_empty_dictionary(self):
         response = Response()
@@ -154,6 +193,36 @@ class ResponseTestCase(unittest.TestCase):
         response.wrap_exception(exception)
         self.assertIn('detail', response._content)
         self.assertEqual(response._content['detail'], exception.detail)
+        self.assertNotIn('retry_after', response._content)
+
+    def test_version(self):
+        response = Response()
+        self.assertIsNone(response.version)
+        response.content = 'data'
+        response.version = 'v1'
+        self.assertEqual(response.content, {'data': 'data', 'version': 'v1'})
+
+    def test_set_not_modified(self):
+        response = Response()
+        response.content = 'data'
+        response.set_not_modified('v1')
+        self.assertEqual(
+            response.content, {'not_modified': True, 'version': 'v1'}
+        )
+
+    def test_set_subscription(self):
+        response = Response()
+        response.content = 'data'
+        response.set_subscription(3)
+        self.assertEqual(
+            response.content, {'data': 'data', 'subscription': {'version': 3}}
+        )
+
+    def test_wrap_exception_with_retry_after(self):
+        exception = Overloaded(retry_after=2)
+        response = Response()
+        response.wrap_exception(exception)
+        self.assertEqual(response._content['retry_after'], 2)
 
     def test_append_request(self):
         options = {'url': '/api', 'method': 'GET', 'event_name': 'test-event'}
@@ -36,6 +36,7 @@ class TestResolve(unittest.TestCase):
         self.assertIsNone(match.view_name)
         self.assertEqual(match.args, ())
         self.assertEqual(match.kwargs, {})
+        self.assertFalse(hasattr(match, '__dict__'))
 
     def test_resolve_with_static_path_and_specified_name(self):
         view_name = 'user-list'
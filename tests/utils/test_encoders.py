@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from aiorest_ws.conf import settings
+from aiorest_ws.utils.date.timezone import UTC
+from aiorest_ws.utils.encoders import TypeEncoders, encode_datetime, \
+    encode_date, encode_time, encode_timedelta, encode_decimal, \
+    encode_bytes, default_encoders
+
+
+class CustomType(object):
+    pass
+
+
+class DerivedCustomType(CustomType):
+    pass
+
+
+@pytest.mark.parametrize("value, expected", [
+    (datetime.datetime(2016, 6, 1, 12, 30), '2016-06-01T12:30:00'),
+    (datetime.datetime(2016, 6, 1, 12, 30, tzinfo=UTC()),
+     '2016-06-01T12:30:00Z'),
+])
+def test_encode_datetime(value, expected):
+    assert encode_datetime(value) == expected
+
+
+def test_encode_date():
+    assert encode_date(datetime.date(2016, 6, 1)) == '2016-06-01'
+
+
+def test_encode_time():
+    assert encode_time(datetime.time(12, 30)) == '12:30:00'
+
+
+def test_encode_time_with_timezone():
+    with pytest.raises(ValueError):
+        encode_time(datetime.time(12, 30, tzinfo=UTC()))
+
+
+def test_encode_timedelta():
+    assert encode_timedelta(datetime.timedelta(minutes=1)) == '60.0'
+
+
+def test_encode_decimal():
+    assert encode_decimal(decimal.Decimal('1.50')) == '1.50'
+
+
+def test_encode_decimal_as_float():
+    settings.COERCE_DECIMAL_TO_STRING = False
+    try:
+        assert encode_decimal(decimal.Decimal('1.50')) == 1.5
+    finally:
+        settings.COERCE_DECIMAL_TO_STRING = True
+
+
+@pytest.mark.parametrize("value", [b'value', bytearray(b'value')])
+def test_encode_bytes(value):
+    assert encode_bytes(value) == 'value'
+
+
+def test_default_encoders_call():
+    value = uuid.UUID('12345678123456781234567812345678')
+    assert default_encoders(value) == '12345678-1234-5678-1234-567812345678'
+    assert sorted(default_encoders({2, 1})) == [1, 2]
+
+
+def test_default_encoders_call_with_not_registered_type():
+    with pytest.raises(TypeError):
+        default_encoders(CustomType())
+
+
+def test_type_encoders_register():
+    encoders = TypeEncoders(())
+    encoders.register(CustomType, lambda obj: 'custom')
+    assert CustomType in encoders
+    assert encoders(CustomType()) == 'custom'
+
+
+def test_type_encoders_lookup_by_mro():
+    encoders = TypeEncoders(())
+    encoders.register(CustomType, lambda obj: 'custom')
+    assert encoders(DerivedCustomType()) == 'custom'
+
+
+def test_type_encoders_unregister():
+    encoders = TypeEncoders(())
+    encoders.register(CustomType, lambda obj: 'custom')
+    assert encoders(CustomType()) == 'custom'
+
+    encoders.unregister(CustomType)
+    assert CustomType not in encoders
+    assert encoders.get(CustomType, 'default') == 'default'
+
+
+def test_type_encoders_copy():
+    encoders = default_encoders.copy()
+    encoders.register(CustomType, lambda obj: 'custom')
+    assert CustomType in encoders
+    assert CustomType not in default_encoders
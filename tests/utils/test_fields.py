@@ -3,7 +3,8 @@ import pytest
 from collections import OrderedDict
 
 from aiorest_ws.utils.fields import is_simple_callable, method_overridden, \
-    get_attribute, set_value, to_choices_dict, flatten_choices_dict
+    call_attribute, get_attribute, set_value, to_choices_dict, \
+    flatten_choices_dict
 
 
 class FakeClass(object):
@@ -49,6 +50,20 @@ def test_method_overridden(method_name, cls, instance, expected):
     assert method_overridden(method_name, cls, instance) == expected
 
 
+@pytest.mark.parametrize("value, expected", [
+    ('value', 'value'),
+    (FakeClass.get_true, True),
+    (FakeClass.base_method, FakeClass.base_method),
+])
+def test_call_attribute(value, expected):
+    assert call_attribute(value, 'attr') == expected
+
+
+def test_call_attribute_failed():
+    with pytest.raises(ValueError):
+        call_attribute(FakeClass().key_error, 'key_error')
+
+
 @pytest.mark.parametrize("instance, attrs, expected", [
     (None, ['key', ], None),
     ('test', [], 'test'),
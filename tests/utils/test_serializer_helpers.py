@@ -80,6 +80,10 @@ class TestBoundField(unittest.TestCase):
     def test_proxy_class(self):
         self.assertEqual(self.instance._proxy_class, list.__class__)
 
+    def test_has_no_dict(self):
+        self.assertNotIn('__dict__', dir(self.instance))
+        self.assertEqual(NestedBoundField.__slots__, ())
+
     def test_repr(self):
         self.assertEqual(
             self.instance.__repr__(),
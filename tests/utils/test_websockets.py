@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
+import zlib
+
 import pytest
 
-from autobahn.websocket.compress import PerMessageDeflateOffer, \
-    PerMessageDeflateOfferAccept
+from autobahn.websocket.compress import PerMessageDeflate, \
+    PerMessageDeflateOffer, PerMessageDeflateOfferAccept
 
-from aiorest_ws.utils.websocket import deflate_offer_accept
+from aiorest_ws.utils.websocket import deflate_offer_accept, \
+    CompressionPolicy, CompressionStats, FlowControlStats, \
+    PolicyPerMessageDeflate
 
 
 @pytest.mark.parametrize("offers, expected", [
@@ -14,3 +18,109 @@ from aiorest_ws.utils.websocket import deflate_offer_accept
 ])
 def test_deflate_offer_accept(offers, expected):
     assert type(deflate_offer_accept(offers)) is expected
+
+
+def test_compression_stats_observe():
+    stats = CompressionStats()
+    stats.observe(100, 25, 0.00002)
+    stats.observe(100, 150, 1.0)
+    stats.skip(10)
+    snapshot = stats.snapshot()
+    assert snapshot['compressed'] == 2
+    assert snapshot['skipped'] == 1
+    assert snapshot['bytes_in'] == 200
+    assert snapshot['bytes_out'] == 175
+    assert snapshot['ratio_histogram']['0.3'] == 1
+    assert snapshot['ratio_histogram']['+inf'] == 1
+    assert snapshot['time_histogram']['5e-05'] == 1
+    assert snapshot['time_histogram']['+inf'] == 1
+
+
+def test_compression_stats_reset():
+    stats = CompressionStats()
+    stats.observe(100, 25, 0.001)
+    stats.reset()
+    assert stats.compressed == 0
+    assert stats.ratio == 1.0
+    assert sum(stats.ratio_counts) == 0
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'level': 10},
+    {'max_window_bits': 7},
+    {'max_window_bits': 16},
+])
+def test_compression_policy_invalid_arguments(kwargs):
+    with pytest.raises(AssertionError):
+        CompressionPolicy(**kwargs)
+
+
+def test_compression_policy_accept():
+    policy = CompressionPolicy(max_window_bits=10, no_context_takeover=True)
+    accept = policy([None, PerMessageDeflateOffer()])
+    assert isinstance(accept, PerMessageDeflateOfferAccept)
+    assert accept.windowBits == 10
+    assert accept.noContextTakeover is True
+    assert policy.accept([]) is None
+
+
+def test_compression_policy_accept_respects_client_limits():
+    policy = CompressionPolicy(max_window_bits=12)
+    offer = PerMessageDeflateOffer(
+        requestNoContextTakeover=True, requestMaxWindowBits=9
+    )
+    accept = policy.accept([offer, ])
+    assert accept.windowBits == 9
+    assert accept.noContextTakeover is True
+
+
+def test_compression_policy_should_compress():
+    policy = CompressionPolicy(min_size=10)
+    assert policy.should_compress(b'0123456789')
+    assert not policy.should_compress(b'012')
+    assert policy.stats.skipped == 1
+
+
+def test_compression_policy_configure():
+    policy = CompressionPolicy(level=1)
+    pmce = PerMessageDeflate(True, False, False, 10, 0, None)
+    configured = policy.configure(pmce)
+    assert isinstance(configured, PolicyPerMessageDeflate)
+    assert configured.level == 1
+    assert configured.server_max_window_bits == 10
+    assert configured.stats is policy.stats
+    assert policy.configure(None) is None
+
+
+@pytest.mark.parametrize("no_context_takeover", [False, True])
+def test_policy_per_message_deflate(no_context_takeover):
+    stats = CompressionStats()
+    pmce = PolicyPerMessageDeflate(
+        True, no_context_takeover, False, 0, 0, None, level=9, stats=stats
+    )
+    payload = b'{"data": "value"}' * 100
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    for _ in range(2):
+        pmce.startCompressMessage()
+        data = pmce.compressMessageData(payload)
+        data += pmce.endCompressMessage()
+        assert decompressor.decompress(data + b'\x00\x00\xff\xff') == payload
+        assert (pmce._compressor is None) == no_context_takeover
+
+    assert stats.compressed == 2
+    assert stats.bytes_in == 2 * len(payload)
+    assert stats.ratio < 0.1
+
+
+def test_flow_control_stats():
+    stats = FlowControlStats()
+    stats.pause(100)
+    stats.pause(50)
+    stats.dropped += 1
+    snapshot = stats.snapshot()
+    assert snapshot['paused'] == 2
+    assert snapshot['max_buffer_size'] == 100
+    assert snapshot['dropped'] == 1
+    stats.reset()
+    assert stats.snapshot()['paused'] == 0
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from io import StringIO
-from aiorest_ws.utils.xmlutils import SimpleXMLGenerator
+from io import BytesIO, StringIO
+from aiorest_ws.utils.encoders import default_encoders
+from aiorest_ws.utils.xmlutils import SimpleXMLGenerator, XMLStreamGenerator
 
 
 class SimpleXMLGeneratorTestCase(unittest.TestCase):
@@ -46,3 +47,73 @@ class SimpleXMLGeneratorTestCase(unittest.TestCase):
                       result)
         self.assertIn('<list-item></list-item>', result)
         self.assertIn('<list-item>test_string</list-item>', result)
+
+
+class XMLStreamGeneratorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(XMLStreamGeneratorTestCase, self).setUp()
+        self.generator = XMLStreamGenerator()
+
+    def render(self, data):
+        return b''.join(self.generator.iter_chunks(data)).decode('utf-8')
+
+    def test_iter_chunks(self):
+        data = [{'count': 1}, [1, 2, 3], None, 'test_string']
+        result = self.render(data)
+        self.assertIn('<list-item><count>1</count></list-item>', result)
+        self.assertIn('<list-item><list-item>1</list-item><list-item>'
+                      '2</list-item><list-item>3</list-item></list-item>',
+                      result)
+        self.assertIn('<list-item></list-item>', result)
+        self.assertIn('<list-item>test_string</list-item>', result)
+
+    def test_iter_chunks_document(self):
+        self.assertEqual(
+            self.render({'objects': [1, 2]}),
+            '<?xml version="1.0" encoding="utf-8"?>\n<root><objects>'
+            '<list-item>1</list-item><list-item>2</list-item>'
+            '</objects></root>'
+        )
+
+    def test_iter_chunks_scalar(self):
+        self.assertIn('<root>test_string</root>', self.render('test_string'))
+        self.assertIn('<root></root>', self.render(None))
+
+    def test_iter_chunks_empty_containers(self):
+        result = self.render({'list': [], 'dict': {}})
+        self.assertIn('<list></list>', result)
+        self.assertIn('<dict></dict>', result)
+
+    def test_iter_chunks_escaping(self):
+        result = self.render({'key': '<a href="#">&</a>'})
+        self.assertIn('<key>&lt;a href="#"&gt;&amp;&lt;/a&gt;</key>', result)
+
+    def test_iter_chunks_deep_nesting(self):
+        data = 'value'
+        for _ in range(5000):
+            data = {'node': data}
+        result = self.render(data)
+        self.assertEqual(result.count('<node>'), 5000)
+
+    def test_iter_chunks_by_size(self):
+        self.generator.chunk_size = 16
+        chunks = list(self.generator.iter_chunks(list(range(100))))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(
+            b''.join(chunks),
+            b''.join(XMLStreamGenerator().iter_chunks(list(range(100))))
+        )
+
+    def test_to_str(self):
+        self.assertEqual(self.generator.to_str(1), '1')
+        self.assertEqual(self.generator.to_str('a < b'), 'a &lt; b')
+
+    def test_to_str_with_encoders(self):
+        self.generator.encoders = default_encoders
+        self.assertEqual(self.generator.to_str(b'value'), 'value')
+
+    def test_write(self):
+        stream = BytesIO()
+        self.generator.write(stream, {'count': 1})
+        self.assertIn(b'<root><count>1</count></root>', stream.getvalue())